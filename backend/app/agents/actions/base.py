@@ -6,6 +6,7 @@ from datetime import datetime
 from dataclasses import dataclass
 import time
 import asyncio
+from app.utils.git_runner import GitRunner, git_runner
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -77,6 +78,7 @@ class BaseAction(ABC):
         self.github_client = github_client
         self.context = context
         self.logger = get_logger(f"{__name__}.{self.action_type}")
+        self.git: GitRunner = git_runner
     
     @abstractmethod
     async def execute(self) -> ActionResult:
@@ -111,6 +113,24 @@ class BaseAction(ABC):
         # By default, actions are reversible unless they override this
         return True
     
+    def git_progress(self, operation: str):
+        """
+        Progress callback for ``self.git.run`` that reports git ``--progress`` phases.
+        
+        Events are logged and, when the context carries the agent's
+        ``log_event``, streamed as run events.
+        
+        Args:
+            operation: Label for the git command, e.g. "push"
+        """
+        def report(event: Dict[str, Any]):
+            message = f"git {operation}: {event['phase']} {event['percent']}% ({event['current']}/{event['total']})"
+            self.logger.info(message)
+            log_event = self.context.get("log_event")
+            if callable(log_event):
+                log_event("INFO", message, {"action_id": self.action_id, "operation": operation, **event})
+        return report
+    
     def check_idempotency(self) -> Optional[ActionResult]:
         """
         Check if action has already been executed.
@@ -1,15 +1,50 @@
 """Repository-related actions"""
 
+import asyncio
 import json
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List
 from pathlib import Path
 import subprocess
 import shutil
 import tempfile
 from .base import BaseAction, ActionResult
+from app.clients.lfs_client import LFSBatchClient, LFSError, lfs_endpoint
+from app.utils.fast_copy import fast_copy_tree
 import httpx
 
 
+# Push failures a different push strategy can't fix
+AUTH_ERROR_MARKERS = (
+    "authentication failed",
+    "could not read username",
+    "permission to",
+    "403",
+    "repository not found",
+)
+
+
+# Push failures caused by the size of the pack rather than its content
+PACK_SIZE_ERROR_MARKERS = (
+    "pack exceeds maximum allowed size",
+    "remote end hung up unexpectedly",
+    "rpc failed",
+    "http 413",
+    "request entity too large",
+)
+
+
+def _is_auth_error(message: str) -> bool:
+    """Whether git output reports an authentication or permission failure"""
+    message = message.lower()
+    return any(marker in message for marker in AUTH_ERROR_MARKERS)
+
+
+def _is_pack_size_error(message: str) -> bool:
+    """Whether git output reports a push rejected or dropped for its size"""
+    message = message.lower()
+    return any(marker in message for marker in PACK_SIZE_ERROR_MARKERS)
+
+
 class CreateRepositoryAction(BaseAction):
     """Create GitHub repository"""
     
@@ -172,7 +207,33 @@ class CreateRepositoryAction(BaseAction):
 
 
 class PushCodeAction(BaseAction):
-    """Push git bundle to GitHub repository"""
+    """
+    Push git bundle to GitHub repository.
+    
+    The default ``mirror`` strategy fetches branches and tags from the bundle
+    into a bare repository and pushes them with a single refspec push, with
+    no working tree and no per-branch checkouts. If that push fails for a
+    reason other than authentication, the ``checkout`` strategy (clone the
+    bundle, create a local branch per remote branch, push ``--all`` and
+    ``--tags``) is tried instead.
+    
+    Bundles above ``chunked_push_threshold`` bytes, and pushes rejected for
+    their pack size, use the ``chunked`` strategy: long first-parent
+    histories are pushed ``chunk_commits`` commits at a time, then branches
+    and tags in batches of ``ref_batch_size``. Every accepted push is
+    recorded in ``push_progress.json`` next to the bundle, so a retry resumes
+    after the last accepted step. A step rejected for its size is retried
+    at half the size.
+    """
+    
+    # Branches and tags only; GitLab-internal refs (merge-requests,
+    # keep-around, pipelines) in the bundle are not pushed
+    PUSH_REFSPECS = ["refs/heads/*:refs/heads/*", "refs/tags/*:refs/tags/*"]
+    
+    # GitHub rejects pushes larger than 2 GiB
+    CHUNKED_PUSH_THRESHOLD = 1536 * 1024 * 1024
+    CHUNK_COMMITS = 2000
+    REF_BATCH_SIZE = 100
     
     async def execute(self) -> ActionResult:
         try:
@@ -188,106 +249,45 @@ class PushCodeAction(BaseAction):
             if not bundle_path.exists():
                 raise FileNotFoundError(f"Bundle file not found: {bundle_path}")
             
+            progress_path = bundle_path.with_name("push_progress.json")
+            strategy = self.parameters.get("push_strategy") or self._choose_strategy(bundle_path, progress_path)
+            push_stats: Dict[str, Any] = {}
+            
             # Get repository
             owner, repo = target_repo.split("/")
             repo_data = await self.github_client.get_repository(owner, repo)
             clone_url = repo_data["clone_url"]
             
-            # Create temp directory for unpacking using tempfile for security
-            temp_dir = Path(tempfile.mkdtemp(prefix="gl2gh_repo_"))
+            # Add GitHub remote with token (token will be redacted in error messages)
+            token = self.context.get("github_token")
+            auth_url = clone_url.replace("https://", f"https://x-access-token:{token}@")
             
-            try:
-                # Clone from bundle
-                subprocess.run(
-                    ["git", "clone", str(bundle_path), str(temp_dir)],
-                    check=True,
-                    capture_output=True,
-                    text=True
-                )
-                
-                # Create local branches for all remote tracking branches
-                # This ensures all branches are pushed, not just the default
-                result = subprocess.run(
-                    ["git", "branch", "-r"],
-                    cwd=temp_dir,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                for line in result.stdout.strip().split('\n'):
-                    branch = line.strip()
-                    if branch and '->' not in branch:  # Skip HEAD -> master
-                        # Extract branch name (remove 'origin/' prefix)
-                        local_branch = branch.replace('origin/', '')
-                        # Skip if it's the default branch (already checked out)
-                        if local_branch != 'master' and local_branch != 'main':
-                            try:
-                                subprocess.run(
-                                    ["git", "checkout", "-b", local_branch, branch],
-                                    cwd=temp_dir,
-                                    capture_output=True,
-                                    text=True,
-                                    check=True
-                                )
-                            except subprocess.CalledProcessError:
-                                # Branch might already exist, ignore
-                                pass
-                
-                # Return to default branch
-                subprocess.run(
-                    ["git", "checkout", "master"],
-                    cwd=temp_dir,
-                    capture_output=True,
-                    text=True
-                )
-                
-                # Add GitHub remote with token (token will be redacted in error messages)
-                token = self.context.get("github_token")
-                auth_url = clone_url.replace("https://", f"https://x-access-token:{token}@")
-                
-                subprocess.run(
-                    ["git", "remote", "add", "github", auth_url],
-                    cwd=temp_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True
-                )
-                
-                # Push all branches and tags
-                subprocess.run(
-                    ["git", "push", "github", "--all"],
-                    cwd=temp_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True
-                )
-                
-                subprocess.run(
-                    ["git", "push", "github", "--tags"],
-                    cwd=temp_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True
-                )
-                
-                return ActionResult(
-                    success=True,
-                    action_id=self.action_id,
-                    action_type=self.action_type,
-                    outputs={"pushed": True, "target_repo": target_repo},
-                    reversible=False  # Code push cannot be reversed
-                )
-            finally:
-                # Cleanup temp directory
-                if temp_dir.exists():
-                    shutil.rmtree(temp_dir, ignore_errors=True)
+            if strategy == "mirror":
+                try:
+                    await self._push_mirror(bundle_path, auth_url)
+                except subprocess.CalledProcessError as e:
+                    error_msg = self._redact(str(e.stderr or e))
+                    if _is_auth_error(error_msg):
+                        raise
+                    strategy = "chunked" if _is_pack_size_error(error_msg) else "checkout"
+                    self.logger.warning(f"Mirror push failed, falling back to {strategy} push: {error_msg}")
+            
+            if strategy == "chunked":
+                push_stats = await self._push_chunked(bundle_path, auth_url, progress_path)
+            elif strategy != "mirror":
+                await self._push_checkout(bundle_path, auth_url)
+            
+            return ActionResult(
+                success=True,
+                action_id=self.action_id,
+                action_type=self.action_type,
+                outputs={"pushed": True, "target_repo": target_repo, "push_strategy": strategy, **push_stats},
+                reversible=False  # Code push cannot be reversed
+            )
                     
         except subprocess.CalledProcessError as e:
             # Redact token from error messages
-            error_msg = str(e.stderr if e.stderr else str(e))
-            token = self.context.get("github_token", "")
-            if token:
-                error_msg = error_msg.replace(token, "***REDACTED***")
+            error_msg = self._redact(str(e.stderr if e.stderr else str(e)))
             return ActionResult(
                 success=False,
                 action_id=self.action_id,
@@ -304,13 +304,266 @@ class PushCodeAction(BaseAction):
                 error=str(e)
             )
     
+    def _redact(self, message: str) -> str:
+        """Remove the GitHub token from git output"""
+        token = self.context.get("github_token", "")
+        if token:
+            message = message.replace(token, "***REDACTED***")
+        return message
+    
+    def _choose_strategy(self, bundle_path: Path, progress_path: Path) -> str:
+        """Resume an unfinished chunked push, chunk huge bundles, mirror the rest"""
+        if progress_path.exists():
+            return "chunked"
+        threshold = self.parameters.get("chunked_push_threshold", self.CHUNKED_PUSH_THRESHOLD)
+        return "chunked" if bundle_path.stat().st_size > threshold else "mirror"
+    
+    async def _prepare_bare_repo(self, bundle_path: Path, auth_url: str) -> Path:
+        """Fetch branches and tags from the bundle into a new bare repo with a ``github`` remote"""
+        temp_dir = Path(tempfile.mkdtemp(prefix="gl2gh_repo_"))
+        try:
+            await self.git.run(["git", "init", "--bare", "--quiet", str(temp_dir)])
+            await self.git.run(
+                ["git", "fetch", "--progress", str(bundle_path), *self.PUSH_REFSPECS],
+                cwd=temp_dir,
+                progress=self.git_progress("fetch bundle")
+            )
+            await self.git.run(["git", "remote", "add", "github", auth_url], cwd=temp_dir)
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        return temp_dir
+    
+    async def _push_mirror(self, bundle_path: Path, auth_url: str):
+        """Fetch branches and tags from the bundle into a bare repo and push them in one go"""
+        force = "+" if self.parameters.get("force") else ""
+        temp_dir = await self._prepare_bare_repo(bundle_path, auth_url)
+        
+        try:
+            await self.git.run(
+                ["git", "push", "--progress", "github", *(force + refspec for refspec in self.PUSH_REFSPECS)],
+                cwd=temp_dir,
+                progress=self.git_progress("push")
+            )
+        finally:
+            if temp_dir.exists():
+                shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    async def _push_chunked(self, bundle_path: Path, auth_url: str, progress_path: Path) -> Dict[str, Any]:
+        """
+        Push history in size-limited steps, then refs in batches, resumably.
+        
+        Args:
+            bundle_path: Bundle to push
+            auth_url: Authenticated GitHub remote URL
+            progress_path: Progress file recording accepted pushes
+            
+        Returns:
+            Dict with the number of history steps and ref batches pushed
+        """
+        target_repo = self.parameters["target_repo"]
+        force = "+" if self.parameters.get("force") else ""
+        chunk_commits = max(1, self.parameters.get("chunk_commits", self.CHUNK_COMMITS))
+        batch_size = max(1, self.parameters.get("ref_batch_size", self.REF_BATCH_SIZE))
+        
+        # ref -> commit GitHub accepted for it, kept across attempts
+        pushed: Dict[str, str] = {}
+        if progress_path.exists():
+            with open(progress_path, 'r') as f:
+                progress = json.load(f)
+            if progress.get("target_repo") == target_repo:
+                pushed = progress.get("pushed", {})
+                self.logger.info(f"Resuming chunked push: {len(pushed)} refs already pushed")
+        
+        def record(updates: Dict[str, str]):
+            pushed.update(updates)
+            temp_path = progress_path.with_suffix(".tmp")
+            with open(temp_path, 'w') as f:
+                json.dump({"target_repo": target_repo, "pushed": pushed}, f)
+            temp_path.replace(progress_path)
+        
+        temp_dir = await self._prepare_bare_repo(bundle_path, auth_url)
+        try:
+            result = await self.git.run(
+                ["git", "for-each-ref", "--format=%(refname) %(objectname)", "refs/heads", "refs/tags"],
+                cwd=temp_dir
+            )
+            refs = dict(line.split(" ", 1) for line in result.stdout.splitlines() if line.strip())
+            
+            # What GitHub already has bounds every rev-list below
+            for ref, sha in pushed.items():
+                if ref.startswith("refs/heads/"):
+                    await self.git.run(
+                        ["git", "update-ref", "refs/remotes/github/" + ref[len("refs/heads/"):], sha],
+                        cwd=temp_dir,
+                        check=False
+                    )
+            
+            # History: default branch first, each long first-parent line in steps
+            steps = 0
+            for ref in self._ordered_branches(refs):
+                if pushed.get(ref) == refs[ref]:
+                    continue
+                result = await self.git.run(
+                    ["git", "rev-list", "--first-parent", "--reverse", ref, "--not", "--remotes=github"],
+                    cwd=temp_dir
+                )
+                commits = result.stdout.split()
+                if len(commits) <= chunk_commits:
+                    continue  # Small enough for a ref batch
+                self.logger.info(f"Pushing {len(commits)} commits of {ref} in steps of {chunk_commits}")
+                steps += await self._push_in_steps(
+                    temp_dir,
+                    commits,
+                    chunk_commits,
+                    lambda chunk, ref=ref: [f"{force}{chunk[-1]}:{ref}"],
+                    lambda chunk, ref=ref: record({ref: chunk[-1]})
+                )
+            
+            # Remaining branches and tags
+            remaining = [ref for ref in refs if pushed.get(ref) != refs[ref]]
+            batches = await self._push_in_steps(
+                temp_dir,
+                remaining,
+                batch_size,
+                lambda chunk: [f"{force}{ref}:{ref}" for ref in chunk],
+                lambda chunk: record({ref: refs[ref] for ref in chunk})
+            )
+        finally:
+            if temp_dir.exists():
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        
+        progress_path.unlink(missing_ok=True)
+        return {"history_steps": steps, "ref_batches": batches}
+    
+    def _ordered_branches(self, refs: Dict[str, str]) -> List[str]:
+        """Branch refs with the default branch first"""
+        branches = [ref for ref in refs if ref.startswith("refs/heads/")]
+        defaults = [self.parameters.get("default_branch"), "main", "master"]
+        for name in defaults:
+            if name and f"refs/heads/{name}" in branches:
+                branches.remove(f"refs/heads/{name}")
+                branches.insert(0, f"refs/heads/{name}")
+                break
+        return branches
+    
+    async def _push_in_steps(
+        self,
+        cwd: Path,
+        items: List[str],
+        step: int,
+        refspecs_for: Callable[[List[str]], List[str]],
+        on_pushed: Callable[[List[str]], None]
+    ) -> int:
+        """
+        Push ``items`` in slices of ``step``, halving the slice when a push is too large.
+        
+        Args:
+            cwd: Bare repository
+            items: Commits or refs, in push order
+            step: Initial slice length
+            refspecs_for: Refspecs that push a slice
+            on_pushed: Called after each accepted push
+            
+        Returns:
+            Number of pushes made
+        """
+        index = pushes = 0
+        while index < len(items):
+            chunk = items[index:index + step]
+            try:
+                await self.git.run(
+                    ["git", "push", "--progress", "github", *refspecs_for(chunk)],
+                    cwd=cwd,
+                    progress=self.git_progress("push")
+                )
+            except subprocess.CalledProcessError as e:
+                if step > 1 and _is_pack_size_error(str(e.stderr)):
+                    step = max(1, step // 2)
+                    self.logger.warning(f"Push too large, retrying with steps of {step}")
+                    continue
+                raise
+            on_pushed(chunk)
+            index += len(chunk)
+            pushes += 1
+        return pushes
+    
+    async def _push_checkout(self, bundle_path: Path, auth_url: str):
+        """Clone the bundle, create local branches and push ``--all`` and ``--tags``"""
+        # Create temp directory for unpacking using tempfile for security
+        temp_dir = Path(tempfile.mkdtemp(prefix="gl2gh_repo_"))
+        
+        try:
+            # Clone from bundle
+            await self.git.run(
+                ["git", "clone", "--progress", str(bundle_path), str(temp_dir)],
+                progress=self.git_progress("clone")
+            )
+            
+            # Create local branches for all remote tracking branches
+            # This ensures all branches are pushed, not just the default
+            result = await self.git.run(
+                ["git", "branch", "-r"],
+                cwd=temp_dir
+            )
+            for line in result.stdout.strip().split('\n'):
+                branch = line.strip()
+                if branch and '->' not in branch:  # Skip HEAD -> master
+                    # Extract branch name (remove 'origin/' prefix)
+                    local_branch = branch.replace('origin/', '')
+                    # Skip if it's the default branch (already checked out)
+                    if local_branch != 'master' and local_branch != 'main':
+                        try:
+                            await self.git.run(
+                                ["git", "checkout", "-b", local_branch, branch],
+                                cwd=temp_dir
+                            )
+                        except subprocess.CalledProcessError:
+                            # Branch might already exist, ignore
+                            pass
+            
+            # Return to default branch
+            await self.git.run(
+                ["git", "checkout", "master"],
+                cwd=temp_dir,
+                check=False
+            )
+            
+            await self.git.run(
+                ["git", "remote", "add", "github", auth_url],
+                cwd=temp_dir
+            )
+            
+            # Push all branches and tags
+            await self.git.run(
+                ["git", "push", "--progress", "github", "--all"],
+                cwd=temp_dir,
+                progress=self.git_progress("push")
+            )
+            
+            await self.git.run(
+                ["git", "push", "--progress", "github", "--tags"],
+                cwd=temp_dir,
+                progress=self.git_progress("push tags")
+            )
+        finally:
+            # Cleanup temp directory
+            if temp_dir.exists():
+                shutil.rmtree(temp_dir, ignore_errors=True)
+    
     def is_reversible(self) -> bool:
         """Code push cannot be reversed - history is permanent"""
         return False
 
 
 class PushLFSAction(BaseAction):
-    """Configure and push Git LFS objects"""
+    """
+    Configure and push Git LFS objects.
+    
+    By default the exported objects are uploaded straight to GitHub's LFS
+    batch API, skipping objects GitHub already has. If that fails, the
+    objects are pushed with ``git lfs push`` from a fresh clone instead.
+    """
     
     async def execute(self) -> ActionResult:
         try:
@@ -355,6 +608,29 @@ class PushLFSAction(BaseAction):
             repo = self.github_client.get_repo(target_repo)
             clone_url = repo.clone_url
             
+            if self.parameters.get("transfer_engine", "batch") == "batch":
+                try:
+                    stats = await self._push_batch(clone_url, lfs_objects_path, manifest)
+                    self.logger.info(
+                        f"Uploaded {stats['uploaded']} LFS objects ({stats['skipped']} already on GitHub)"
+                    )
+                    return ActionResult(
+                        success=True,
+                        action_id=self.action_id,
+                        action_type=self.action_type,
+                        outputs={
+                            "lfs_configured": True,
+                            "target_repo": target_repo,
+                            "objects_pushed": lfs_count,
+                            "objects_uploaded": stats["uploaded"],
+                            "objects_skipped": stats["skipped"],
+                            "total_size": manifest.get("total_size", 0),
+                            "transfer_engine": "batch"
+                        }
+                    )
+                except (LFSError, httpx.HTTPError) as e:
+                    self.logger.warning(f"LFS batch upload failed, falling back to git lfs push: {e}")
+            
             # Create temp directory for LFS push using tempfile for security
             temp_dir = Path(tempfile.mkdtemp(prefix="gl2gh_lfs_"))
             
@@ -363,21 +639,16 @@ class PushLFSAction(BaseAction):
                 token = self.context.get("github_token")
                 auth_url = clone_url.replace("https://", f"https://x-access-token:{token}@")
                 
-                subprocess.run(
-                    ["git", "clone", auth_url, str(temp_dir)],
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                    timeout=300  # 5 minutes for clone
+                await self.git.run(
+                    ["git", "clone", "--progress", auth_url, str(temp_dir)],
+                    timeout=300,  # 5 minutes for clone
+                    progress=self.git_progress("clone")
                 )
                 
                 # Install Git LFS in the repository
-                subprocess.run(
+                await self.git.run(
                     ["git", "lfs", "install"],
                     cwd=temp_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True,
                     timeout=30  # 30 seconds for install
                 )
                 
@@ -385,26 +656,15 @@ class PushLFSAction(BaseAction):
                 lfs_storage_src = lfs_objects_path / "objects"
                 if lfs_storage_src.exists():
                     lfs_storage_dst = temp_dir / ".git" / "lfs" / "objects"
-                    lfs_storage_dst.mkdir(parents=True, exist_ok=True)
                     
-                    # Copy all LFS objects
-                    for item in lfs_storage_src.iterdir():
-                        if item.is_dir():
-                            dst_path = lfs_storage_dst / item.name
-                            if dst_path.exists():
-                                shutil.rmtree(dst_path)
-                            shutil.copytree(item, dst_path)
-                        else:
-                            shutil.copy2(item, lfs_storage_dst / item.name)
+                    # Link or clone the objects rather than copying gigabytes
+                    await asyncio.to_thread(fast_copy_tree, lfs_storage_src, lfs_storage_dst)
                 
                 # Push all LFS objects to GitHub
                 self.logger.info("Pushing LFS objects to GitHub...")
-                result = subprocess.run(
+                result = await self.git.run(
                     ["git", "lfs", "push", "--all", "origin"],
                     cwd=temp_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True,
                     timeout=600  # 10 minutes for large LFS files
                 )
                 
@@ -469,6 +729,19 @@ class PushLFSAction(BaseAction):
                 outputs={},
                 error=str(e)
             )
+    
+    async def _push_batch(self, clone_url: str, lfs_objects_path: Path, manifest: Dict[str, Any]) -> Dict[str, int]:
+        """Upload the manifest's objects through GitHub's LFS batch API"""
+        client = LFSBatchClient(
+            lfs_endpoint(clone_url),
+            "x-access-token",
+            self.context.get("github_token"),
+            concurrency=self.parameters.get("concurrency", 8)
+        )
+        try:
+            return await client.upload(manifest.get("objects", []), lfs_objects_path / "objects")
+        finally:
+            await client.close()
 
 
 class ConfigureRepositoryAction(BaseAction):
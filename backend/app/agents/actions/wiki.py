@@ -42,11 +42,9 @@ class PushWikiAction(BaseAction):
             
             try:
                 # Clone wiki
-                subprocess.run(
-                    ["git", "clone", auth_url, str(temp_dir)],
-                    check=True,
-                    capture_output=True,
-                    text=True
+                await self.git.run(
+                    ["git", "clone", "--progress", auth_url, str(temp_dir)],
+                    progress=self.git_progress("wiki clone")
                 )
                 
                 # Copy wiki content
@@ -54,37 +52,26 @@ class PushWikiAction(BaseAction):
                     shutil.copy(file, temp_dir / file.name)
                 
                 # Commit and push (check if there are changes first)
-                result = subprocess.run(
+                result = await self.git.run(
                     ["git", "status", "--porcelain"],
-                    cwd=temp_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True
+                    cwd=temp_dir
                 )
                 
                 if result.stdout.strip():  # Only commit if there are changes
-                    subprocess.run(
+                    await self.git.run(
                         ["git", "add", "."],
-                        cwd=temp_dir,
-                        check=True,
-                        capture_output=True,
-                        text=True
+                        cwd=temp_dir
                     )
                     
-                    subprocess.run(
+                    await self.git.run(
                         ["git", "commit", "-m", "Migrate wiki content from GitLab"],
-                        cwd=temp_dir,
-                        check=True,
-                        capture_output=True,
-                        text=True
+                        cwd=temp_dir
                     )
                     
-                    subprocess.run(
-                        ["git", "push"],
+                    await self.git.run(
+                        ["git", "push", "--progress"],
                         cwd=temp_dir,
-                        check=True,
-                        capture_output=True,
-                        text=True
+                        progress=self.git_progress("wiki push")
                     )
                     pushed = True
                 else:
@@ -93,7 +93,8 @@ class ApplyAgent(BaseAgent):
                 "id_mappings": {},
                 "executed_actions": {},
                 "resume_state": inputs.get("resume_state", {}),
-                "dry_run": dry_run
+                "dry_run": dry_run,
+                "log_event": self.log_event
             }
             
             # Get plan
@@ -1,12 +1,14 @@
 """Discovery Agent - GitLab project discovery and analysis using Microsoft Agent Framework"""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 import json
 import os
 from pathlib import Path
 from datetime import datetime
 from app.agents.base_agent import BaseAgent, AgentResult
 from app.clients.gitlab_client import GitLabClient
+from app.clients.gitlab_graphql import GitLabGraphQL
+from app.clients.http_cache import default_cache_root
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -63,6 +65,9 @@ class DiscoveryAgent(BaseAgent):
             - max_per_project_calls: Per-project API budget
             - deep: Enable deep analysis
             - deep_top_n: Limit deep analysis to top N projects
+            - http_cache_dir: Conditional-request cache root (None disables)
+            - use_graphql: Resolve per-project counts via batched GraphQL (default True)
+            - graphql_batch_size: Projects per GraphQL count query
         """
         required_fields = ["gitlab_url", "gitlab_token", "output_dir"]
         
@@ -118,7 +123,12 @@ class DiscoveryAgent(BaseAgent):
             output_dir.mkdir(parents=True, exist_ok=True)
             
             # Initialize GitLab client with async context manager
-            async with GitLabClient(inputs["gitlab_url"], inputs["gitlab_token"]) as client:
+            async with GitLabClient(
+                inputs["gitlab_url"],
+                inputs["gitlab_token"],
+                cache_dir=inputs.get("http_cache_dir", default_cache_root()),
+                memo=inputs.get("gitlab_request_memo")
+            ) as client:
                 # Discover projects using async methods
                 projects_data = await self._discover_projects(client, inputs)
                 
@@ -186,6 +196,10 @@ class DiscoveryAgent(BaseAgent):
         """
         Discover all projects and detect components.
         
+        Projects are streamed from the listing and scanned in batches of
+        ``graphql_batch_size``, so counts for a batch are resolved with one
+        GraphQL query while later listing pages are still to come.
+        
         Args:
             client: GitLab client
             inputs: Discovery configuration
@@ -194,51 +208,108 @@ class DiscoveryAgent(BaseAgent):
             List of project data with detected components
         """
         discovered_projects = []
+        batch_size = inputs.get("graphql_batch_size", 25)
+        batch = []
+        listed = 0
         
-        # Get projects based on scope
         try:
-            scope_type = inputs.get("scope_type")
-            scope_id = inputs.get("scope_id")
-            scope_path = inputs.get("scope_path")
-            
-            if scope_type == "project" and scope_id:
-                # Single project scope - get just this project
-                self.log_event("INFO", f"Scope: single project {scope_path} (ID: {scope_id})")
-                try:
-                    project = await client.get_project(scope_id)
-                    projects = [project] if project else []
-                    self.log_event("INFO", f"Found project: {project.get('path_with_namespace') if project else 'None'}")
-                except Exception as e:
-                    self.log_event("ERROR", f"Failed to get project {scope_id}: {str(e)}")
-                    projects = []
-            elif scope_type == "group" and scope_path:
-                # Group scope - scan all projects in this group
-                self.log_event("INFO", f"Scope: group {scope_path}")
-                projects = await client.list_group_projects(scope_path)
-                self.log_event("INFO", f"Found {len(projects)} projects in group {scope_path}")
-            elif inputs.get("root_group"):
-                # Legacy: Scan specific group
-                group_id = inputs["root_group"]
-                projects = await client.list_group_projects(group_id)
-                self.log_event("INFO", f"Found {len(projects)} projects in group {group_id}")
-            else:
-                # No scope - scan all accessible projects
-                projects = await client.list_projects()
-                self.log_event("INFO", f"Found {len(projects)} accessible projects (no scope set)")
+            async for project in self._iter_scope_projects(client, inputs):
+                listed += 1
+                batch.append(project)
+                if len(batch) >= batch_size:
+                    discovered_projects.extend(await self._scan_project_batch(client, batch, inputs))
+                    batch = []
         except Exception as e:
             self.log_event("ERROR", f"Failed to list projects: {str(e)}")
-            return []
+            if not discovered_projects and not batch:
+                return []
+        
+        if batch:
+            discovered_projects.extend(await self._scan_project_batch(client, batch, inputs))
         
-        # Detect components for each project
+        self.log_event("INFO", f"Found {listed} projects in scope")
+        return discovered_projects
+    
+    async def _iter_scope_projects(
+        self,
+        client: GitLabClient,
+        inputs: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate the projects in the configured discovery scope.
+        
+        Args:
+            client: GitLab client
+            inputs: Discovery configuration
+            
+        Yields:
+            Project metadata from GitLab API
+        """
+        scope_type = inputs.get("scope_type")
+        scope_id = inputs.get("scope_id")
+        scope_path = inputs.get("scope_path")
+        
+        if scope_type == "project" and scope_id:
+            # Single project scope - get just this project
+            self.log_event("INFO", f"Scope: single project {scope_path} (ID: {scope_id})")
+            try:
+                project = await client.get_project(scope_id)
+                self.log_event("INFO", f"Found project: {project.get('path_with_namespace') if project else 'None'}")
+            except Exception as e:
+                self.log_event("ERROR", f"Failed to get project {scope_id}: {str(e)}")
+                project = None
+            if project:
+                yield project
+        elif scope_type == "group" and scope_path:
+            # Group scope - scan all projects in this group
+            self.log_event("INFO", f"Scope: group {scope_path}")
+            async for project in client.iter_group_projects(scope_path):
+                yield project
+        elif inputs.get("root_group"):
+            # Legacy: Scan specific group
+            self.log_event("INFO", f"Scope: group {inputs['root_group']}")
+            async for project in client.iter_group_projects(inputs["root_group"]):
+                yield project
+        else:
+            # No scope - scan all accessible projects
+            self.log_event("INFO", "Scope: all accessible projects (no scope set)")
+            async for project in client.iter_projects():
+                yield project
+    
+    async def _scan_project_batch(
+        self,
+        client: GitLabClient,
+        projects: List[Dict[str, Any]],
+        inputs: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Detect components for a batch of projects.
+        
+        Args:
+            client: GitLab client
+            projects: Projects to scan
+            inputs: Discovery configuration
+            
+        Returns:
+            Project data with detected components, in input order
+        """
+        # Resolve counts for the whole batch in one GraphQL round trip
+        graphql_counts = {}
+        if inputs.get("use_graphql", True):
+            graphql_counts = await self._fetch_graphql_counts(client, projects, inputs)
+        
+        scanned = []
         for project in projects:
             try:
-                project_data = await self._detect_project_components(client, project)
-                discovered_projects.append(project_data)
+                project_data = await self._detect_project_components(
+                    client, project, graphql_counts.get(project.get("path_with_namespace"))
+                )
+                scanned.append(project_data)
                 
                 self.log_event("INFO", f"Scanned project: {project_data['path_with_namespace']}")
             except Exception as e:
                 self.log_event("ERROR", f"Error scanning project {project.get('id')}: {str(e)}")
-                discovered_projects.append({
+                scanned.append({
                     "id": project.get("id"),
                     "name": project.get("name"),
                     "path_with_namespace": project.get("path_with_namespace"),
@@ -246,15 +317,54 @@ class DiscoveryAgent(BaseAgent):
                     "components": {}
                 })
         
-        return discovered_projects
+        return scanned
+    
+    async def _fetch_graphql_counts(
+        self,
+        client: GitLabClient,
+        projects: List[Dict[str, Any]],
+        inputs: Dict[str, Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch component counts for all projects with batched GraphQL queries.
+        
+        Args:
+            client: GitLab client
+            projects: Projects to resolve
+            inputs: Discovery configuration
+            
+        Returns:
+            Dict mapping project path to counts; empty if GraphQL is unavailable
+        """
+        paths = [p["path_with_namespace"] for p in projects if p.get("path_with_namespace")]
+        graphql = GitLabGraphQL(client, batch_size=inputs.get("graphql_batch_size", 25))
+        try:
+            counts = await graphql.get_project_counts(paths)
+        except Exception as e:
+            self.log_event("WARN", f"GraphQL count discovery unavailable, using REST: {str(e)}")
+            return {}
+        
+        self.log_event("INFO", f"Resolved counts for {len(counts)}/{len(paths)} projects via GraphQL")
+        return counts
     
-    async def _detect_project_components(self, client: GitLabClient, project: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _has_counts(counts: Optional[Dict[str, Any]], *keys: str) -> bool:
+        """Check that GraphQL counts are present for all given keys"""
+        return counts is not None and all(counts.get(key) is not None for key in keys)
+    
+    async def _detect_project_components(
+        self,
+        client: GitLabClient,
+        project: Dict[str, Any],
+        counts: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Detect all 14 component types for a project.
         
         Args:
             client: GitLab client
             project: Project metadata from GitLab API
+            counts: Pre-fetched GraphQL counts; REST is used for anything missing
             
         Returns:
             Project data with detected components
@@ -280,21 +390,27 @@ class DiscoveryAgent(BaseAgent):
         
         try:
             # 1. Repository (branches, tags, commits) - Enhanced with size and protected info
-            branches = await client.list_branches(project_id)
-            tags = await client.list_tags(project_id)
-            commits = await client.get_commits(project_id, max_pages=1) if branches else []
+            branches_count = await client.count_branches(project_id)
+            tags_count = await client.count_tags(project_id)
+            # Full-history count from the project statistics on both paths
+            if self._has_counts(counts, "commit_count"):
+                commits_count = counts["commit_count"]
+            elif (project.get("statistics") or {}).get("commit_count") is not None:
+                commits_count = int(project["statistics"]["commit_count"])
+            else:
+                commits_count = await client.count_commits(project_id) if branches_count else 0
             
             # Get repository size if available
             repo_size_mb = project.get("statistics", {}).get("repository_size", 0) / (1024 * 1024) if project.get("statistics") else 0
             
             components["repository"] = {
                 "enabled": True,
-                "branches_count": len(branches),
-                "tags_count": len(tags),
-                "commits_count": len(commits) if commits else 0,
+                "branches_count": branches_count,
+                "tags_count": tags_count,
+                "commits_count": commits_count,
                 "default_branch": project.get("default_branch"),
                 "size_mb": round(repo_size_mb, 2),
-                "has_content": len(branches) > 0
+                "has_content": branches_count > 0
             }
         except Exception as e:
             components["repository"] = {"enabled": False, "error": str(e)}
@@ -302,119 +418,137 @@ class DiscoveryAgent(BaseAgent):
         try:
             # 2. CI/CD - Enhanced with detailed counts
             has_ci = await client.has_ci_config(project_id)
-            pipelines = await client.list_pipelines(project_id, max_count=10) if has_ci else []
-            variables = await client.list_variables(project_id) if has_ci else []
-            environments = await client.list_environments(project_id) if has_ci else []
-            schedules = await client.list_pipeline_schedules(project_id) if has_ci else []
             
             components["ci_cd"] = {
                 "enabled": has_ci,
                 "has_gitlab_ci": has_ci,
-                "recent_pipelines": len(pipelines),
-                "variables_count": len(variables),
-                "environments_count": len(environments),
-                "schedules_count": len(schedules)
+                "recent_pipelines": min(await client.count_pipelines(project_id), 10) if has_ci else 0,
+                "variables_count": await client.count_variables(project_id) if has_ci else 0,
+                "environments_count": await client.count_environments(project_id) if has_ci else 0,
+                "schedules_count": await client.count_pipeline_schedules(project_id) if has_ci else 0
             }
         except Exception as e:
             components["ci_cd"] = {"enabled": False, "error": str(e)}
         
         try:
             # 3. Issues - Enhanced with detailed counts
-            opened_issues = await client.list_issues(project_id, state="opened")
-            closed_issues = await client.list_issues(project_id, state="closed", max_pages=1)  # Sample closed
-            labels = await client.list_labels(project_id)
-            milestones = await client.list_milestones(project_id)
+            if self._has_counts(counts, "opened_issues", "closed_issues", "labels", "milestones"):
+                opened_count = counts["opened_issues"]
+                closed_count = counts["closed_issues"]
+                labels_count = counts["labels"]
+                milestones_count = counts["milestones"]
+            else:
+                opened_count = await client.count_issues(project_id, state="opened")
+                closed_count = await client.count_issues(project_id, state="closed")
+                labels_count = await client.count_labels(project_id)
+                milestones_count = await client.count_milestones(project_id)
             
             components["issues"] = {
                 "enabled": True,
-                "opened_count": len(opened_issues),
-                "closed_count": len(closed_issues),  # Sample count
-                "total_count": len(opened_issues) + len(closed_issues),
-                "labels_count": len(labels),
-                "milestones_count": len(milestones),
-                "has_issues": len(opened_issues) > 0 or len(closed_issues) > 0
+                "opened_count": opened_count,
+                "closed_count": closed_count,
+                "total_count": opened_count + closed_count,
+                "labels_count": labels_count,
+                "milestones_count": milestones_count,
+                "has_issues": opened_count > 0 or closed_count > 0
             }
         except Exception as e:
             components["issues"] = {"enabled": False, "error": str(e)}
         
         try:
             # 4. Merge Requests - Enhanced with detailed counts
-            opened_mrs = await client.list_merge_requests(project_id, state="opened")
-            merged_mrs = await client.list_merge_requests(project_id, state="merged", max_pages=1)  # Sample
-            closed_mrs = await client.list_merge_requests(project_id, state="closed", max_pages=1)  # Sample
+            if self._has_counts(counts, "opened_merge_requests", "merged_merge_requests", "closed_merge_requests"):
+                opened_count = counts["opened_merge_requests"]
+                merged_count = counts["merged_merge_requests"]
+                closed_count = counts["closed_merge_requests"]
+            else:
+                opened_count = await client.count_merge_requests(project_id, state="opened")
+                merged_count = await client.count_merge_requests(project_id, state="merged")
+                closed_count = await client.count_merge_requests(project_id, state="closed")
             
             components["merge_requests"] = {
                 "enabled": True,
-                "opened_count": len(opened_mrs),
-                "merged_count": len(merged_mrs),  # Sample count
-                "closed_count": len(closed_mrs),  # Sample count
-                "total_count": len(opened_mrs) + len(merged_mrs) + len(closed_mrs),
-                "has_mrs": len(opened_mrs) > 0 or len(merged_mrs) > 0
+                "opened_count": opened_count,
+                "merged_count": merged_count,
+                "closed_count": closed_count,
+                "total_count": opened_count + merged_count + closed_count,
+                "has_mrs": opened_count > 0 or merged_count > 0
             }
         except Exception as e:
             components["merge_requests"] = {"enabled": False, "error": str(e)}
         
         try:
             # 5. Wiki
-            has_wiki = await client.has_wiki(project_id)
-            wiki_pages = await client.get_wiki_pages(project_id) if has_wiki else []
+            if self._has_counts(counts, "wiki_size") and counts["wiki_size"] == 0:
+                # Statistics show no wiki content, skip the listing entirely
+                pages_count = 0
+            else:
+                pages_count = await client.count_wiki_pages(project_id)
             
             components["wiki"] = {
-                "enabled": has_wiki,
-                "pages_count": len(wiki_pages)
+                "enabled": pages_count > 0,
+                "pages_count": pages_count
             }
         except Exception as e:
             components["wiki"] = {"enabled": False, "error": str(e)}
         
         try:
             # 6. Releases
-            releases = await client.list_releases(project_id)
+            if self._has_counts(counts, "releases"):
+                releases_count = counts["releases"]
+            else:
+                releases_count = await client.count_releases(project_id)
             components["releases"] = {
                 "enabled": True,
-                "count": len(releases),
-                "has_releases": len(releases) > 0
+                "count": releases_count,
+                "has_releases": releases_count > 0
             }
         except Exception as e:
             components["releases"] = {"enabled": False, "error": str(e)}
         
         try:
             # 7. Packages/Registry
-            has_packages = await client.has_packages(project_id)
-            packages = await client.list_packages(project_id) if has_packages else []
+            if self._has_counts(counts, "packages"):
+                packages_count = counts["packages"]
+            else:
+                packages_count = await client.count_packages(project_id)
             
             components["packages"] = {
-                "enabled": has_packages,
-                "count": len(packages),
-                "has_packages": len(packages) > 0
+                "enabled": packages_count > 0,
+                "count": packages_count,
+                "has_packages": packages_count > 0
             }
         except Exception as e:
             components["packages"] = {"enabled": False, "error": str(e)}
         
         try:
             # 8. Webhooks
-            hooks = await client.list_hooks(project_id)
+            hooks_count = await client.count_webhooks(project_id)
             components["webhooks"] = {
                 "enabled": True,
-                "count": len(hooks),
-                "has_webhooks": len(hooks) > 0
+                "count": hooks_count,
+                "has_webhooks": hooks_count > 0
             }
         except Exception as e:
             components["webhooks"] = {"enabled": False, "error": str(e)}
         
         try:
             # 9. Schedules
-            schedules = await client.list_pipeline_schedules(project_id)
+            schedules_count = await client.count_pipeline_schedules(project_id)
             components["schedules"] = {
                 "enabled": True,
-                "count": len(schedules),
-                "has_schedules": len(schedules) > 0
+                "count": schedules_count,
+                "has_schedules": schedules_count > 0
             }
         except Exception as e:
             components["schedules"] = {"enabled": False, "error": str(e)}
         
         try:
             # 10. LFS
-            has_lfs = await client.has_lfs(project_id)
+            if self._has_counts(counts, "lfs_objects_size") and counts["lfs_objects_size"] > 0:
+                has_lfs = True
+            else:
+                has_lfs = await client.has_lfs(project_id)
             components["lfs"] = {
                 "enabled": has_lfs,
                 "detected": has_lfs
@@ -424,66 +558,60 @@ class DiscoveryAgent(BaseAgent):
         
         try:
             # 11. Environments
-            environments = await client.list_environments(project_id)
+            environments_count = await client.count_environments(project_id)
             components["environments"] = {
                 "enabled": True,
-                "count": len(environments),
-                "has_environments": len(environments) > 0
+                "count": environments_count,
+                "has_environments": environments_count > 0
             }
         except Exception as e:
             components["environments"] = {"enabled": False, "error": str(e)}
         
         try:
             # 12. Protected branches/tags
-            protected_branches = await client.list_protected_branches(project_id)
-            protected_tags = await client.list_protected_tags(project_id)
+            protected_branches_count = await client.count_protected_branches(project_id)
+            protected_tags_count = await client.count_protected_tags(project_id)
             
             components["protected_resources"] = {
                 "enabled": True,
-                "protected_branches_count": len(protected_branches),
-                "protected_tags_count": len(protected_tags),
-                "has_protections": len(protected_branches) > 0 or len(protected_tags) > 0
+                "protected_branches_count": protected_branches_count,
+                "protected_tags_count": protected_tags_count,
+                "has_protections": protected_branches_count > 0 or protected_tags_count > 0
             }
         except Exception as e:
             components["protected_resources"] = {"enabled": False, "error": str(e)}
         
         try:
             # 13. Deploy keys
-            deploy_keys = await client.list_deploy_keys(project_id)
+            deploy_keys_count = await client.count_deploy_keys(project_id)
             components["deploy_keys"] = {
                 "enabled": True,
-                "count": len(deploy_keys),
-                "has_deploy_keys": len(deploy_keys) > 0
+                "count": deploy_keys_count,
+                "has_deploy_keys": deploy_keys_count > 0
             }
         except Exception as e:
             components["deploy_keys"] = {"enabled": False, "error": str(e)}
         
         try:
             # 14. Project variables
-            variables = await client.list_variables(project_id)
+            variables_count = await client.count_variables(project_id)
             components["variables"] = {
                 "enabled": True,
-                "count": len(variables),
-                "has_variables": len(variables) > 0
+                "count": variables_count,
+                "has_variables": variables_count > 0
             }
         except Exception as e:
             components["variables"] = {"enabled": False, "error": str(e)}
         
         try:
             # 15. Settings & Governance - Consolidated view
-            protected_branches = await client.list_protected_branches(project_id)
-            protected_tags = await client.list_protected_tags(project_id)
-            members = await client.list_project_members(project_id)
-            hooks = await client.list_hooks(project_id)
-            deploy_keys = await client.list_deploy_keys(project_id)
-            
             components["settings"] = {
                 "enabled": True,
-                "protected_branches_count": len(protected_branches),
-                "protected_tags_count": len(protected_tags),
-                "members_count": len(members),
-                "webhooks_count": len(hooks),
-                "deploy_keys_count": len(deploy_keys),
+                "protected_branches_count": await client.count_protected_branches(project_id),
+                "protected_tags_count": await client.count_protected_tags(project_id),
+                "members_count": await client.count_project_members(project_id),
+                "webhooks_count": await client.count_webhooks(project_id),
+                "deploy_keys_count": await client.count_deploy_keys(project_id),
                 "has_settings": True
             }
         except Exception as e:
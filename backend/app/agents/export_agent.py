@@ -5,15 +5,27 @@ import subprocess
 import shutil
 import urllib.parse
 import asyncio
+import httpx
 import re
-from typing import Any, Dict, List, Optional, Set
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from app.agents.base_agent import BaseAgent, AgentResult
 from app.agents.export_checkpoint import ExportCheckpoint
+from app.agents.project_archive import ProjectArchive, ProjectArchiveError
+from app.clients.attachment_store import AttachmentStore, default_store_root
 from app.clients.gitlab_client import GitLabClient
+from app.clients.gitlab_graphql import GitLabGraphQL
+from app.clients.http_cache import default_cache_root
+from app.clients.lfs_client import LFSBatchClient, LFSError, lfs_endpoint, object_path, scan_lfs_pointers
 from app.clients.registry_client import RegistryClient
+from app.utils.fast_copy import fast_copy_file, fast_copy_tree
+from app.utils.git_runner import GitRunner, git_runner
+from app.utils.json_stream import JsonArrayWriter, NdjsonWriter, iter_ndjson, ndjson_to_json_array
 from app.utils.logging import get_logger
+from app.utils.mirror_cache import MirrorCache, default_mirror_root
+from app.utils.pipeline import ordered_map
 
 logger = get_logger(__name__)
 
@@ -29,6 +41,15 @@ ATTACHMENT_PATTERNS = [
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100 MB
 WARN_FILE_SIZE = 50 * 1024 * 1024  # 50 MB
 
+# Fields a REST list item must carry to be exported without a detail GET
+ISSUE_DETAIL_FIELDS = (
+    "id", "iid", "title", "description", "state", "labels", "milestone",
+    "author", "assignees", "created_at", "updated_at", "closed_at", "web_url"
+)
+MR_DETAIL_FIELDS = ISSUE_DETAIL_FIELDS + (
+    "source_branch", "target_branch", "merged_at", "sha", "merge_commit_sha", "reviewers"
+)
+
 
 class ExportAgent(BaseAgent):
     """
@@ -49,6 +70,14 @@ class ExportAgent(BaseAgent):
     - Releases (with assets)
     - Packages (metadata)
     - Settings (protections, members, webhooks)
+    
+    With a previous export as ``baseline_dir`` the export is a delta: issues
+    and MRs updated since the baseline, releases that differ from it and an
+    incremental bundle on top of its refs, described in ``delta_manifest.json``.
+    
+    With ``export_backend`` set to ``archive`` (or ``auto`` for large
+    projects) the repository, wiki, issues and MRs are converted from one
+    GitLab project export archive instead of paging through the API.
     """
     
     def __init__(self):
@@ -71,7 +100,20 @@ class ExportAgent(BaseAgent):
             """
         )
         self.gitlab_client: Optional[GitLabClient] = None
+        self.graphql: Optional[GitLabGraphQL] = None
+        self.detail_workers = 4
+        self.attachment_store: Optional[AttachmentStore] = None
+        self.git: GitRunner = git_runner
+        self.mirror_cache: Optional[MirrorCache] = None
+        self.lfs_transfer_engine = "batch"
+        self.lfs_concurrency = 8
+        self.package_concurrency = 8
         self.checkpoint: Optional[ExportCheckpoint] = None
+        self.delta: Optional[Dict[str, Any]] = None
+        self.export_backend = "api"
+        self.archive_poll_interval = 5.0
+        self.archive_timeout = 3600
+        self._archive: Optional["asyncio.Future"] = None
         self.export_stats = {
             "repository": {"status": "pending"},
             "ci": {"status": "pending"},
@@ -120,9 +162,33 @@ class ExportAgent(BaseAgent):
         self.gitlab_client = GitLabClient(
             base_url=inputs["gitlab_url"],
             token=inputs["gitlab_token"],
-            max_requests_per_minute=inputs.get("max_requests_per_minute", 300)
+            max_requests_per_minute=inputs.get("max_requests_per_minute", 300),
+            max_concurrent_requests=inputs.get("max_concurrent_requests", 16),
+            max_concurrent_downloads=inputs.get("max_concurrent_downloads", 4),
+            cache_dir=inputs.get("http_cache_dir", default_cache_root()),
+            memo=inputs.get("gitlab_request_memo")
+        )
+        
+        # Issues and MRs are read through GraphQL unless REST is requested
+        if inputs.get("issue_export_engine", "graphql") == "graphql":
+            self.graphql = GitLabGraphQL(self.gitlab_client)
+        self.detail_workers = inputs.get("detail_workers", self.detail_workers)
+        
+        # Uploads are downloaded once per store, shared by issues and MRs
+        self.attachment_store = AttachmentStore(
+            Path(inputs.get("attachment_store_dir") or default_store_root(inputs["gitlab_url"])),
+            self.gitlab_client,
+            concurrency=inputs.get("attachment_concurrency", 4),
+            max_size=MAX_FILE_SIZE
         )
         
+        # Repository and wiki are fetched incrementally into cached mirrors
+        if inputs.get("use_mirror_cache", True):
+            self.mirror_cache = MirrorCache(Path(inputs.get("mirror_cache_dir") or default_mirror_root()))
+        self.lfs_transfer_engine = inputs.get("lfs_transfer_engine", self.lfs_transfer_engine)
+        self.lfs_concurrency = inputs.get("lfs_concurrency", self.lfs_concurrency)
+        self.package_concurrency = inputs.get("package_concurrency", self.package_concurrency)
+        
         errors = []
         artifacts = []
         
@@ -140,7 +206,21 @@ class ExportAgent(BaseAgent):
             self.checkpoint.set_metadata("project_id", project_id)
             self.checkpoint.set_metadata("project_path", project_path)
             
-            # Export components in sequence
+            # A previous export as baseline makes this a delta export
+            if inputs.get("baseline_dir"):
+                self.delta = self._load_baseline(
+                    Path(inputs["baseline_dir"]),
+                    inputs.get("delta_overlap_seconds", 300)
+                )
+                self.log_event("INFO", f"Delta export of changes since {self.delta['since']}")
+            
+            self.archive_poll_interval = inputs.get("archive_poll_interval", self.archive_poll_interval)
+            self.archive_timeout = inputs.get("archive_timeout", self.archive_timeout)
+            self.export_backend = await self._choose_backend(project_id, inputs)
+            
+            # Components are independent: run them concurrently. GitLab
+            # requests share the client's rate and concurrency budgets and
+            # git commands the runner's process limit.
             components = [
                 ("repository", self._export_repository),
                 ("ci", self._export_ci_cd),
@@ -152,62 +232,43 @@ class ExportAgent(BaseAgent):
                 ("container_registry", self._export_container_registry),
                 ("settings", self._export_settings)
             ]
+            if self.export_backend == "archive":
+                # Git data, issues and MRs come from one server-side export
+                archive_exports = {
+                    "repository": self._export_repository_from_archive,
+                    "wiki": self._export_wiki_from_archive,
+                    "issues": self._export_issues_from_archive,
+                    "merge_requests": self._export_merge_requests_from_archive
+                }
+                components = [(name, archive_exports.get(name, func)) for name, func in components]
+            slots = asyncio.Semaphore(max(1, inputs.get("component_concurrency", len(components))))
             
-            for component_name, export_func in components:
-                # Skip if already completed and resume is enabled
-                if resume and self.checkpoint.is_component_completed(component_name):
-                    self.log_event("INFO", f"Skipping {component_name} (already completed)")
-                    self.export_stats[component_name]["status"] = "completed"
-                    continue
-                
-                try:
-                    self.log_event("INFO", f"Exporting {component_name}...")
-                    self.checkpoint.mark_component_started(component_name)
-                    
-                    result = await export_func(project_id, project, output_dir)
-                    
-                    if result.get("success"):
-                        self.export_stats[component_name]["status"] = "completed"
-                        if "count" in result:
-                            self.export_stats[component_name]["count"] = result["count"]
-                        if "artifacts" in result:
-                            artifacts.extend(result["artifacts"])
-                        
-                        self.checkpoint.mark_component_completed(component_name, success=True)
-                    else:
-                        self.export_stats[component_name]["status"] = "partial"
-                        if "error" in result:
-                            errors.append({
-                                "component": component_name,
-                                "message": result["error"]
-                            })
-                        
-                        self.checkpoint.mark_component_completed(
-                            component_name,
-                            success=False,
-                            error=result.get("error")
-                        )
-                    
-                except Exception as e:
-                    self.log_event("ERROR", f"Failed to export {component_name}: {e}")
-                    self.export_stats[component_name]["status"] = "failed"
-                    error_msg = str(e)
-                    errors.append({
-                        "component": component_name,
-                        "message": error_msg
-                    })
-                    
-                    self.checkpoint.mark_component_completed(
-                        component_name,
-                        success=False,
-                        error=error_msg
+            async def run(component_name, export_func):
+                async with slots:
+                    return await self._run_component(
+                        component_name, export_func, project_id, project, output_dir, resume
                     )
             
+            outcomes = await asyncio.gather(*(run(name, func) for name, func in components))
+            
+            # Collected in component order so results don't depend on timing
+            for component_artifacts, component_error in outcomes:
+                artifacts.extend(component_artifacts)
+                if component_error:
+                    errors.append(component_error)
+            
+            if self.delta is not None:
+                delta_manifest_path = self._write_delta_manifest(output_dir)
+                artifacts.append(str(delta_manifest_path.relative_to(output_dir.parent)))
+            
             # Generate export manifest
             manifest_path = output_dir / "export_manifest.json"
             manifest = {
                 "project_id": project_id,
                 "project_path": project_path,
+                "mode": "delta" if self.delta is not None else "full",
+                "backend": self.export_backend,
+                "started_at": self.checkpoint.checkpoint_data["started_at"],
                 "exported_at": datetime.utcnow().isoformat(),
                 "gitlab_url": inputs["gitlab_url"],
                 "components": self.export_stats,
@@ -231,6 +292,10 @@ class ExportAgent(BaseAgent):
             else:
                 status = "failed"
             
+            # The archive is only kept to resume a failed export
+            if status == "success":
+                shutil.rmtree(output_dir / ".project_archive", ignore_errors=True)
+            
             self.log_event("INFO", f"Export completed with status: {status}")
             
             return AgentResult(
@@ -256,10 +321,211 @@ class ExportAgent(BaseAgent):
             ).to_dict()
         
         finally:
+            if self._archive is not None:
+                self._archive.cancel()
+                self._archive = None
+            
             # Close GitLab client
             if self.gitlab_client:
                 await self.gitlab_client.close()
     
+    async def _run_component(
+        self,
+        component_name: str,
+        export_func,
+        project_id: int,
+        project: Dict[str, Any],
+        output_dir: Path,
+        resume: bool
+    ) -> tuple:
+        """
+        Export one component, recording its status and checkpoint.
+        
+        Args:
+            component_name: Key of ``export_stats``
+            export_func: Component export coroutine function
+            project_id: GitLab project ID
+            project: Project details
+            output_dir: Export root
+            resume: Skip the component if the checkpoint has it completed
+            
+        Returns:
+            Tuple of the component's artifacts and its error entry (or None)
+        """
+        # Skip if already completed and resume is enabled
+        if resume and self.checkpoint.is_component_completed(component_name):
+            self.log_event("INFO", f"Skipping {component_name} (already completed)")
+            self.export_stats[component_name]["status"] = "completed"
+            return [], None
+        
+        try:
+            self.log_event("INFO", f"Exporting {component_name}...")
+            self.checkpoint.mark_component_started(component_name)
+            
+            result = await export_func(project_id, project, output_dir)
+            
+            if result.get("success"):
+                self.export_stats[component_name]["status"] = "completed"
+                if "count" in result:
+                    self.export_stats[component_name]["count"] = result["count"]
+                
+                self.checkpoint.mark_component_completed(component_name, success=True)
+                return result.get("artifacts", []), None
+            
+            self.export_stats[component_name]["status"] = "partial"
+            self.checkpoint.mark_component_completed(
+                component_name,
+                success=False,
+                error=result.get("error")
+            )
+            if "error" in result:
+                return [], {"component": component_name, "message": result["error"]}
+            return [], None
+            
+        except Exception as e:
+            self.log_event("ERROR", f"Failed to export {component_name}: {e}")
+            self.export_stats[component_name]["status"] = "failed"
+            error_msg = str(e)
+            
+            self.checkpoint.mark_component_completed(
+                component_name,
+                success=False,
+                error=error_msg
+            )
+            return [], {"component": component_name, "message": error_msg}
+    
+    def _load_baseline(self, baseline_dir: Path, overlap_seconds: int) -> Dict[str, Any]:
+        """
+        Read what a delta export needs from a previous export.
+        
+        Changes are looked for from when the baseline export started, since
+        items can change while an export runs, minus ``overlap_seconds`` for
+        clock skew; items exported twice are harmless.
+        
+        Args:
+            baseline_dir: Output directory of the previous export
+            overlap_seconds: Seconds subtracted from the baseline start
+            
+        Returns:
+            ``since`` (UTC, ISO 8601), baseline ``refs`` and release fingerprints
+            
+        Raises:
+            ValueError: If the baseline has no export manifest
+        """
+        manifest_path = baseline_dir / "export_manifest.json"
+        if not manifest_path.exists():
+            raise ValueError(f"Baseline {baseline_dir} has no export manifest")
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        
+        started = (
+            manifest.get("started_at")
+            or manifest.get("checkpoint_summary", {}).get("started_at")
+            or manifest["exported_at"]
+        )
+        since = datetime.fromisoformat(started.replace('Z', '+00:00'))
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        since -= timedelta(seconds=overlap_seconds)
+        
+        # Full ref snapshot; exports older than refs.json only have the bundle
+        repo_dir = baseline_dir / "repository"
+        refs: Dict[str, str] = {}
+        if (repo_dir / "refs.json").exists():
+            with open(repo_dir / "refs.json") as f:
+                refs = json.load(f)
+        elif (repo_dir / "bundle.git").exists():
+            refs = self._read_bundle_header(repo_dir / "bundle.git")[1]
+        
+        releases = {}
+        releases_path = baseline_dir / "releases" / "releases.json"
+        if releases_path.exists():
+            with open(releases_path) as f:
+                for release in json.load(f):
+                    releases[release.get("tag_name")] = self._release_fingerprint(release)
+        
+        return {
+            "baseline_dir": str(baseline_dir),
+            "since": since.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            "refs": refs,
+            "releases": releases
+        }
+    
+    def _write_delta_manifest(self, output_dir: Path) -> Path:
+        """
+        Record what changed since the baseline export.
+        
+        Built from the exported files, so it is complete after a resumed
+        export as well.
+        
+        Args:
+            output_dir: Export root
+            
+        Returns:
+            Path of ``delta_manifest.json``
+        """
+        repo_dir = output_dir / "repository"
+        repository = None
+        if (repo_dir / "refs.json").exists():
+            with open(repo_dir / "refs.json") as f:
+                refs = json.load(f)
+            baseline_refs = self.delta["refs"]
+            bundle_path = repo_dir / "delta.bundle"
+            repository = {
+                "bundle": str(bundle_path.relative_to(output_dir)) if bundle_path.exists() else None,
+                "prerequisites": self._read_bundle_header(bundle_path)[0] if bundle_path.exists() else [],
+                "created_refs": {ref: sha for ref, sha in refs.items() if ref not in baseline_refs},
+                "updated_refs": {
+                    ref: {"from": baseline_refs[ref], "to": sha}
+                    for ref, sha in refs.items()
+                    if ref in baseline_refs and baseline_refs[ref] != sha
+                },
+                "deleted_refs": {ref: sha for ref, sha in baseline_refs.items() if ref not in refs}
+            }
+        
+        changes = {
+            "baseline_dir": self.delta["baseline_dir"],
+            "since": self.delta["since"],
+            "generated_at": datetime.utcnow().isoformat(),
+            "repository": repository,
+            "issues": self._exported_keys(output_dir / "issues" / "issues.json", "iid"),
+            "merge_requests": self._exported_keys(output_dir / "merge_requests" / "merge_requests.json", "iid"),
+            "releases": self._exported_keys(output_dir / "releases" / "releases.json", "tag_name")
+        }
+        
+        manifest_path = output_dir / "delta_manifest.json"
+        with open(manifest_path, 'w') as f:
+            json.dump(changes, f, indent=2)
+        return manifest_path
+    
+    @staticmethod
+    def _exported_keys(path: Path, key: str) -> List[Any]:
+        """``key`` of every item of an exported JSON array (empty if it wasn't exported)"""
+        if not path.exists():
+            return []
+        with open(path) as f:
+            return [item.get(key) for item in json.load(f)]
+    
+    @staticmethod
+    def _read_bundle_header(bundle_path: Path) -> Tuple[List[str], Dict[str, str]]:
+        """Prerequisite commits and refs listed in a git bundle's header"""
+        prerequisites: List[str] = []
+        refs: Dict[str, str] = {}
+        with open(bundle_path, 'rb') as f:
+            f.readline()  # "# v2 git bundle" signature
+            for raw in f:
+                line = raw.decode('utf-8', errors='replace').rstrip('\n')
+                if not line:
+                    break  # The pack follows the blank line
+                if line.startswith('@'):
+                    continue  # v3 capability
+                if line.startswith('-'):
+                    prerequisites.append(line[1:].split(' ', 1)[0])
+                else:
+                    sha, _, ref = line.partition(' ')
+                    refs[ref] = sha
+        return prerequisites, refs
+    
     def _sanitize_error_message(self, error_msg: str, token: str) -> str:
         """Remove sensitive information from error messages"""
         # Replace token with placeholder
@@ -269,6 +535,16 @@ class ExportAgent(BaseAgent):
         error_msg = error_msg.replace("oauth2:", "***AUTH***:")
         return error_msg
     
+    def _git_progress(self, operation: str):
+        """Progress callback that reports git ``--progress`` phases as run events"""
+        def report(event: Dict[str, Any]):
+            self.log_event(
+                "INFO",
+                f"git {operation}: {event['phase']} {event['percent']}% ({event['current']}/{event['total']})",
+                {"operation": operation, **event}
+            )
+        return report
+    
     def _extract_attachments(self, content: str) -> Set[str]:
         """
         Extract attachment URLs from content.
@@ -316,54 +592,128 @@ class ExportAgent(BaseAgent):
             # GitLab attachment URLs are: {base_url}/{project_path}{attachment_path}
             url = f"{self.gitlab_client.base_url}/{project_path}{attachment_path}"
             
-            # Create filename from path (keep hash for uniqueness)
-            # /uploads/abc123def/screenshot.png -> abc123def_screenshot.png
-            path_parts = attachment_path.strip('/').split('/')
-            if len(path_parts) >= 3:  # uploads/hash/filename
-                hash_part = path_parts[1]
-                filename = path_parts[-1]
-                
-                # Sanitize filename to prevent issues with special characters
-                import re
-                # Allow only alphanumeric, underscore, hyphen, and single period for extension
-                safe_filename_part = re.sub(r'[^\w\-.]', '_', filename)
-                # Prevent multiple dots (except for extension)
-                parts = safe_filename_part.rsplit('.', 1)
-                if len(parts) == 2:
-                    name_part = parts[0].replace('.', '_')
-                    ext_part = parts[1]
-                    safe_filename_part = f"{name_part}.{ext_part}"
-                
-                safe_filename = f"{hash_part}_{safe_filename_part}"
-            else:
-                # Fallback: use sanitized full path
-                safe_filename = re.sub(r'[^\w\-.]', '_', attachment_path.replace('/', '_').strip('_'))
-            
+            safe_filename = self._attachment_filename(attachment_path)
             output_path = output_dir / safe_filename
             
-            # Download the file
-            success = await self.gitlab_client.download_file(url, output_path)
+            # Fetch through the deduplicating store (files over the GitHub
+            # limit are rejected there, before download when possible)
+            store = self._get_attachment_store(output_dir)
+            blob = await store.fetch(url, attachment_path.strip('/'))
             
-            if success:
-                # Check file size after download
-                file_size = output_path.stat().st_size
-                if file_size > MAX_FILE_SIZE:
-                    self.log_event("WARNING", f"Attachment {attachment_path} exceeds GitHub limit ({file_size / 1024 / 1024:.1f} MB > 100 MB)")
-                    output_path.unlink()  # Delete oversized file
-                    return None
-                elif file_size > WARN_FILE_SIZE:
+            if blob:
+                file_size = blob.stat().st_size
+                if file_size > WARN_FILE_SIZE:
                     self.log_event("WARNING", f"Large attachment {attachment_path}: {file_size / 1024 / 1024:.1f} MB (GitHub limit is 100 MB)")
                 
+                AttachmentStore.materialize(blob, output_path)
                 self.log_event("DEBUG", f"Downloaded attachment: {attachment_path} -> {safe_filename}")
                 return output_path
             else:
-                self.log_event("WARNING", f"Failed to download attachment: {attachment_path}")
+                self.log_event("WARNING", f"Failed to download attachment (or over 100 MB): {attachment_path}")
                 return None
                 
         except Exception as e:
             self.log_event("WARNING", f"Error downloading attachment {attachment_path}: {e}")
             return None
     
+    @staticmethod
+    def _attachment_filename(attachment_path: str) -> str:
+        """Local file name of an attachment"""
+        # Create filename from path (keep hash for uniqueness)
+        # /uploads/abc123def/screenshot.png -> abc123def_screenshot.png
+        path_parts = attachment_path.strip('/').split('/')
+        if len(path_parts) >= 3:  # uploads/hash/filename
+            hash_part = path_parts[1]
+            filename = path_parts[-1]
+            
+            # Sanitize filename to prevent issues with special characters
+            # Allow only alphanumeric, underscore, hyphen, and single period for extension
+            safe_filename_part = re.sub(r'[^\w\-.]', '_', filename)
+            # Prevent multiple dots (except for extension)
+            parts = safe_filename_part.rsplit('.', 1)
+            if len(parts) == 2:
+                name_part = parts[0].replace('.', '_')
+                ext_part = parts[1]
+                safe_filename_part = f"{name_part}.{ext_part}"
+            
+            return f"{hash_part}_{safe_filename_part}"
+        
+        # Fallback: use sanitized full path
+        return re.sub(r'[^\w\-.]', '_', attachment_path.replace('/', '_').strip('_'))
+    
+    def _get_attachment_store(self, attachments_dir: Path) -> AttachmentStore:
+        """Attachment store of this export (a project-local one if none was configured)"""
+        if self.attachment_store is None:
+            self.attachment_store = AttachmentStore(
+                attachments_dir.parent / ".attachment_store",
+                self.gitlab_client,
+                max_size=MAX_FILE_SIZE
+            )
+        return self.attachment_store
+    
+    async def _collect_attachments(
+        self,
+        pending: Dict[str, "asyncio.Task"],
+        output_dir: Path
+    ) -> Dict[str, str]:
+        """
+        Wait for scheduled attachment downloads.
+        
+        Args:
+            pending: Attachment path -> task returning the local path (or None)
+            output_dir: Export root the local paths are made relative to
+            
+        Returns:
+            Attachment path -> local path relative to ``output_dir``
+        """
+        metadata = {}
+        for attachment_path, task in pending.items():
+            local_path = await task
+            if local_path:
+                metadata[attachment_path] = str(local_path.relative_to(output_dir))
+        return metadata
+    
+    def _issue_attachments(self, issue: Dict[str, Any]) -> Set[str]:
+        """Attachment paths referenced by an issue's description and notes"""
+        found = self._extract_attachments(issue.get('description'))
+        for note in issue.get('notes', []):
+            found.update(self._extract_attachments(note.get('body')))
+        return found
+    
+    def _merge_request_attachments(self, mr: Dict[str, Any]) -> Set[str]:
+        """Attachment paths referenced by an MR's description and discussions"""
+        found = self._extract_attachments(mr.get('description'))
+        for discussion in mr.get('discussions', []):
+            for note in discussion.get('notes', []):
+                found.update(self._extract_attachments(note.get('body')))
+        return found
+    
+    @staticmethod
+    def _scan_recovered(
+        ndjson_path: Path,
+        attachments_of: Callable[[Dict[str, Any]], Set[str]]
+    ) -> Tuple[Set[int], Set[str]]:
+        """IIDs and attachment paths of the items in a recovered NDJSON file (blocking)"""
+        iids, attachments = set(), set()
+        for item in iter_ndjson(ndjson_path):
+            iids.add(item['iid'])
+            attachments.update(attachments_of(item))
+        return iids, attachments
+    
+    def _schedule_attachments(
+        self,
+        attachment_paths: Set[str],
+        pending: Dict[str, "asyncio.Task"],
+        project_path: str,
+        attachments_dir: Path
+    ):
+        """Start background downloads of attachments not scheduled yet"""
+        for attachment_path in attachment_paths:
+            if attachment_path not in pending:
+                pending[attachment_path] = asyncio.create_task(
+                    self._download_attachment(project_path, attachment_path, attachments_dir)
+                )
+    
     def _create_directory_structure(self, output_dir: Path):
         """Create export directory structure"""
         subdirs = [
@@ -402,46 +752,38 @@ class ExportAgent(BaseAgent):
             if not http_url:
                 return {"success": False, "error": "No repository URL found"}
             
-            # Add authentication to URL
-            auth_url = http_url.replace('://', f'://oauth2:{self.gitlab_client.token}@')
-            
             self.log_event("INFO", f"Creating git bundle from {http_url}")
-            
-            # Create temporary clone directory
-            temp_dir = repo_dir / "temp_clone"
-            temp_dir.mkdir(parents=True, exist_ok=True)
+            repo_dir.mkdir(parents=True, exist_ok=True)
             
             # Get timeout from config or use defaults
             clone_timeout = 600  # 10 minutes for large repos
             bundle_timeout = 300  # 5 minutes for bundle creation
             
-            try:
-                # Clone repository (bare)
-                result = subprocess.run(
-                    ['git', 'clone', '--mirror', auth_url, str(temp_dir)],
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                    timeout=clone_timeout
-                )
+            async with self._mirror(http_url, repo_dir / "temp_clone", clone_timeout, "clone") as mirror_dir:
+                # Ref snapshot, the baseline of a later delta export
+                refs = await self._list_refs(mirror_dir)
+                with open(repo_dir / "refs.json", 'w') as f:
+                    json.dump(refs, f, indent=2)
                 
-                # Create bundle
-                result = subprocess.run(
-                    ['git', 'bundle', 'create', str(bundle_path), '--all'],
-                    cwd=temp_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                    timeout=bundle_timeout
-                )
+                if self.delta is None:
+                    # Create bundle
+                    result = await self.git.run(
+                        ['git', 'bundle', 'create', '--progress', str(bundle_path), '--all'],
+                        cwd=mirror_dir,
+                        timeout=bundle_timeout,
+                        progress=self._git_progress("bundle")
+                    )
+                else:
+                    bundle_path = await self._create_delta_bundle(
+                        mirror_dir, repo_dir / "delta.bundle", refs, bundle_timeout
+                    )
                 
                 # Export submodule info if present
                 try:
-                    result = subprocess.run(
-                        ['git', 'config', '--file', '.gitmodules', '--list'],
-                        cwd=temp_dir,
-                        capture_output=True,
-                        text=True,
+                    result = await self.git.run(
+                        ['git', 'config', '--blob', 'HEAD:.gitmodules', '--list'],
+                        cwd=mirror_dir,
+                        check=False,
                         timeout=10
                     )
                     if result.returncode == 0 and result.stdout:
@@ -456,10 +798,13 @@ class ExportAgent(BaseAgent):
                 lfs_result = None
                 if has_lfs:
                     self.log_event("INFO", "Git LFS detected, fetching objects...")
-                    lfs_result = await self._export_lfs_objects(project_id, repo_dir, temp_dir)
+                    lfs_result = await self._export_lfs_objects(
+                        project_id, repo_dir, mirror_dir, lfs_url=lfs_endpoint(http_url)
+                    )
                 
-                # Build artifacts list safely
-                artifacts = [str(bundle_path.relative_to(output_dir.parent))]
+                # Build artifacts list safely (a delta without new commits has no bundle)
+                artifacts = [str(bundle_path.relative_to(output_dir.parent))] if bundle_path else []
+                artifacts.append(str((repo_dir / "refs.json").relative_to(output_dir.parent)))
                 if has_lfs and lfs_result and lfs_result.get("success"):
                     # Add LFS manifest to artifacts
                     lfs_manifest = repo_dir / "lfs" / "manifest.json"
@@ -472,11 +817,6 @@ class ExportAgent(BaseAgent):
                     "has_lfs": has_lfs,
                     "lfs_objects_count": lfs_result.get("count", 0) if lfs_result else 0
                 }
-                
-            finally:
-                # Cleanup temporary clone
-                if temp_dir.exists():
-                    shutil.rmtree(temp_dir, ignore_errors=True)
             
         except subprocess.TimeoutExpired as e:
             error = f"Repository operation timed out: {e.cmd[0] if e.cmd else 'unknown'}"
@@ -488,18 +828,130 @@ class ExportAgent(BaseAgent):
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    async def _list_refs(self, repo_path: Path) -> Dict[str, str]:
+        """Map every ref of a repository to the object it points to"""
+        result = await self.git.run(
+            ['git', 'for-each-ref', '--format=%(objectname) %(refname)'],
+            cwd=repo_path,
+            timeout=60
+        )
+        refs = {}
+        for line in result.stdout.splitlines():
+            sha, _, ref = line.partition(' ')
+            if ref:
+                refs[ref] = sha
+        return refs
+    
+    async def _create_delta_bundle(
+        self,
+        mirror_dir: Path,
+        bundle_path: Path,
+        refs: Dict[str, str],
+        timeout: int
+    ) -> Optional[Path]:
+        """
+        Bundle the refs that changed since the baseline export.
+        
+        Baseline ref targets still present in the mirror are excluded, so
+        the bundle only carries new objects and lists the baseline commits
+        it builds on as prerequisites.
+        
+        Args:
+            mirror_dir: Up-to-date bare mirror
+            bundle_path: Bundle to write
+            refs: Current refs of the mirror
+            timeout: Seconds allowed for bundling
+            
+        Returns:
+            The bundle, or None when no ref needs new objects
+        """
+        baseline_refs = self.delta["refs"]
+        changed = sorted(ref for ref, sha in refs.items() if baseline_refs.get(ref) != sha)
+        bundle_path.unlink(missing_ok=True)
+        if not changed:
+            return None
+        
+        # Rewritten history may have dropped baseline commits from the mirror
+        candidates = sorted(set(baseline_refs.values()))
+        known = []
+        if candidates:
+            result = await self.git.run(
+                ['git', 'cat-file', '--batch-check=%(objectname)'],
+                cwd=mirror_dir,
+                input='\n'.join(candidates) + '\n',
+                timeout=60
+            )
+            known = [line for line in result.stdout.splitlines() if not line.endswith(' missing')]
+        
+        # Revisions go through stdin: mirrors can have far too many refs for a command line
+        try:
+            await self.git.run(
+                ['git', 'bundle', 'create', '--progress', str(bundle_path), '--stdin'],
+                cwd=mirror_dir,
+                input='\n'.join(changed + [f"^{sha}" for sha in known]) + '\n',
+                timeout=timeout,
+                progress=self._git_progress("bundle")
+            )
+        except subprocess.CalledProcessError as e:
+            if 'empty bundle' in (e.stderr or ''):
+                return None  # Changed refs only point at commits the baseline has
+            raise
+        return bundle_path
+    
+    @asynccontextmanager
+    async def _mirror(
+        self,
+        url: str,
+        temp_dir: Path,
+        timeout: int,
+        operation: str
+    ) -> AsyncIterator[Path]:
+        """
+        Provide an up-to-date bare mirror of ``url``.
+        
+        Uses the persistent mirror cache when enabled, so repeat exports only
+        fetch new objects; otherwise clones into ``temp_dir`` and removes it
+        afterwards.
+        
+        Args:
+            url: Remote URL (without credentials)
+            temp_dir: Clone location when the cache is disabled
+            timeout: Seconds allowed for the clone or update
+            operation: Label for progress events
+            
+        Yields:
+            Path of the bare mirror
+        """
+        cache = self.mirror_cache or MirrorCache(temp_dir)
+        try:
+            async with cache.mirror(
+                url,
+                token=self.gitlab_client.token,
+                timeout=timeout,
+                progress=self._git_progress(operation)
+            ) as mirror_path:
+                yield mirror_path
+        finally:
+            if cache is not self.mirror_cache and temp_dir.exists():
+                shutil.rmtree(temp_dir, ignore_errors=True)
+    
     async def _export_lfs_objects(
         self,
         project_id: int,
         repo_dir: Path,
-        temp_clone_dir: Path
+        temp_clone_dir: Path,
+        lfs_url: Optional[str] = None
     ) -> Dict[str, Any]:
         """Export Git LFS objects from repository
         
+        With ``lfs_url`` and the ``batch`` engine, objects are downloaded
+        straight from the LFS batch API; ``git lfs fetch`` is the fallback.
+        
         Args:
             project_id: GitLab project ID
             repo_dir: Directory where repository export is stored
             temp_clone_dir: Temporary clone directory
+            lfs_url: LFS API root of the project
             
         Returns:
             Dict with success status, count of objects, and total size
@@ -508,6 +960,13 @@ class ExportAgent(BaseAgent):
             lfs_dir = repo_dir / "lfs"
             lfs_dir.mkdir(parents=True, exist_ok=True)
             
+            if lfs_url and self.lfs_transfer_engine == "batch":
+                try:
+                    return await self._export_lfs_batch(lfs_url, lfs_dir, temp_clone_dir)
+                except (LFSError, httpx.HTTPError) as e:
+                    error = self._sanitize_error_message(str(e), self.gitlab_client.token)
+                    self.log_event("WARNING", f"LFS batch download failed, falling back to git lfs fetch: {error}")
+            
             # Get list of LFS objects from the cloned repository
             lfs_objects = await self._get_lfs_object_list(temp_clone_dir)
             
@@ -520,32 +979,27 @@ class ExportAgent(BaseAgent):
             # Fetch all LFS objects using git lfs fetch
             try:
                 # First, ensure LFS is initialized
-                subprocess.run(
+                await self.git.run(
                     ['git', 'lfs', 'install'],
                     cwd=temp_clone_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True,
                     timeout=30
                 )
                 
                 # Fetch all LFS objects
                 self.log_event("INFO", "Fetching LFS objects...")
-                result = subprocess.run(
+                result = await self.git.run(
                     ['git', 'lfs', 'fetch', '--all'],
                     cwd=temp_clone_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True,
                     timeout=600  # 10 minutes for large LFS files
                 )
                 
                 # Copy LFS objects from .git/lfs to export directory
-                lfs_storage = temp_clone_dir / '.git' / 'lfs' / 'objects'
+                lfs_storage = temp_clone_dir / 'lfs' / 'objects'  # bare mirror
+                if not lfs_storage.exists():
+                    lfs_storage = temp_clone_dir / '.git' / 'lfs' / 'objects'
                 if lfs_storage.exists():
-                    dest_lfs_storage = lfs_dir / 'objects'
-                    dest_lfs_storage.mkdir(parents=True, exist_ok=True)
-                    shutil.copytree(lfs_storage, dest_lfs_storage, dirs_exist_ok=True)
+                    # LFS objects are immutable, so hardlinks are safe
+                    await asyncio.to_thread(fast_copy_tree, lfs_storage, lfs_dir / 'objects')
                 else:
                     # LFS storage doesn't exist even though we have LFS objects - warn and fail
                     if lfs_objects:
@@ -553,22 +1007,7 @@ class ExportAgent(BaseAgent):
                         self.log_event("ERROR", error)
                         return {"success": False, "error": error}
                 
-                # Calculate total size and create manifest
-                total_size = 0
-                for obj in lfs_objects:
-                    total_size += obj.get("size", 0)
-                
-                manifest = {
-                    "objects": lfs_objects,
-                    "total_count": len(lfs_objects),
-                    "total_size": total_size,
-                    "exported_at": datetime.now().isoformat()
-                }
-                
-                # Write manifest
-                manifest_path = lfs_dir / "manifest.json"
-                with open(manifest_path, 'w') as f:
-                    json.dump(manifest, f, indent=2)
+                total_size = self._write_lfs_manifest(lfs_dir, lfs_objects)
                 
                 self.log_event("INFO", f"Exported {len(lfs_objects)} LFS objects ({total_size} bytes)")
                 
@@ -587,6 +1026,49 @@ class ExportAgent(BaseAgent):
             self.log_event("ERROR", f"Error exporting LFS objects: {str(e)}")
             return {"success": False, "error": str(e)}
     
+    async def _export_lfs_batch(self, lfs_url: str, lfs_dir: Path, mirror_dir: Path) -> Dict[str, Any]:
+        """Download LFS objects referenced by the mirror through the batch API
+        
+        Args:
+            lfs_url: LFS API root of the project
+            lfs_dir: LFS export directory
+            mirror_dir: Bare mirror to scan for LFS pointers
+            
+        Returns:
+            Dict with success status, count of objects, and total size
+        """
+        lfs_objects = await scan_lfs_pointers(mirror_dir, self.git)
+        if not lfs_objects:
+            self.log_event("INFO", "No LFS objects found in repository")
+            return {"success": True, "count": 0, "total_size": 0}
+        
+        self.log_event("INFO", f"Found {len(lfs_objects)} LFS objects, downloading through the batch API")
+        client = LFSBatchClient(lfs_url, "oauth2", self.gitlab_client.token, concurrency=self.lfs_concurrency)
+        try:
+            stats = await client.download(lfs_objects, lfs_dir / "objects")
+        finally:
+            await client.close()
+        
+        total_size = self._write_lfs_manifest(lfs_dir, lfs_objects)
+        self.log_event(
+            "INFO",
+            f"Exported {len(lfs_objects)} LFS objects ({total_size} bytes, {stats['skipped']} already present)"
+        )
+        return {"success": True, "count": len(lfs_objects), "total_size": total_size, **stats}
+    
+    def _write_lfs_manifest(self, lfs_dir: Path, lfs_objects: List[Dict[str, Any]]) -> int:
+        """Write ``manifest.json`` for the exported LFS objects and return their total size"""
+        total_size = sum(obj.get("size", 0) for obj in lfs_objects)
+        manifest = {
+            "objects": lfs_objects,
+            "total_count": len(lfs_objects),
+            "total_size": total_size,
+            "exported_at": datetime.now().isoformat()
+        }
+        with open(lfs_dir / "manifest.json", 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return total_size
+    
     async def _get_lfs_object_list(self, repo_path: Path) -> List[Dict[str, Any]]:
         """Get list of LFS objects in repository
         
@@ -598,11 +1080,10 @@ class ExportAgent(BaseAgent):
         """
         try:
             # Use git lfs ls-files to get list of LFS files
-            result = subprocess.run(
+            result = await self.git.run(
                 ['git', 'lfs', 'ls-files', '--long', '--all'],
                 cwd=repo_path,
-                capture_output=True,
-                text=True,
+                check=False,
                 timeout=60
             )
             
@@ -749,78 +1230,59 @@ class ExportAgent(BaseAgent):
         output_dir: Path
     ) -> Dict[str, Any]:
         """Export all issues with comments and attachments"""
+        pending_attachments = {}  # Attachment path -> download task
         try:
             issues_dir = output_dir / "issues"
             attachments_dir = issues_dir / "attachments"
-            all_issues = []
-            attachment_metadata = {}  # Maps old paths to new paths
             project_path = project.get('path_with_namespace', str(project_id))
             
-            # Check if resuming
-            last_processed = None
-            if self.checkpoint and self.checkpoint.should_resume_component("issues"):
-                last_processed = self.checkpoint.get_last_processed_item("issues")
-                self.log_event("INFO", f"Resuming issues export from iid {last_processed}")
-            
-            skip_until_found = last_processed is not None
-            
-            # list_issues returns a List, not an async generator
-            issues_list = await self.gitlab_client.list_issues(project_id)
-            for issue in issues_list:
-                issue_iid = issue['iid']
-                
-                # Skip until we find the last processed issue
-                if skip_until_found:
-                    if issue_iid == last_processed:
-                        skip_until_found = False
-                    continue
-                
-                # Get full issue details
-                full_issue = await self.gitlab_client.get_issue(project_id, issue_iid)
-                
-                # Get comments/notes
-                notes = await self.gitlab_client.list_issue_notes(project_id, issue_iid)
-                full_issue['notes'] = notes
-                
-                # Extract and download attachments from description
-                attachments_found = set()
-                if full_issue.get('description'):
-                    attachments_found.update(self._extract_attachments(full_issue['description']))
-                
-                # Extract attachments from notes/comments
-                for note in notes:
-                    if note.get('body'):
-                        attachments_found.update(self._extract_attachments(note['body']))
-                
-                # Download attachments
-                for attachment_path in attachments_found:
-                    if attachment_path not in attachment_metadata:
-                        local_path = await self._download_attachment(
-                            project_path,
-                            attachment_path,
-                            attachments_dir
-                        )
-                        if local_path:
-                            # Store relative path for later use
-                            attachment_metadata[attachment_path] = str(local_path.relative_to(output_dir))
-                
-                all_issues.append(full_issue)
+            # Items are appended to NDJSON as they finish; a resumed export
+            # continues after the last item that made it to disk
+            ndjson_path = issues_dir / "issues.ndjson"
+            resume = bool(self.checkpoint and self.checkpoint.should_resume_component("issues"))
+            
+            async with NdjsonWriter(ndjson_path, resume=resume) as writer:
+                exported = set()
+                if writer.count:
+                    self.log_event("INFO", f"Resuming issues export ({writer.count} on disk)")
+                    # Issues recovered from disk are skipped by iid, and still
+                    # need their attachments in this run's downloads and metadata
+                    exported, recovered_attachments = await asyncio.to_thread(
+                        self._scan_recovered, ndjson_path, self._issue_attachments
+                    )
+                    self._schedule_attachments(
+                        recovered_attachments, pending_attachments, project_path, attachments_dir
+                    )
                 
-                # Update checkpoint progress every 10 issues
-                if len(all_issues) % 10 == 0:
-                    self.log_event("INFO", f"Exported {len(all_issues)} issues...")
-                    if self.checkpoint:
-                        self.checkpoint.update_component_progress(
-                            "issues",
-                            processed_items=len(all_issues),
-                            last_item=issue_iid
-                        )
-            
-            # Save all issues
-            with open(issues_dir / "issues.json", 'w') as f:
-                json.dump(all_issues, f, indent=2)
+                async for full_issue in self._iter_full_issues(project_id, project, exported):
+                    issue_iid = full_issue['iid']
+                    
+                    # Download attachments of the description and notes in
+                    # the background through the shared pool
+                    self._schedule_attachments(
+                        self._issue_attachments(full_issue), pending_attachments, project_path, attachments_dir
+                    )
+                    
+                    await writer.awrite(full_issue)
+                    
+                    # Update checkpoint progress every 10 issues
+                    if writer.count % 10 == 0:
+                        self.log_event("INFO", f"Exported {writer.count} issues...")
+                        if self.checkpoint:
+                            self.checkpoint.update_component_progress(
+                                "issues",
+                                processed_items=writer.count,
+                                last_item=issue_iid
+                            )
+            
+            # Build the final JSON array from the NDJSON file, item by item
+            exported_count = await asyncio.to_thread(
+                ndjson_to_json_array, ndjson_path, issues_dir / "issues.json"
+            )
+            ndjson_path.unlink()
             
-            # Save attachment metadata mapping
+            # Save attachment metadata mapping (old paths to new paths)
+            attachment_metadata = await self._collect_attachments(pending_attachments, output_dir)
             if attachment_metadata:
                 with open(issues_dir / "attachment_metadata.json", 'w') as f:
                     json.dump(attachment_metadata, f, indent=2)
@@ -828,12 +1290,150 @@ class ExportAgent(BaseAgent):
             
             return {
                 "success": True,
-                "count": len(all_issues)
+                "count": exported_count
             }
             
         except Exception as e:
+            for task in pending_attachments.values():
+                task.cancel()
             return {"success": False, "error": str(e)}
     
+    async def _iter_full_issues(
+        self,
+        project_id: int,
+        project: Dict[str, Any],
+        exported: Optional[Set[int]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate issues with full details and notes.
+        
+        Uses the GraphQL bulk fetcher when enabled, which returns a page of
+        issues with their notes per query, and falls back to REST if GraphQL
+        fails before the first issue. Over REST, ``detail_workers`` issues
+        are enriched concurrently (notes, plus ``get_issue`` only when the
+        list item lacks ``ISSUE_DETAIL_FIELDS``) and yielded in list order.
+        A delta export only asks for issues updated since its baseline.
+        
+        Args:
+            project_id: Project ID
+            project: Project details
+            exported: IIDs of the issues already exported (skipped, whatever
+                order the engine lists them in)
+            
+        Yields:
+            Issues with a ``notes`` list
+        """
+        exported = exported or set()
+        filters = {"updated_after": self.delta["since"]} if self.delta else {}
+        
+        def skip(iid: int) -> bool:
+            return iid in exported
+        
+        if self.graphql:
+            started = False
+            try:
+                async for issue in self.graphql.iter_issues(
+                    project['path_with_namespace'], project_id, **filters
+                ):
+                    started = True
+                    if not skip(issue['iid']):
+                        yield issue
+                return
+            except Exception as e:
+                if started:
+                    raise
+                self.log_event("WARNING", f"GraphQL issue export unavailable, using REST: {e}")
+        
+        async def pending_issues():
+            async for issue in self.gitlab_client.iter_issues(project_id, **filters):
+                if not skip(issue['iid']):
+                    yield issue
+        
+        async def enrich(issue: Dict[str, Any]) -> Dict[str, Any]:
+            issue_iid = issue['iid']
+            
+            async def details() -> Dict[str, Any]:
+                if all(field in issue for field in ISSUE_DETAIL_FIELDS):
+                    return dict(issue)
+                return await self.gitlab_client.get_issue(project_id, issue_iid)
+            
+            full_issue, notes = await asyncio.gather(
+                details(),
+                self.gitlab_client.list_issue_notes(project_id, issue_iid)
+            )
+            full_issue['notes'] = notes
+            return full_issue
+        
+        async for full_issue in ordered_map(pending_issues(), enrich, workers=self.detail_workers):
+            yield full_issue
+    
+    async def _iter_full_merge_requests(
+        self,
+        project_id: int,
+        project: Dict[str, Any],
+        exported: Optional[Set[int]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate merge requests with full details, discussions and approvals.
+        
+        Same engine selection, fallback and REST pipeline as
+        ``_iter_full_issues``; discussions, approvals and (if the list item
+        lacks ``MR_DETAIL_FIELDS``) details are fetched concurrently.
+        
+        Args:
+            project_id: Project ID
+            project: Project details
+            exported: IIDs of the merge requests already exported
+            
+        Yields:
+            Merge requests with ``discussions`` and ``approvals``
+        """
+        exported = exported or set()
+        filters = {"updated_after": self.delta["since"]} if self.delta else {}
+        
+        def skip(iid: int) -> bool:
+            return iid in exported
+        
+        if self.graphql:
+            started = False
+            try:
+                async for mr in self.graphql.iter_merge_requests(
+                    project['path_with_namespace'], project_id, **filters
+                ):
+                    started = True
+                    if not skip(mr['iid']):
+                        yield mr
+                return
+            except Exception as e:
+                if started:
+                    raise
+                self.log_event("WARNING", f"GraphQL merge request export unavailable, using REST: {e}")
+        
+        async def pending_merge_requests():
+            async for mr in self.gitlab_client.iter_merge_requests(project_id, **filters):
+                if not skip(mr['iid']):
+                    yield mr
+        
+        async def enrich(mr: Dict[str, Any]) -> Dict[str, Any]:
+            mr_iid = mr['iid']
+            
+            async def details() -> Dict[str, Any]:
+                if all(field in mr for field in MR_DETAIL_FIELDS):
+                    return dict(mr)
+                return await self.gitlab_client.get_merge_request(project_id, mr_iid)
+            
+            full_mr, discussions, approvals = await asyncio.gather(
+                details(),
+                self.gitlab_client.list_merge_request_discussions(project_id, mr_iid),
+                self.gitlab_client.list_merge_request_approvals(project_id, mr_iid)
+            )
+            full_mr['discussions'] = discussions
+            full_mr['approvals'] = approvals
+            return full_mr
+        
+        async for full_mr in ordered_map(pending_merge_requests(), enrich, workers=self.detail_workers):
+            yield full_mr
+    
     async def _export_merge_requests(
         self,
         project_id: int,
@@ -841,83 +1441,59 @@ class ExportAgent(BaseAgent):
         output_dir: Path
     ) -> Dict[str, Any]:
         """Export all merge requests with discussions"""
+        pending_attachments = {}  # Attachment path -> download task
         try:
             mrs_dir = output_dir / "merge_requests"
             attachments_dir = mrs_dir / "attachments"
-            all_mrs = []
-            attachment_metadata = {}  # Maps old paths to new paths
             project_path = project.get('path_with_namespace', str(project_id))
             
-            # Check if resuming
-            last_processed = None
-            if self.checkpoint and self.checkpoint.should_resume_component("merge_requests"):
-                last_processed = self.checkpoint.get_last_processed_item("merge_requests")
-                self.log_event("INFO", f"Resuming MRs export from iid {last_processed}")
-            
-            skip_until_found = last_processed is not None
-            
-            # list_merge_requests returns a List, not an async generator
-            mrs_list = await self.gitlab_client.list_merge_requests(project_id)
-            for mr in mrs_list:
-                mr_iid = mr['iid']
-                
-                # Skip until we find the last processed MR
-                if skip_until_found:
-                    if mr_iid == last_processed:
-                        skip_until_found = False
-                    continue
-                
-                # Get full MR details
-                full_mr = await self.gitlab_client.get_merge_request(project_id, mr_iid)
-                
-                # Get discussions
-                discussions = await self.gitlab_client.list_merge_request_discussions(project_id, mr_iid)
-                full_mr['discussions'] = discussions
-                
-                # Get approvals
-                approvals = await self.gitlab_client.list_merge_request_approvals(project_id, mr_iid)
-                full_mr['approvals'] = approvals
-                
-                # Extract and download attachments from description
-                attachments_found = set()
-                if full_mr.get('description'):
-                    attachments_found.update(self._extract_attachments(full_mr['description']))
-                
-                # Extract attachments from discussions
-                for discussion in discussions:
-                    for note in discussion.get('notes', []):
-                        if note.get('body'):
-                            attachments_found.update(self._extract_attachments(note['body']))
-                
-                # Download attachments
-                for attachment_path in attachments_found:
-                    if attachment_path not in attachment_metadata:
-                        local_path = await self._download_attachment(
-                            project_path,
-                            attachment_path,
-                            attachments_dir
-                        )
-                        if local_path:
-                            # Store relative path for later use
-                            attachment_metadata[attachment_path] = str(local_path.relative_to(output_dir))
-                
-                all_mrs.append(full_mr)
+            # Items are appended to NDJSON as they finish; a resumed export
+            # continues after the last item that made it to disk
+            ndjson_path = mrs_dir / "merge_requests.ndjson"
+            resume = bool(self.checkpoint and self.checkpoint.should_resume_component("merge_requests"))
+            
+            async with NdjsonWriter(ndjson_path, resume=resume) as writer:
+                exported = set()
+                if writer.count:
+                    self.log_event("INFO", f"Resuming MRs export ({writer.count} on disk)")
+                    # MRs recovered from disk are skipped by iid, and still need
+                    # their attachments in this run's downloads and metadata
+                    exported, recovered_attachments = await asyncio.to_thread(
+                        self._scan_recovered, ndjson_path, self._merge_request_attachments
+                    )
+                    self._schedule_attachments(
+                        recovered_attachments, pending_attachments, project_path, attachments_dir
+                    )
                 
-                # Update checkpoint progress every 10 MRs
-                if len(all_mrs) % 10 == 0:
-                    self.log_event("INFO", f"Exported {len(all_mrs)} merge requests...")
-                    if self.checkpoint:
-                        self.checkpoint.update_component_progress(
-                            "merge_requests",
-                            processed_items=len(all_mrs),
-                            last_item=mr_iid
-                        )
-            
-            # Save all MRs
-            with open(mrs_dir / "merge_requests.json", 'w') as f:
-                json.dump(all_mrs, f, indent=2)
+                async for full_mr in self._iter_full_merge_requests(project_id, project, exported):
+                    mr_iid = full_mr['iid']
+                    
+                    # Download attachments of the description and discussions
+                    # in the background through the shared pool
+                    self._schedule_attachments(
+                        self._merge_request_attachments(full_mr), pending_attachments, project_path, attachments_dir
+                    )
+                    
+                    await writer.awrite(full_mr)
+                    
+                    # Update checkpoint progress every 10 MRs
+                    if writer.count % 10 == 0:
+                        self.log_event("INFO", f"Exported {writer.count} merge requests...")
+                        if self.checkpoint:
+                            self.checkpoint.update_component_progress(
+                                "merge_requests",
+                                processed_items=writer.count,
+                                last_item=mr_iid
+                            )
+            
+            # Build the final JSON array from the NDJSON file, item by item
+            exported_count = await asyncio.to_thread(
+                ndjson_to_json_array, ndjson_path, mrs_dir / "merge_requests.json"
+            )
+            ndjson_path.unlink()
             
-            # Save attachment metadata mapping
+            # Save attachment metadata mapping (old paths to new paths)
+            attachment_metadata = await self._collect_attachments(pending_attachments, output_dir)
             if attachment_metadata:
                 with open(mrs_dir / "attachment_metadata.json", 'w') as f:
                     json.dump(attachment_metadata, f, indent=2)
@@ -925,10 +1501,12 @@ class ExportAgent(BaseAgent):
             
             return {
                 "success": True,
-                "count": len(all_mrs)
+                "count": exported_count
             }
             
         except Exception as e:
+            for task in pending_attachments.values():
+                task.cancel()
             return {"success": False, "error": str(e)}
     
     async def _export_wiki(
@@ -954,44 +1532,28 @@ class ExportAgent(BaseAgent):
             
             # Wiki URL is typically project_url + .wiki.git
             wiki_url = http_url.replace('.git', '.wiki.git')
-            auth_wiki_url = wiki_url.replace('://', f'://oauth2:{self.gitlab_client.token}@')
-            
             bundle_path = wiki_dir / "wiki.git"
-            temp_dir = wiki_dir / "temp_wiki_clone"
-            temp_dir.mkdir(parents=True, exist_ok=True)
+            wiki_dir.mkdir(parents=True, exist_ok=True)
             
-            try:
-                # Try to clone wiki
-                result = subprocess.run(
-                    ['git', 'clone', '--mirror', auth_wiki_url, str(temp_dir)],
-                    capture_output=True,
-                    text=True,
-                    timeout=120
-                )
-                
-                if result.returncode != 0:
+            async with AsyncExitStack() as stack:
+                try:
+                    mirror_dir = await stack.enter_async_context(
+                        self._mirror(wiki_url, wiki_dir / "temp_wiki_clone", 120, "wiki clone")
+                    )
+                except subprocess.CalledProcessError:
                     # Wiki might be empty or not initialized
                     with open(wiki_dir / "wiki_empty.txt", 'w') as f:
                         f.write("Wiki exists but is empty or not initialized.\n")
                     return {"success": True, "count": 0}
                 
                 # Create bundle
-                subprocess.run(
+                await self.git.run(
                     ['git', 'bundle', 'create', str(bundle_path), '--all'],
-                    cwd=temp_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True,
+                    cwd=mirror_dir,
                     timeout=60
                 )
                 
                 return {"success": True, "count": 1}
-                
-            finally:
-                # Cleanup
-                import shutil
-                if temp_dir.exists():
-                    shutil.rmtree(temp_dir, ignore_errors=True)
             
         except subprocess.TimeoutExpired:
             return {"success": False, "error": "Wiki clone/bundle timed out"}
@@ -1000,6 +1562,288 @@ class ExportAgent(BaseAgent):
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    async def _choose_backend(self, project_id: int, inputs: Dict[str, Any]) -> str:
+        """
+        Pick how issues, MRs and git data are exported.
+        
+        ``export_backend`` is ``api`` (default), ``archive`` (GitLab's project
+        export) or ``auto``, which uses the archive once the project has at
+        least ``archive_threshold`` issues and merge requests together. Delta
+        exports always use the API: the archive is a full export.
+        
+        Args:
+            project_id: GitLab project ID
+            inputs: Export inputs
+            
+        Returns:
+            ``api`` or ``archive``
+        """
+        backend = inputs.get("export_backend", "api")
+        if backend == "api" or self.delta is not None:
+            return "api"
+        if backend == "archive":
+            return backend
+        
+        try:
+            issues, merge_requests = await asyncio.gather(
+                self.gitlab_client.count_issues(project_id),
+                self.gitlab_client.count_merge_requests(project_id)
+            )
+        except Exception as e:
+            self.log_event("WARNING", f"Could not size project {project_id}, using the API backend: {e}")
+            return "api"
+        
+        backend = "archive" if issues + merge_requests >= inputs.get("archive_threshold", 10000) else "api"
+        self.log_event("INFO", f"{issues} issues and {merge_requests} merge requests: using the {backend} backend")
+        return backend
+    
+    async def _project_archive(self, project_id: int, output_dir: Path) -> ProjectArchive:
+        """The project export archive, fetched once for all components that read it"""
+        if self._archive is None:
+            self._archive = asyncio.ensure_future(
+                self._fetch_project_archive(project_id, output_dir / ".project_archive")
+            )
+        return await asyncio.shield(self._archive)
+    
+    async def _fetch_project_archive(self, project_id: int, work_dir: Path) -> ProjectArchive:
+        """
+        Have GitLab export the project, then download and extract the archive.
+        
+        An interrupted download is resumed as long as GitLab still has the
+        finished export; otherwise a new export is scheduled.
+        
+        Args:
+            project_id: GitLab project ID
+            work_dir: Directory for the archive and its extraction
+            
+        Returns:
+            Reader for the extracted archive
+            
+        Raises:
+            ProjectArchiveError: If the export fails, times out or can't be downloaded
+        """
+        archive_path = work_dir / "project_export.tar.gz"
+        part_path = work_dir / "project_export.tar.gz.part"
+        work_dir.mkdir(parents=True, exist_ok=True)
+        
+        if not archive_path.exists():
+            status = (await self.gitlab_client.get_project_export(project_id)).get("export_status")
+            if not (part_path.exists() and status == "finished"):
+                part_path.unlink(missing_ok=True)
+                await self.gitlab_client.start_project_export(project_id)
+                self.log_event("INFO", f"Scheduled GitLab project export of project {project_id}")
+                
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + self.archive_timeout
+                while True:
+                    await asyncio.sleep(self.archive_poll_interval)
+                    status = (await self.gitlab_client.get_project_export(project_id)).get("export_status")
+                    if status == "finished":
+                        break
+                    if status == "failed":
+                        raise ProjectArchiveError(f"GitLab failed to export project {project_id}")
+                    if loop.time() > deadline:
+                        raise ProjectArchiveError(f"Project export still {status} after {self.archive_timeout}s")
+            
+            self.log_event("INFO", f"Downloading project export of project {project_id}")
+            if not await self.gitlab_client.download_project_export(project_id, archive_path):
+                raise ProjectArchiveError(f"Failed to download the export of project {project_id}")
+        
+        return await asyncio.to_thread(ProjectArchive.extract, archive_path, work_dir / "extracted")
+    
+    async def _export_repository_from_archive(
+        self,
+        project_id: int,
+        project: Dict[str, Any],
+        output_dir: Path
+    ) -> Dict[str, Any]:
+        """Export the repository bundle and LFS objects from the project export archive"""
+        try:
+            archive = await self._project_archive(project_id, output_dir)
+            if not archive.repository_bundle.exists():
+                return {"success": False, "error": "Project export contains no repository bundle"}
+            
+            repo_dir = output_dir / "repository"
+            bundle_path = repo_dir / "bundle.git"
+            await asyncio.to_thread(fast_copy_file, archive.repository_bundle, bundle_path)
+            with open(repo_dir / "refs.json", 'w') as f:
+                json.dump(self._read_bundle_header(bundle_path)[1], f, indent=2)
+            artifacts = [
+                str(bundle_path.relative_to(output_dir.parent)),
+                str((repo_dir / "refs.json").relative_to(output_dir.parent))
+            ]
+            
+            # Same store layout as objects fetched through the LFS API
+            lfs_objects = archive.lfs_objects()
+            if lfs_objects:
+                lfs_dir = repo_dir / "lfs"
+                for obj in lfs_objects:
+                    await asyncio.to_thread(
+                        fast_copy_file,
+                        archive.lfs_objects_dir / obj["oid"],
+                        object_path(lfs_dir / "objects", obj["oid"])
+                    )
+                self._write_lfs_manifest(lfs_dir, lfs_objects)
+                artifacts.append(str((lfs_dir / "manifest.json").relative_to(output_dir.parent)))
+            
+            return {
+                "success": True,
+                "artifacts": artifacts,
+                "has_lfs": bool(lfs_objects),
+                "lfs_objects_count": len(lfs_objects)
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def _export_wiki_from_archive(
+        self,
+        project_id: int,
+        project: Dict[str, Any],
+        output_dir: Path
+    ) -> Dict[str, Any]:
+        """Export the wiki bundle from the project export archive"""
+        try:
+            wiki_dir = output_dir / "wiki"
+            if not project.get('wiki_enabled', False):
+                with open(wiki_dir / "wiki_disabled.txt", 'w') as f:
+                    f.write("Wiki is not enabled for this project.\n")
+                return {"success": True, "count": 0}
+            
+            archive = await self._project_archive(project_id, output_dir)
+            if not archive.wiki_bundle.exists():
+                with open(wiki_dir / "wiki_empty.txt", 'w') as f:
+                    f.write("Wiki exists but is empty or not initialized.\n")
+                return {"success": True, "count": 0}
+            
+            await asyncio.to_thread(fast_copy_file, archive.wiki_bundle, wiki_dir / "wiki.git")
+            return {"success": True, "count": 1}
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def _export_issues_from_archive(
+        self,
+        project_id: int,
+        project: Dict[str, Any],
+        output_dir: Path
+    ) -> Dict[str, Any]:
+        """Export issues with notes and attachments from the project export archive"""
+        try:
+            archive = await self._project_archive(project_id, output_dir)
+            issues_dir = output_dir / "issues"
+            
+            count, attachments = await asyncio.to_thread(
+                self._write_archived_items,
+                archive.iter_issues(project_id, project.get('web_url', '')),
+                issues_dir / "issues.json",
+                lambda issue: [issue.get('description')] + [note.get('body') for note in issue['notes']]
+            )
+            
+            attachment_metadata = await self._copy_archived_attachments(
+                archive, attachments, project, issues_dir / "attachments", output_dir
+            )
+            if attachment_metadata:
+                with open(issues_dir / "attachment_metadata.json", 'w') as f:
+                    json.dump(attachment_metadata, f, indent=2)
+            
+            self.log_event("INFO", f"Exported {count} issues from the project export")
+            return {"success": True, "count": count}
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def _export_merge_requests_from_archive(
+        self,
+        project_id: int,
+        project: Dict[str, Any],
+        output_dir: Path
+    ) -> Dict[str, Any]:
+        """Export merge requests with discussions and attachments from the project export archive"""
+        try:
+            archive = await self._project_archive(project_id, output_dir)
+            mrs_dir = output_dir / "merge_requests"
+            
+            count, attachments = await asyncio.to_thread(
+                self._write_archived_items,
+                archive.iter_merge_requests(project_id, project.get('web_url', '')),
+                mrs_dir / "merge_requests.json",
+                lambda mr: [mr.get('description')] + [
+                    note.get('body') for discussion in mr['discussions'] for note in discussion['notes']
+                ]
+            )
+            
+            attachment_metadata = await self._copy_archived_attachments(
+                archive, attachments, project, mrs_dir / "attachments", output_dir
+            )
+            if attachment_metadata:
+                with open(mrs_dir / "attachment_metadata.json", 'w') as f:
+                    json.dump(attachment_metadata, f, indent=2)
+            
+            self.log_event("INFO", f"Exported {count} merge requests from the project export")
+            return {"success": True, "count": count}
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def _write_archived_items(self, items, path: Path, texts) -> Tuple[int, Set[str]]:
+        """
+        Write converted archive items as a JSON array (run in a worker thread).
+        
+        Args:
+            items: Iterator of converted items
+            path: JSON file to write
+            texts: Callable returning the markdown texts of an item
+            
+        Returns:
+            Number of items and the attachment paths they reference
+        """
+        attachments: Set[str] = set()
+        with JsonArrayWriter(path) as writer:
+            for item in items:
+                for text in texts(item):
+                    if text:
+                        attachments.update(self._extract_attachments(text))
+                writer.write(item)
+        return writer.count, attachments
+    
+    async def _copy_archived_attachments(
+        self,
+        archive: ProjectArchive,
+        attachment_paths: Set[str],
+        project: Dict[str, Any],
+        attachments_dir: Path,
+        output_dir: Path
+    ) -> Dict[str, str]:
+        """
+        Copy referenced uploads out of the archive.
+        
+        Uploads the archive doesn't carry (e.g. links to other projects) are
+        downloaded like in an API export.
+        
+        Returns:
+            Attachment path -> local path relative to ``output_dir``
+        """
+        project_path = project.get('path_with_namespace', str(project.get('id')))
+        metadata = {}
+        pending = {}
+        for attachment_path in sorted(attachment_paths):
+            source = archive.upload_path(attachment_path)
+            if source is None:
+                pending[attachment_path] = asyncio.create_task(
+                    self._download_attachment(project_path, attachment_path, attachments_dir)
+                )
+                continue
+            if source.stat().st_size > MAX_FILE_SIZE:
+                self.log_event("WARNING", f"Skipping attachment over 100 MB: {attachment_path}")
+                continue
+            target = attachments_dir / self._attachment_filename(attachment_path)
+            await asyncio.to_thread(fast_copy_file, source, target)
+            metadata[attachment_path] = str(target.relative_to(output_dir))
+        
+        metadata.update(await self._collect_attachments(pending, output_dir))
+        return metadata
+    
     async def _export_releases(
         self,
         project_id: int,
@@ -1010,51 +1854,57 @@ class ExportAgent(BaseAgent):
         try:
             releases_dir = output_dir / "releases"
             
-            releases = await self.gitlab_client.list_releases(project_id)
-            
             # Download release assets
             total_assets = 0
             failed_downloads = []
+            release_count = 0
             
-            for release in releases:
-                tag_name = release.get("tag_name", "unknown")
-                release_dir = releases_dir / tag_name
-                release_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Download each asset
-                assets = release.get("assets", {})
-                links = assets.get("links", []) if isinstance(assets, dict) else []
-                
-                for asset in links:
-                    asset_url = asset.get("url")
-                    asset_name = asset.get("name")
+            # Releases are written with local paths as soon as their assets are in
+            with JsonArrayWriter(releases_dir / "releases.json") as writer:
+                async for release in self.gitlab_client.iter_releases(project_id):
+                    tag_name = release.get("tag_name", "unknown")
                     
-                    if not asset_url or not asset_name:
+                    # A delta export skips releases identical to the baseline's
+                    baseline_release = self.delta["releases"].get(tag_name) if self.delta else None
+                    if baseline_release and baseline_release == self._release_fingerprint(release):
                         continue
                     
-                    asset_path = release_dir / asset_name
-                    logger.info(f"Downloading release asset: {tag_name}/{asset_name}")
+                    release_dir = releases_dir / tag_name
+                    release_dir.mkdir(parents=True, exist_ok=True)
                     
-                    success = await self.gitlab_client.download_file(
-                        asset_url,
-                        asset_path
-                    )
+                    # Download each asset
+                    assets = release.get("assets", {})
+                    links = assets.get("links", []) if isinstance(assets, dict) else []
                     
-                    if success:
-                        # Store local path for later upload
-                        asset["local_path"] = str(asset_path)
-                        total_assets += 1
-                    else:
-                        failed_downloads.append(f"{tag_name}/{asset_name}")
-                        logger.warning(f"Failed to download asset: {tag_name}/{asset_name}")
-            
-            # Save releases metadata with local paths
-            with open(releases_dir / "releases.json", 'w') as f:
-                json.dump(releases, f, indent=2)
+                    for asset in links:
+                        asset_url = asset.get("url")
+                        asset_name = asset.get("name")
+                        
+                        if not asset_url or not asset_name:
+                            continue
+                        
+                        asset_path = release_dir / asset_name
+                        logger.info(f"Downloading release asset: {tag_name}/{asset_name}")
+                        
+                        success = await self.gitlab_client.download_file(
+                            asset_url,
+                            asset_path
+                        )
+                        
+                        if success:
+                            # Store local path for later upload
+                            asset["local_path"] = str(asset_path)
+                            total_assets += 1
+                        else:
+                            failed_downloads.append(f"{tag_name}/{asset_name}")
+                            logger.warning(f"Failed to download asset: {tag_name}/{asset_name}")
+                    
+                    writer.write(release)
+                    release_count += 1
             
             result = {
                 "success": True,
-                "count": len(releases),
+                "count": release_count,
                 "assets_downloaded": total_assets
             }
             
@@ -1067,27 +1917,36 @@ class ExportAgent(BaseAgent):
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    @staticmethod
+    def _release_fingerprint(release: Dict[str, Any]) -> str:
+        """Release metadata as exported, without the local asset paths added on export"""
+        release = json.loads(json.dumps(release))
+        assets = release.get("assets")
+        for link in (assets.get("links", []) if isinstance(assets, dict) else []):
+            link.pop("local_path", None)
+        return json.dumps(release, sort_keys=True)
+    
     async def _export_packages(
         self,
         project_id: int,
         project: Dict[str, Any],
         output_dir: Path
     ) -> Dict[str, Any]:
-        """Export package metadata and download package files"""
+        """
+        Export package metadata and download package files.
+        
+        ``package_concurrency`` packages are processed at once, their files
+        downloaded in parallel within the same bound. Files GitLab reports a
+        SHA-256 for are stored once under ``packages/blobs`` and linked into
+        every version directory, so a file shared by many versions is
+        downloaded once; ``blob_manifest.json`` records which versions
+        reference each blob. Downloads are verified against GitLab's
+        checksums and size before they are kept.
+        """
         try:
             packages_dir = output_dir / "packages"
+            blobs_dir = packages_dir / "blobs"
             
-            # List all packages
-            packages = await self.gitlab_client.list_packages(project_id)
-            
-            if not packages:
-                # Save empty list
-                with open(packages_dir / "packages.json", 'w') as f:
-                    json.dump([], f, indent=2)
-                return {"success": True, "count": 0}
-            
-            # Process each package
-            enhanced_packages = []
             # Package types recognized by GitLab (we can download them)
             recognized_types = {"npm", "maven", "nuget", "pypi", "composer", "conan", "generic", "golang"}
             # Package types that can be automatically migrated to GitHub Packages
@@ -1095,7 +1954,75 @@ class ExportAgent(BaseAgent):
             total_size = 0
             downloaded_count = 0
             
-            for package in packages:
+            # Inventory is tallied as packages stream past
+            inventory = {
+                "total_packages": 0,
+                "downloaded_files": 0,
+                "total_size_bytes": 0,
+                "unique_blobs": 0,
+                "stored_size_bytes": 0,
+                "by_type": {},
+                "migrable_count": 0,
+                "non_migrable_count": 0
+            }
+            
+            slots = asyncio.Semaphore(max(1, self.package_concurrency))
+            # SHA-256 -> download of its blob, shared by every file with that digest
+            blob_downloads: Dict[str, "asyncio.Task"] = {}
+            blob_manifest: Dict[str, Dict[str, Any]] = {}
+            
+            async def download_blob(package_id: int, pkg_file: Dict[str, Any], sha256: str) -> Optional[Path]:
+                blob = object_path(blobs_dir, sha256)
+                # Only moved into place once verified, e.g. by an interrupted run
+                if blob.exists():
+                    return blob
+                async with slots:
+                    success = await self.gitlab_client.download_package_file(
+                        project_id, package_id, pkg_file.get("id"), blob,
+                        expected_sha256=sha256,
+                        expected_size=pkg_file.get("size")
+                    )
+                return blob if success else None
+            
+            async def export_file(package: Dict[str, Any], pkg_file: Dict[str, Any], package_subdir: Path):
+                file_id = pkg_file.get("id")
+                file_name = pkg_file.get("file_name", f"file_{file_id}")
+                output_path = package_subdir / file_name
+                sha256 = (pkg_file.get("file_sha256") or "").lower()
+                if not re.fullmatch(r"[0-9a-f]{64}", sha256):
+                    sha256 = None
+                
+                if sha256:
+                    if sha256 not in blob_downloads:
+                        blob_downloads[sha256] = asyncio.create_task(
+                            download_blob(package["id"], pkg_file, sha256)
+                        )
+                    blob = await asyncio.shield(blob_downloads[sha256])
+                    if blob is not None:
+                        await asyncio.to_thread(fast_copy_file, blob, output_path)
+                    success = blob is not None
+                else:
+                    # Nothing to deduplicate on; verified by MD5 and size where known
+                    async with slots:
+                        success = await self.gitlab_client.download_package_file(
+                            project_id, package["id"], file_id, output_path,
+                            expected_md5=pkg_file.get("file_md5"),
+                            expected_size=pkg_file.get("size")
+                        )
+                
+                if not success:
+                    self.logger.warning(f"  Failed to download: {file_name}")
+                    return None
+                self.logger.info(f"  Downloaded: {file_name} ({pkg_file.get('size', 0)} bytes)")
+                return {
+                    "file_name": file_name,
+                    "size": pkg_file.get("size", 0),
+                    "sha256": sha256,
+                    "local_path": str(output_path.relative_to(output_dir)),
+                    "blob": str(object_path(blobs_dir, sha256).relative_to(output_dir)) if sha256 else None
+                }
+            
+            async def export_package(package: Dict[str, Any]) -> Dict[str, Any]:
                 package_id = package.get("id")
                 package_name = package.get("name", "unknown")
                 package_type = package.get("package_type", "unknown")
@@ -1103,6 +2030,17 @@ class ExportAgent(BaseAgent):
                 
                 self.logger.info(f"Processing package: {package_name}@{package_version} (type: {package_type})")
                 
+                enhanced_package = {
+                    "id": package_id,
+                    "name": package_name,
+                    "version": package_version,
+                    "package_type": package_type,
+                    "migrable": package_type in migrable_types,
+                    "files": [],
+                    "created_at": package.get("created_at"),
+                    "original_metadata": package
+                }
+                
                 # Get detailed package info including files
                 try:
                     package_details = await self.gitlab_client.get_package_details(project_id, package_id)
@@ -1112,92 +2050,87 @@ class ExportAgent(BaseAgent):
                     package_subdir = packages_dir / f"{package_type}" / package_name / package_version
                     package_subdir.mkdir(parents=True, exist_ok=True)
                     
-                    # Download each file
-                    downloaded_files = []
-                    for pkg_file in package_files:
-                        file_id = pkg_file.get("id")
-                        file_name = pkg_file.get("file_name", f"file_{file_id}")
-                        file_size = pkg_file.get("size", 0)
-                        
-                        # Download file
-                        output_path = package_subdir / file_name
-                        success = await self.gitlab_client.download_package_file(
-                            project_id, package_id, file_id, output_path
-                        )
-                        
-                        if success:
-                            downloaded_files.append({
-                                "file_name": file_name,
-                                "size": file_size,
-                                "local_path": str(output_path.relative_to(output_dir))
-                            })
-                            total_size += file_size
-                            downloaded_count += 1
-                            self.logger.info(f"  Downloaded: {file_name} ({file_size} bytes)")
-                    
-                    # Add enhanced package info
-                    enhanced_packages.append({
-                        "id": package_id,
-                        "name": package_name,
-                        "version": package_version,
-                        "package_type": package_type,
-                        "migrable": package_type in migrable_types,
-                        "files": downloaded_files,
-                        "created_at": package.get("created_at"),
-                        "original_metadata": package
-                    })
-                    
+                    files = await asyncio.gather(
+                        *(export_file(package, pkg_file, package_subdir) for pkg_file in package_files)
+                    )
+                    enhanced_package["files"] = [f for f in files if f is not None]
+                
                 except Exception as e:
                     self.logger.warning(f"Failed to process package {package_name}: {e}")
                     # Still add metadata even if download failed
-                    enhanced_packages.append({
-                        "id": package_id,
-                        "name": package_name,
-                        "version": package_version,
-                        "package_type": package_type,
-                        "migrable": package_type in migrable_types,
-                        "files": [],
-                        "download_error": str(e),
-                        "created_at": package.get("created_at"),
-                        "original_metadata": package
-                    })
-            
-            # Save enhanced package metadata
-            with open(packages_dir / "packages.json", 'w') as f:
-                json.dump(enhanced_packages, f, indent=2)
+                    enhanced_package["download_error"] = str(e)
+                
+                return enhanced_package
             
-            # Generate inventory report
-            inventory = {
-                "total_packages": len(enhanced_packages),
-                "downloaded_files": downloaded_count,
-                "total_size_bytes": total_size,
-                "by_type": {},
-                "migrable_count": sum(1 for p in enhanced_packages if p.get("migrable")),
-                "non_migrable_count": sum(1 for p in enhanced_packages if not p.get("migrable"))
-            }
+            # Packages are processed concurrently but written in listing order
+            try:
+                with JsonArrayWriter(packages_dir / "packages.json") as writer:
+                    async for enhanced_package in ordered_map(
+                        self.gitlab_client.iter_packages(project_id),
+                        export_package,
+                        workers=self.package_concurrency
+                    ):
+                        writer.write(enhanced_package)
+                        
+                        package_type = enhanced_package["package_type"]
+                        for file_info in enhanced_package["files"]:
+                            total_size += file_info["size"] or 0
+                            downloaded_count += 1
+                            if file_info["sha256"]:
+                                entry = blob_manifest.setdefault(file_info["sha256"], {
+                                    "path": file_info["blob"],
+                                    "size": file_info["size"],
+                                    "references": []
+                                })
+                                entry["references"].append({
+                                    "package_id": enhanced_package["id"],
+                                    "name": enhanced_package["name"],
+                                    "version": enhanced_package["version"],
+                                    "package_type": package_type,
+                                    "file_name": file_info["file_name"]
+                                })
+                        
+                        # Count by type
+                        inventory["total_packages"] += 1
+                        if enhanced_package["migrable"]:
+                            inventory["migrable_count"] += 1
+                        else:
+                            inventory["non_migrable_count"] += 1
+                        if package_type not in inventory["by_type"]:
+                            inventory["by_type"][package_type] = {"count": 0, "migrable": package_type in migrable_types}
+                        inventory["by_type"][package_type]["count"] += 1
+            finally:
+                for task in blob_downloads.values():
+                    task.cancel()
+            
+            if inventory["total_packages"] == 0:
+                return {"success": True, "count": 0}
             
-            # Count by type
-            for package in enhanced_packages:
-                pkg_type = package.get("package_type", "unknown")
-                if pkg_type not in inventory["by_type"]:
-                    inventory["by_type"][pkg_type] = {"count": 0, "migrable": pkg_type in migrable_types}
-                inventory["by_type"][pkg_type]["count"] += 1
+            # Generate inventory report
+            inventory["downloaded_files"] = downloaded_count
+            inventory["total_size_bytes"] = total_size
+            inventory["unique_blobs"] = len(blob_manifest)
+            inventory["stored_size_bytes"] = sum(blob["size"] or 0 for blob in blob_manifest.values())
             
             with open(packages_dir / "inventory.json", 'w') as f:
                 json.dump(inventory, f, indent=2)
             
+            with open(packages_dir / "blob_manifest.json", 'w') as f:
+                json.dump({"blobs": blob_manifest}, f, indent=2)
+            
             self.logger.info(
-                f"Package export complete: {len(enhanced_packages)} packages, "
-                f"{downloaded_count} files, {total_size / (1024*1024):.2f} MB"
+                f"Package export complete: {inventory['total_packages']} packages, "
+                f"{downloaded_count} files ({len(blob_manifest)} unique blobs), {total_size / (1024*1024):.2f} MB"
             )
             
             return {
                 "success": True,
-                "count": len(enhanced_packages),
+                "count": inventory["total_packages"],
                 "downloaded_files": downloaded_count,
+                "unique_blobs": len(blob_manifest),
                 "total_size": total_size
             }
-            
+        
         except Exception as e:
             # Packages might not be available in all GitLab editions
             self.logger.warning(f"Package export failed: {e}")
@@ -18,16 +18,28 @@ class ExportCheckpoint:
     - Last processed item per component
     - Error history
     - Progress metrics
+    
+    Progress updates are appended as one-line records to a journal next to
+    the checkpoint file instead of rewriting it, so their cost doesn't grow
+    with the export. Loading replays the journal over the checkpoint; a torn
+    last line is ignored. Structural changes (component start/completion,
+    metadata) and every ``compact_every`` journal records compact the
+    journal into an atomically rewritten checkpoint file.
     """
     
-    def __init__(self, checkpoint_file: Path):
+    def __init__(self, checkpoint_file: Path, compact_every: int = 1000):
         """
         Initialize checkpoint manager.
         
         Args:
             checkpoint_file: Path to checkpoint file
+            compact_every: Journal records after which the checkpoint is compacted
         """
         self.checkpoint_file = checkpoint_file
+        self.journal_file = self.journal_path(checkpoint_file)
+        self.compact_every = max(1, compact_every)
+        self._journal_records = 0
+        self._journal_torn = False
         self.checkpoint_data = {
             "version": "1.0",
             "started_at": datetime.utcnow().isoformat(),
@@ -38,8 +50,13 @@ class ExportCheckpoint:
         }
         self._load()
     
+    @staticmethod
+    def journal_path(checkpoint_file: Path) -> Path:
+        """Journal of progress records belonging to a checkpoint file"""
+        return checkpoint_file.with_suffix('.journal')
+    
     def _load(self):
-        """Load checkpoint from file if it exists"""
+        """Load checkpoint from file if it exists, then replay its journal"""
         if self.checkpoint_file.exists():
             try:
                 with open(self.checkpoint_file, 'r') as f:
@@ -47,9 +64,52 @@ class ExportCheckpoint:
                 logger.info(f"Loaded checkpoint from {self.checkpoint_file}")
             except Exception as e:
                 logger.warning(f"Failed to load checkpoint: {e}, starting fresh")
+        
+        if self.journal_file.exists():
+            try:
+                with open(self.journal_file, 'r') as f:
+                    for line in f:
+                        self._journal_torn = not line.endswith('\n')
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue  # Torn write of an interrupted run
+                        self._apply(record)
+                        self._journal_records += 1
+            except Exception as e:
+                logger.warning(f"Failed to replay checkpoint journal: {e}")
+    
+    def _apply(self, record: Dict[str, Any]):
+        """Apply one journal record (records only set values, so replaying twice is harmless)"""
+        comp_data = self.checkpoint_data["components"].get(record["component"])
+        if comp_data is None:
+            return
+        comp_data["processed_items"] = record["processed_items"]
+        if record.get("total_items") is not None:
+            comp_data["total_items"] = record["total_items"]
+        if record.get("last_item") is not None:
+            comp_data["last_item"] = record["last_item"]
+        self.checkpoint_data["updated_at"] = record["at"]
+    
+    def _append(self, record: Dict[str, Any]):
+        """Append a record to the journal, compacting it once it is long enough"""
+        try:
+            line = json.dumps(record, separators=(',', ':')) + '\n'
+            with open(self.journal_file, 'a') as f:
+                # Terminate a torn record left by an interrupted run
+                f.write('\n' + line if self._journal_torn else line)
+            self._journal_torn = False
+            self._journal_records += 1
+        except Exception as e:
+            logger.error(f"Failed to append to checkpoint journal: {e}")
+            self._save()
+            return
+        
+        if self._journal_records >= self.compact_every:
+            self._save()
     
     def _save(self):
-        """Save checkpoint to file"""
+        """Save checkpoint to file, compacting the journal into it"""
         try:
             self.checkpoint_data["updated_at"] = datetime.utcnow().isoformat()
             self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
@@ -61,6 +121,12 @@ class ExportCheckpoint:
             
             temp_file.replace(self.checkpoint_file)
             
+            # The checkpoint now includes every journal record; a crash
+            # before this point only replays them again
+            self.journal_file.unlink(missing_ok=True)
+            self._journal_records = 0
+            self._journal_torn = False
+            
         except Exception as e:
             logger.error(f"Failed to save checkpoint: {e}")
     
@@ -106,14 +172,15 @@ class ExportCheckpoint:
             last_item: Last processed item identifier
         """
         if component in self.checkpoint_data["components"]:
-            comp_data = self.checkpoint_data["components"][component]
-            comp_data["processed_items"] = processed_items
-            if total_items is not None:
-                comp_data["total_items"] = total_items
-            if last_item is not None:
-                comp_data["last_item"] = last_item
-            
-            self._save()
+            record = {
+                "component": component,
+                "processed_items": processed_items,
+                "total_items": total_items,
+                "last_item": last_item,
+                "at": datetime.utcnow().isoformat()
+            }
+            self._apply(record)
+            self._append(record)
     
     def mark_component_completed(self, component: str, success: bool = True, error: Optional[str] = None):
         """
@@ -196,6 +263,9 @@ class ExportCheckpoint:
         try:
             if self.checkpoint_file.exists():
                 self.checkpoint_file.unlink()
+            self.journal_file.unlink(missing_ok=True)
+            self._journal_records = 0
+            self._journal_torn = False
             self.checkpoint_data = {
                 "version": "1.0",
                 "started_at": datetime.utcnow().isoformat(),
@@ -12,6 +12,7 @@ from app.agents.transform_agent import TransformAgent
 from app.agents.plan_agent import PlanAgent
 from app.agents.apply_agent import ApplyAgent
 from app.agents.verify_agent import VerifyAgent
+from app.clients.request_memo import DEFAULT_MEMO_TTL, RequestMemo
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -61,6 +62,7 @@ class AgentOrchestrator:
             "verify": VerifyAgent()
         }
         self.shared_context = {}
+        self.request_memo = RequestMemo()
     
     async def run_migration(
         self,
@@ -91,6 +93,9 @@ class AgentOrchestrator:
             "agents": {}
         }
         
+        # GitLab reads are shared by every agent of this run
+        self.request_memo = RequestMemo(ttl=config.get("request_memo_ttl", DEFAULT_MEMO_TTL))
+        
         try:
             # Determine which agents to run based on mode
             agents_to_run = self._get_agent_sequence(mode, resume_from)
@@ -218,7 +223,8 @@ class AgentOrchestrator:
                 "scope_path": config.get("scope_path"),   # Full path
                 # Legacy support
                 "root_group": config.get("root_group") or (config.get("scope_path") if config.get("scope_type") == "group" else None),
-                "output_dir": config.get("output_dir", f"artifacts/runs/{config.get('run_id')}/discovery")
+                "output_dir": config.get("output_dir", f"artifacts/runs/{config.get('run_id')}/discovery"),
+                "gitlab_request_memo": self.request_memo
             })
         
         elif agent_name == "export":
@@ -227,7 +233,8 @@ class AgentOrchestrator:
             
             # Prepare base inputs with output_dir
             export_inputs = {
-                "output_dir": config.get("output_dir", f"artifacts/runs/{config.get('run_id')}/export")
+                "output_dir": config.get("output_dir", f"artifacts/runs/{config.get('run_id')}/export"),
+                "gitlab_request_memo": self.request_memo
             }
             
             if discovered:
@@ -0,0 +1,296 @@
+"""Read GitLab project export archives (NDJSON format) in the REST shapes the export uses"""
+
+import json
+import tarfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+class ProjectArchiveError(Exception):
+    """Raised when a project export can't be produced or read"""
+    pass
+
+
+class ProjectArchive:
+    """
+    Extracted project export archive.
+    
+    The archive holds the repository and wiki as git bundles, LFS objects,
+    uploads and one NDJSON file per relation under ``tree/project``.
+    Relations are read line by line, so large projects are converted
+    without loading them into memory. Users are only referenced by ID in
+    the archive; they are resolved through ``project_members.ndjson``.
+    """
+    
+    def __init__(self, root: Path):
+        """
+        Initialize archive reader.
+        
+        Args:
+            root: Directory the archive was extracted into
+        """
+        self.root = Path(root)
+        self.tree = self.root / "tree" / "project"
+        self._users: Optional[Dict[int, Dict[str, Any]]] = None
+    
+    @classmethod
+    def extract(cls, archive_path: Path, destination: Path) -> "ProjectArchive":
+        """
+        Extract an export tarball, refusing entries that would land outside ``destination``.
+        
+        Links and special files are skipped; a complete extraction is marked
+        so it is reused instead of extracted again.
+        
+        Args:
+            archive_path: ``.tar.gz`` downloaded from GitLab
+            destination: Extraction directory
+        
+        Returns:
+            Reader for the extracted archive
+        
+        Raises:
+            ProjectArchiveError: If the tarball is unreadable or unsafe
+        """
+        destination = Path(destination)
+        marker = destination / ".extracted"
+        if marker.exists():
+            return cls(destination)
+        
+        destination.mkdir(parents=True, exist_ok=True)
+        root = destination.resolve()
+        try:
+            with tarfile.open(archive_path, 'r:*') as tar:
+                members = []
+                for member in tar:
+                    if not (member.isfile() or member.isdir()):
+                        continue
+                    target = (root / member.name).resolve()
+                    if target != root and root not in target.parents:
+                        raise ProjectArchiveError(f"Unsafe path in project export: {member.name}")
+                    members.append(member)
+                tar.extractall(root, members=members)
+        except (tarfile.TarError, OSError) as e:
+            raise ProjectArchiveError(f"Failed to extract project export: {e}")
+        
+        marker.touch()
+        return cls(destination)
+    
+    @property
+    def repository_bundle(self) -> Path:
+        """Repository git bundle"""
+        return self.root / "project.bundle"
+    
+    @property
+    def wiki_bundle(self) -> Path:
+        """Wiki git bundle (absent for empty wikis)"""
+        return self.root / "project.wiki.bundle"
+    
+    @property
+    def lfs_objects_dir(self) -> Path:
+        """LFS objects, stored flat by OID"""
+        return self.root / "lfs-objects"
+    
+    def upload_path(self, attachment_path: str) -> Optional[Path]:
+        """Archived file of an ``/uploads/<secret>/<name>`` reference, if present"""
+        relative = attachment_path.strip('/')
+        if '..' in relative.split('/'):
+            return None
+        path = self.root / relative
+        return path if path.is_file() else None
+    
+    def iter_relation(self, name: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate the records of a relation file.
+        
+        Args:
+            name: Relation name, e.g. ``issues``
+        
+        Yields:
+            One record per line (nothing if the relation wasn't exported)
+        """
+        path = self.tree / f"{name}.ndjson"
+        if not path.exists():
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    
+    def users(self) -> Dict[int, Dict[str, Any]]:
+        """Project members by user ID, in the REST user shape"""
+        if self._users is None:
+            # Built aside: issues and MRs are converted in concurrent threads
+            users = {}
+            for member in self.iter_relation("project_members"):
+                user = member.get("user") or {}
+                user_id = member.get("user_id") or user.get("id")
+                if user_id is not None:
+                    users[user_id] = {
+                        "id": user_id,
+                        "username": user.get("username"),
+                        "name": user.get("name"),
+                        "public_email": user.get("public_email"),
+                    }
+            self._users = users
+        return self._users
+    
+    def lfs_objects(self) -> List[Dict[str, Any]]:
+        """LFS objects in the archive as ``{"oid", "size"}`` dicts"""
+        if not self.lfs_objects_dir.is_dir():
+            return []
+        return [
+            {"oid": path.name, "size": path.stat().st_size}
+            for path in sorted(self.lfs_objects_dir.iterdir())
+            if path.is_file() and len(path.name) == 64
+        ]
+    
+    def iter_issues(self, project_id: int, web_url: str = "") -> Iterator[Dict[str, Any]]:
+        """
+        Iterate issues in the REST ``get_issue`` shape with a ``notes`` list.
+        
+        Args:
+            project_id: Project ID of the exported project
+            web_url: Project web URL (for ``web_url`` fields)
+        
+        Yields:
+            Issues with notes newest first, as REST lists them
+        """
+        for record in self.iter_relation("issues"):
+            issue = self._common_fields(record, project_id)
+            issue.update({
+                "confidential": record.get("confidential"),
+                "discussion_locked": record.get("discussion_locked"),
+                "due_date": record.get("due_date"),
+                "web_url": f"{web_url}/-/issues/{record['iid']}" if web_url else None,
+            })
+            notes = sorted(record.get("notes") or [], key=lambda n: n.get("created_at") or "", reverse=True)
+            issue["notes"] = [self._to_rest_note(note, project_id, "Issue", issue) for note in notes]
+            yield issue
+    
+    def iter_merge_requests(self, project_id: int, web_url: str = "") -> Iterator[Dict[str, Any]]:
+        """
+        Iterate merge requests in the REST ``get_merge_request`` shape.
+        
+        Notes are grouped into ``discussions`` by their discussion ID, and
+        ``approvals`` has the ``approved``/``approved_by`` fields.
+        
+        Args:
+            project_id: Project ID of the exported project
+            web_url: Project web URL (for ``web_url`` fields)
+        
+        Yields:
+            Merge requests with ``discussions`` and ``approvals``
+        """
+        for record in self.iter_relation("merge_requests"):
+            mr = self._common_fields(record, project_id)
+            metrics = record.get("metrics") or {}
+            diff = record.get("merge_request_diff") or {}
+            merge_user = self._user(metrics.get("merged_by_id"))
+            title = record.get("title") or ""
+            draft = title.lower().startswith(("draft:", "[draft]", "(draft)", "wip:", "[wip]"))
+            mr.update({
+                "merged_at": metrics.get("merged_at"),
+                "source_branch": record.get("source_branch"),
+                "target_branch": record.get("target_branch"),
+                "source_project_id": record.get("source_project_id"),
+                "target_project_id": record.get("target_project_id"),
+                "draft": draft,
+                "work_in_progress": draft,
+                "sha": diff.get("head_commit_sha"),
+                "merge_commit_sha": record.get("merge_commit_sha"),
+                "squash_commit_sha": record.get("squash_commit_sha"),
+                "squash": record.get("squash"),
+                "merge_user": merge_user,
+                "merged_by": merge_user,
+                "reviewers": [self._user(r.get("user_id")) for r in record.get("merge_request_reviewers") or []],
+                "web_url": f"{web_url}/-/merge_requests/{record['iid']}" if web_url else None,
+            })
+            
+            discussions: Dict[str, Dict[str, Any]] = {}
+            for note in sorted(record.get("notes") or [], key=lambda n: n.get("created_at") or ""):
+                key = note.get("discussion_id") or f"note-{note.get('id')}"
+                discussion = discussions.setdefault(key, {"id": key, "individual_note": True, "notes": []})
+                discussion["notes"].append(self._to_rest_note(note, project_id, "MergeRequest", mr))
+            for discussion in discussions.values():
+                notes = discussion["notes"]
+                discussion["individual_note"] = len(notes) == 1 and notes[0]["type"] is None
+            mr["discussions"] = list(discussions.values())
+            
+            approvals = record.get("approvals") or []
+            mr["approvals"] = {
+                "id": mr["id"],
+                "iid": mr["iid"],
+                "project_id": project_id,
+                "approved": bool(approvals),
+                "approved_by": [{"user": self._user(a.get("user_id"))} for a in approvals],
+            }
+            yield mr
+    
+    def _user(self, user_id: Optional[int], name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """REST user for an ID; users who left the project only have what the record carries"""
+        if user_id is None:
+            return None
+        return self.users().get(user_id) or {"id": user_id, "username": None, "name": name}
+    
+    def _common_fields(self, record: Dict[str, Any], project_id: int) -> Dict[str, Any]:
+        """Fields issues and merge requests share"""
+        assignee_links = record.get("issue_assignees") or record.get("merge_request_assignees") or []
+        assignees = [self._user(a.get("user_id")) for a in assignee_links]
+        milestone = record.get("milestone")
+        return {
+            "id": record.get("id"),
+            "iid": record["iid"],
+            "project_id": project_id,
+            "title": record.get("title"),
+            "description": record.get("description"),
+            "state": record.get("state"),
+            "created_at": record.get("created_at"),
+            "updated_at": record.get("updated_at"),
+            "closed_at": record.get("closed_at"),
+            "labels": [
+                link["label"]["title"]
+                for link in record.get("label_links") or []
+                if (link.get("label") or {}).get("title")
+            ],
+            "milestone": {
+                "id": milestone.get("id"),
+                "iid": milestone.get("iid"),
+                "project_id": project_id,
+                "title": milestone.get("title"),
+                "description": milestone.get("description"),
+                "state": milestone.get("state"),
+                "due_date": milestone.get("due_date"),
+                "start_date": milestone.get("start_date"),
+            } if milestone else None,
+            "author": self._user(record.get("author_id")),
+            "assignees": assignees,
+            "assignee": assignees[0] if assignees else None,
+        }
+    
+    def _to_rest_note(
+        self,
+        note: Dict[str, Any],
+        project_id: int,
+        noteable_type: str,
+        noteable: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Convert an archived note to the REST note shape"""
+        rest_note = {
+            "id": note.get("id"),
+            "type": note.get("type"),
+            "body": note.get("note"),
+            "author": self._user(note.get("author_id"), (note.get("author") or {}).get("name")),
+            "created_at": note.get("created_at"),
+            "updated_at": note.get("updated_at"),
+            "system": note.get("system"),
+            "noteable_id": noteable["id"],
+            "noteable_type": noteable_type,
+            "noteable_iid": noteable["iid"],
+            "project_id": project_id,
+            "confidential": note.get("confidential"),
+            "internal": note.get("internal", note.get("confidential")),
+        }
+        if note.get("resolved_at") or note.get("resolved_by_id"):
+            rest_note["resolved"] = True
+        if note.get("position"):
+            rest_note["position"] = note["position"]
+        return rest_note
@@ -10,6 +10,7 @@ import logging
 import asyncio
 from sse_starlette.sse import EventSourceResponse
 
+from app.agents.export_checkpoint import ExportCheckpoint
 from app.models import User
 from app.services import RunService, ArtifactService, ProjectService
 from app.services.connection_service import ConnectionService
@@ -445,9 +446,8 @@ async def get_checkpoint(
         }
     
     try:
-        # Read checkpoint data
-        with open(checkpoint_file, 'r') as f:
-            checkpoint_data = json.load(f)
+        # Read checkpoint data, including progress still in its journal
+        checkpoint_data = ExportCheckpoint(checkpoint_file).checkpoint_data
         
         # Determine if resumable and from where
         components = checkpoint_data.get("components", {})
@@ -563,8 +563,9 @@ async def clear_checkpoint(
         return {"message": "No checkpoint to clear"}
     
     try:
-        # Delete checkpoint file
+        # Delete checkpoint file and its progress journal
         checkpoint_file.unlink()
+        ExportCheckpoint.journal_path(checkpoint_file).unlink(missing_ok=True)
         logger.info(f"Cleared checkpoint for run {run_id}")
         return {"message": "Checkpoint cleared successfully"}
         
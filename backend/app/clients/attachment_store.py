@@ -0,0 +1,160 @@
+"""Content-addressed store for GitLab upload attachments"""
+
+import asyncio
+import hashlib
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+from app.clients.request_memo import RequestMemo
+from app.utils.fast_copy import fast_copy_file
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def default_store_root(base_url: str) -> Path:
+    """Default store shared across runs: ``<ARTIFACTS_ROOT>/cache/attachments/<instance>``"""
+    from app.config import settings
+    instance = hashlib.sha256(base_url.rstrip('/').encode()).hexdigest()[:16]
+    return Path(settings.ARTIFACTS_ROOT) / "cache" / "attachments" / instance
+
+
+class AttachmentStore:
+    """
+    Deduplicating download store for ``/uploads/<secret>/<filename>`` files.
+
+    Files are kept once under ``blobs/<sha256>`` and indexed by their upload
+    key (secret and filename) in an append-only ``index.ndjson``, so an
+    upload referenced from many issues, merge requests and comments is
+    downloaded once per store, and a store shared across runs never fetches
+    it again. Uploads with different keys but identical content share one
+    blob. Exports get their copy with ``materialize`` (a reflink or hardlink
+    where the filesystem allows it).
+
+    Downloads run in a pool of ``concurrency`` shared by every caller, and
+    concurrent requests for the same key share one download. A HEAD request
+    rejects files above ``max_size`` before any body is transferred.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        client: Any,
+        concurrency: int = 4,
+        max_size: Optional[int] = None
+    ):
+        """
+        Initialize attachment store.
+
+        Args:
+            root: Store directory
+            client: GitLabClient used for ``download_file``/``get_content_length``
+            concurrency: Downloads running at once
+            max_size: Largest file accepted, in bytes (None = no limit)
+        """
+        self.root = Path(root)
+        self.client = client
+        self.max_size = max_size
+        self.blobs_dir = self.root / "blobs"
+        self.tmp_dir = self.root / "tmp"
+        self.index_file = self.root / "index.ndjson"
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._inflight = RequestMemo(ttl=0)
+        self._index: Dict[str, str] = {}
+        self.stats = {"downloaded": 0, "reused": 0, "too_large": 0, "failed": 0}
+        self._load_index()
+
+    def _load_index(self):
+        """Read upload key -> digest entries whose blob still exists"""
+        if not self.index_file.exists():
+            return
+        with open(self.index_file, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if self._blob_path(entry["sha256"]).exists():
+                    self._index[entry["key"]] = entry["sha256"]
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blobs_dir / digest[:2] / digest
+
+    async def fetch(self, url: str, key: str) -> Optional[Path]:
+        """
+        Return the stored blob for an upload, downloading it if needed.
+
+        Args:
+            url: Download URL
+            key: Upload key, e.g. ``uploads/<secret>/<filename>``
+
+        Returns:
+            Path of the blob, or None if the file is too large or failed
+        """
+        digest = self._index.get(key)
+        if digest:
+            self.stats["reused"] += 1
+            return self._blob_path(digest)
+        return await self._inflight.get_or_fetch(key, lambda: self._download(url, key))
+
+    async def _download(self, url: str, key: str) -> Optional[Path]:
+        """Download one upload into the store"""
+        async with self._semaphore:
+            if self.max_size is not None:
+                size = await self.client.get_content_length(url)
+                if isinstance(size, int) and size > self.max_size:
+                    logger.warning(f"Skipping {key}: {size / 1024 / 1024:.1f} MB exceeds size limit")
+                    self.stats["too_large"] += 1
+                    return None
+
+            self.tmp_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = self.tmp_dir / uuid.uuid4().hex
+            try:
+                if not await self.client.download_file(url, temp_path):
+                    self.stats["failed"] += 1
+                    return None
+                return await asyncio.to_thread(self._add_blob, temp_path, key)
+            finally:
+                temp_path.unlink(missing_ok=True)
+
+    def _add_blob(self, temp_path: Path, key: str) -> Optional[Path]:
+        """Move a downloaded file into place under its digest and index it"""
+        size = temp_path.stat().st_size
+        if self.max_size is not None and size > self.max_size:
+            # Servers that don't report a length are only caught here
+            logger.warning(f"Discarding {key}: {size / 1024 / 1024:.1f} MB exceeds size limit")
+            self.stats["too_large"] += 1
+            return None
+
+        digest = hashlib.sha256()
+        with open(temp_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+
+        blob = self._blob_path(sha256)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.replace(blob)
+
+        with open(self.index_file, 'a') as f:
+            f.write(json.dumps({"key": key, "sha256": sha256, "size": size}) + '\n')
+        self._index[key] = sha256
+        self.stats["downloaded"] += 1
+        return blob
+
+    @staticmethod
+    def materialize(blob: Path, destination: Path) -> Path:
+        """
+        Place a blob at ``destination``, reflinking or hardlinking when possible.
+
+        Args:
+            blob: Path returned by ``fetch``
+            destination: Target file path
+
+        Returns:
+            ``destination``
+        """
+        fast_copy_file(blob, destination)
+        return destination
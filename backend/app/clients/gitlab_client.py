@@ -1,48 +1,121 @@
 """GitLab API client with rate limiting and comprehensive data extraction"""
 
 import asyncio
+import glob
+import hashlib
+import shutil
 import time
 import urllib.parse
+from collections import deque
 from typing import Any, Dict, List, Optional, AsyncIterator, Union
 from pathlib import Path
 import httpx
+from app.clients.http_cache import HttpCache
+from app.clients.request_memo import DEFAULT_MEMO_TTL, RequestMemo
 from app.utils.logging import get_logger
 from app.utils.errors import create_gitlab_error, MigrationError
 
 logger = get_logger(__name__)
 
+# Seconds a group hierarchy stays cached (per connection and starting group)
+HIERARCHY_CACHE_TTL = 60
+
+# Shared by all clients so trees survive the per-request clients of the API
+_hierarchy_memo = RequestMemo(ttl=HIERARCHY_CACHE_TTL, max_entries=256)
+
 
 class RateLimiter:
-    """Rate limiter with exponential backoff"""
+    """
+    Async token bucket rate limiter driven by GitLab ``RateLimit-*`` headers.
+    
+    The bucket starts out refilling at ``max_requests_per_minute``. Every
+    response then re-derives the refill rate from ``RateLimit-Remaining`` and
+    ``RateLimit-Reset``, so the real budget is used without over-throttling.
+    An internal lock makes it safe to share between coroutines running under
+    ``asyncio.gather``: callers reserve tokens one at a time instead of all
+    passing the check together, then sleep until their turn outside the lock.
+    """
     
-    def __init__(self, max_requests_per_minute: int = 300):
+    def __init__(self, max_requests_per_minute: int = 300, burst: Optional[int] = None):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            max_requests_per_minute: Refill rate used until the server reports its own budget
+            burst: Bucket capacity (default: a tenth of a minute's budget)
+        """
         self.max_requests_per_minute = max_requests_per_minute
         self.min_interval = 60.0 / max_requests_per_minute
-        self.last_request_time = 0
+        self.default_rate = max_requests_per_minute / 60.0
+        self.refill_rate = self.default_rate
+        self.capacity = float(burst or max(1, max_requests_per_minute // 10))
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
         self.retry_after = 0
-        
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        """Add tokens accrued since the last refill (none while paused)"""
+        now = time.monotonic()
+        if now > self.last_refill:
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+    
+    def _pause_until(self, resume_at: float):
+        """Stop refilling until the Unix time ``resume_at``, then restart at the default rate"""
+        self._refill()
+        self.retry_after = max(self.retry_after, resume_at)
+        self.tokens = min(self.tokens, 0.0)
+        self.refill_rate = self.default_rate
+        self.last_refill = max(self.last_refill, time.monotonic() + (self.retry_after - time.time()))
+    
     async def wait_if_needed(self):
-        """Wait if necessary to respect rate limits"""
-        now = time.time()
+        """
+        Take a token, waiting until it is available.
         
-        # Wait if we got a retry-after response
-        if self.retry_after > now:
-            wait_time = self.retry_after - now
-            logger.warning(f"Rate limited, waiting {wait_time:.2f} seconds")
-            await asyncio.sleep(wait_time)
-            self.retry_after = 0
+        The token is reserved under the lock (the bucket may go negative) and
+        the resulting delay is slept outside it, so waiters sleep
+        concurrently, each until its own turn.
+        """
+        async with self._lock:
+            self._refill()
+            self.tokens -= 1
+            # While paused, refilling resumes at last_refill
+            paused = max(0.0, self.last_refill - time.monotonic())
+            delay = paused + max(0.0, -self.tokens) / self.refill_rate
         
-        # Normal rate limiting
-        time_since_last = now - self.last_request_time
-        if time_since_last < self.min_interval:
-            wait_time = self.min_interval - time_since_last
-            await asyncio.sleep(wait_time)
+        if paused:
+            logger.warning(f"Rate limited, waiting {delay:.2f} seconds")
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    def update_from_headers(self, headers: Any):
+        """
+        Re-derive the refill rate from GitLab rate limit response headers.
         
-        self.last_request_time = time.time()
+        Args:
+            headers: Response headers carrying ``RateLimit-Remaining`` and
+                ``RateLimit-Reset`` (Unix timestamp of the window reset)
+        """
+        try:
+            remaining = int(headers.get('RateLimit-Remaining'))
+            reset = float(headers.get('RateLimit-Reset'))
+        except (TypeError, ValueError):
+            return
+        
+        if remaining <= 0:
+            # Budget exhausted: hold everyone until the window resets
+            self._pause_until(reset)
+            return
+        
+        self._refill()
+        window = max(reset - time.time(), 1.0)
+        self.refill_rate = remaining / window
+        self.tokens = min(self.tokens, float(remaining))
     
     def set_retry_after(self, seconds: int):
         """Set retry-after delay from HTTP header"""
-        self.retry_after = time.time() + seconds
+        self._pause_until(time.time() + seconds)
 
 
 class GitLabClient:
@@ -51,7 +124,10 @@ class GitLabClient:
     
     Features:
     - Rate limiting with exponential backoff
-    - Automatic pagination
+    - Automatic pagination (with concurrent page fan-out)
+    - Optional on-disk ETag cache for GET requests
+    - Coalescing and run-scoped memoization of metadata and settings reads
+    - Resumable, checksum-verified file downloads
     - Comprehensive error handling
     - Progress callbacks
     """
@@ -61,7 +137,19 @@ class GitLabClient:
         base_url: str,
         token: str,
         max_requests_per_minute: int = 300,
-        timeout: int = 30
+        timeout: int = 30,
+        page_concurrency: int = 4,
+        keyset_threshold: int = 10000,
+        cache_dir: Optional[Union[str, Path]] = None,
+        cache_max_bytes: int = 256 * 1024 * 1024,
+        memo: Optional[RequestMemo] = None,
+        memo_ttl: float = DEFAULT_MEMO_TTL,
+        download_chunk_size: int = 1024 * 1024,
+        download_segments: int = 4,
+        segment_threshold: int = 64 * 1024 * 1024,
+        download_attempts: int = 5,
+        max_concurrent_requests: int = 16,
+        max_concurrent_downloads: int = 4
     ):
         """
         Initialize GitLab client.
@@ -71,12 +159,47 @@ class GitLabClient:
             token: Personal Access Token
             max_requests_per_minute: Rate limit (default: 300)
             timeout: Request timeout in seconds
+            page_concurrency: Pages fetched concurrently once the total page
+                count is known (1 = sequential)
+            keyset_threshold: Collection size above which the large listings
+                switch from offset to keyset pagination
+            cache_dir: Root of the persistent conditional-request cache
+                (None disables caching)
+            cache_max_bytes: Size bound of this connection's cache
+            memo: Request memo shared across clients of the same run
+                (None creates a private one)
+            memo_ttl: TTL in seconds of the private memo (0 = coalesce only)
+            download_chunk_size: Bytes read per chunk when downloading files
+            download_segments: Parallel ranges used for large downloads
+                (1 = always a single stream)
+            segment_threshold: File size from which downloads are segmented
+            download_attempts: Consecutive attempts without progress before a
+                download is abandoned (the ``.part`` file is kept)
+            max_concurrent_requests: API requests in flight at once across
+                all callers of this client
+            max_concurrent_downloads: File transfer streams (whole files or
+                segments) open at once; kept apart from the API requests so
+                long transfers can't starve listings
         """
         self.base_url = base_url.rstrip('/')
         self.api_url = f"{self.base_url}/api/v4"
         self.token = token
         self.timeout = timeout
+        self.page_concurrency = max(1, page_concurrency)
+        self.keyset_threshold = keyset_threshold
+        self.http_cache = (
+            HttpCache(Path(cache_dir), self.base_url, token, max_bytes=cache_max_bytes)
+            if cache_dir else None
+        )
+        self.memo = memo if memo is not None else RequestMemo(ttl=memo_ttl)
+        self._connection_id = hashlib.sha256(f"{self.base_url}\0{token}".encode()).hexdigest()[:16]
+        self.download_chunk_size = download_chunk_size
+        self.download_segments = max(1, download_segments)
+        self.segment_threshold = segment_threshold
+        self.download_attempts = max(1, download_attempts)
         self.rate_limiter = RateLimiter(max_requests_per_minute)
+        self.request_slots = asyncio.Semaphore(max(1, max_concurrent_requests))
+        self.download_slots = asyncio.Semaphore(max(1, max_concurrent_downloads))
         self.logger = get_logger(__name__)
         
         # Create HTTP client
@@ -126,17 +249,28 @@ class GitLabClient:
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         data: Optional[Dict[str, Any]] = None,
-        max_retries: int = 3
+        max_retries: int = 3,
+        memoize: bool = False
     ) -> httpx.Response:
         """
         Make HTTP request with rate limiting and retries.
         
+        With ``memoize``, identical GET requests (same method, URL and params)
+        are coalesced while in flight and served from the request memo until
+        its TTL expires. Only small idempotent reads opt in: project, group
+        and user metadata, and the per-project settings listings (variables,
+        environments, schedules, protections, hooks, deploy keys) and their
+        counts, which discovery and export both read. Issue, MR and note
+        listings never do, so the memo doesn't hold large bodies for a run.
+        
         Args:
             method: HTTP method
-            endpoint: API endpoint (without /api/v4 prefix)
+            endpoint: API endpoint (without /api/v4 prefix) or an absolute URL
+                (e.g. a pagination ``Link`` target)
             params: Query parameters
             data: Request body
             max_retries: Maximum retry attempts
+            memoize: Use the request memo for GETs
             
         Returns:
             HTTP response
@@ -144,21 +278,52 @@ class GitLabClient:
         Raises:
             httpx.HTTPError: On request failure after retries
         """
-        url = f"{self.api_url}/{endpoint.lstrip('/')}"
+        if endpoint.startswith(('http://', 'https://')):
+            url = endpoint
+        else:
+            url = f"{self.api_url}/{endpoint.lstrip('/')}"
+        
+        if memoize and method.upper() == 'GET' and data is None:
+            key = RequestMemo.make_key(self._connection_id, method, url, params)
+            return await self.memo.get_or_fetch(
+                key, lambda: self._send_request(method, url, params, data, max_retries)
+            )
+        return await self._send_request(method, url, params, data, max_retries)
+    
+    async def _send_request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]],
+        max_retries: int
+    ) -> httpx.Response:
+        """Send a request to an absolute URL, handling rate limits, 304s and retries"""
         retry_count = 0
         
+        # Conditional GET against the persistent cache
+        cache_key = None
+        cache_entry = None
+        if self.http_cache and method.upper() == 'GET' and data is None:
+            cache_key = HttpCache.make_key(method, url, params)
+            cache_entry = await asyncio.to_thread(self.http_cache.get, cache_key)
+        conditional_headers = self.http_cache.conditional_headers(cache_entry) if cache_entry else None
+        
         while retry_count <= max_retries:
             try:
                 # Rate limiting
                 await self.rate_limiter.wait_if_needed()
                 
                 # Make request
-                response = await self.client.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=data
-                )
+                async with self.request_slots:
+                    response = await self.client.request(
+                        method=method,
+                        url=url,
+                        params=params,
+                        json=data,
+                        headers=conditional_headers
+                    )
+                self.rate_limiter.update_from_headers(response.headers)
                 
                 # Handle rate limiting
                 if response.status_code == 429:
@@ -169,8 +334,14 @@ class GitLabClient:
                         self.logger.warning(f"Rate limited (429), retry {retry_count}/{max_retries}")
                         continue
                 
+                # Unchanged since last time: serve the cached body
+                if response.status_code == 304 and cache_entry is not None:
+                    return self.http_cache.build_response(cache_entry, response.request)
+                
                 # Check for success
                 response.raise_for_status()
+                if cache_key:
+                    await asyncio.to_thread(self.http_cache.store, cache_key, response)
                 return response
                 
             except httpx.HTTPStatusError as e:
@@ -210,7 +381,7 @@ class GitLabClient:
                 raise
         
         # Max retries exceeded
-        error = Exception(f"Max retries exceeded for {method} {endpoint}")
+        error = Exception(f"Max retries exceeded for {method} {url}")
         migration_error = create_gitlab_error(error)
         self.logger.error(
             f"Max retries exceeded: {migration_error.message}",
@@ -223,50 +394,297 @@ class GitLabClient:
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         per_page: int = 100,
-        max_pages: Optional[int] = None
+        max_pages: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        memoize: bool = False
     ) -> AsyncIterator[Dict[str, Any]]:
         """
         Make paginated API request yielding individual items.
         
+        The first page is fetched on its own. When it reports ``x-total-pages``,
+        the remaining pages are fetched concurrently in a sliding window of
+        ``concurrency`` requests (all still going through the rate limiter) and
+        yielded in page order. Without that header (GitLab omits it for very
+        large collections) pages are followed sequentially via ``x-next-page``.
+        
         Args:
             endpoint: API endpoint
             params: Query parameters
             per_page: Items per page (max 100)
             max_pages: Maximum pages to fetch (None = all)
+            concurrency: Pages in flight at once (None = client default)
+            memoize: Keep pages in the request memo
             
         Yields:
             Individual items from all pages
+            
+        Raises:
+            httpx.HTTPError: If a page still fails after its retries
         """
-        params = params or {}
+        params = dict(params or {})
         params['per_page'] = min(per_page, 100)
-        page = 1
+        concurrency = max(1, concurrency or self.page_concurrency)
+        
+        response = await self._fetch_page(endpoint, params, 1, memoize=memoize)
+        if response is None:
+            return
+        items = response.json()
+        if not items:
+            return
+        for item in items:
+            yield item
         
+        total_pages = response.headers.get('x-total-pages')
+        if total_pages:
+            last_page = int(total_pages)
+            if max_pages:
+                last_page = min(last_page, max_pages)
+            if last_page <= 1:
+                return
+            
+            # Sliding window: keep up to `concurrency` pages in flight, but
+            # always hand out items strictly in page order.
+            pending = deque()
+            next_page = 2
+            try:
+                while pending or next_page <= last_page:
+                    while next_page <= last_page and len(pending) < concurrency:
+                        pending.append(asyncio.create_task(
+                            self._fetch_page(endpoint, params, next_page, memoize=memoize)
+                        ))
+                        next_page += 1
+                    
+                    response = await pending.popleft()
+                    if response is None:
+                        break
+                    for item in response.json():
+                        yield item
+            finally:
+                for task in pending:
+                    task.cancel()
+            return
+        
+        # Unknown page count: walk x-next-page one page at a time
+        page = 1
         while True:
+            next_page = response.headers.get('x-next-page')
+            if not next_page:
+                break
+            page = int(next_page)
             if max_pages and page > max_pages:
                 break
             
-            params['page'] = page
+            response = await self._fetch_page(endpoint, params, page, memoize=memoize)
+            if response is None:
+                break
+            items = response.json()
+            if not items:
+                break
+            for item in items:
+                yield item
+    
+    async def _fetch_page(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        page: Optional[int] = None,
+        memoize: bool = False
+    ) -> Optional[httpx.Response]:
+        """
+        Fetch a single page.
+        
+        Transient failures are retried (with backoff) by ``_request`` only;
+        this layer just ends the listing on a non-retryable client error.
+        
+        Args:
+            endpoint: API endpoint or absolute page URL
+            params: Query parameters (not mutated)
+            page: Page number to fetch (None for cursor/Link URLs)
+            memoize: Use the request memo
             
-            try:
-                response = await self._request('GET', endpoint, params=params)
-                items = response.json()
-                
-                if not items:
-                    break
-                
-                for item in items:
-                    yield item
-                
-                # Check if there are more pages
-                total_pages = response.headers.get('x-total-pages')
-                if total_pages and page >= int(total_pages):
-                    break
-                
-                page += 1
-                
-            except Exception as e:
-                self.logger.error(f"Error fetching page {page} of {endpoint}: {e}")
+        Returns:
+            HTTP response, or None if the endpoint rejected the request with a
+            non-retryable client error (e.g. 403 on a feature the token can't see)
+            
+        Raises:
+            httpx.HTTPError: If the page still fails after ``_request``'s retries
+        """
+        page_params = dict(params, page=page) if page is not None else params
+        
+        try:
+            return await self._request('GET', endpoint, params=page_params, memoize=memoize)
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            if status < 500 and status != 429:
+                self.logger.warning(
+                    f"Stopping pagination of {endpoint} at page {page or 1}: HTTP {status}"
+                )
+                return None
+            self.logger.error(f"Error fetching page {page} of {endpoint}: {e}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Error fetching page {page} of {endpoint}: {e}")
+            raise
+    
+    async def keyset_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        per_page: int = 100,
+        max_pages: Optional[int] = None,
+        order_by: str = 'id',
+        sort: str = 'asc',
+        memoize: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Make keyset-paginated API request yielding individual items.
+        
+        Follows the ``Link: <...>; rel="next"`` cursor instead of page numbers,
+        so every page costs the same regardless of depth and deep listings are
+        not subject to GitLab's offset pagination cap. If the endpoint rejects
+        keyset pagination for the requested ordering, falls back to offset
+        pagination.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            per_page: Items per page (max 100)
+            max_pages: Maximum pages to fetch (None = all)
+            order_by: Keyset ordering column
+            sort: Sort direction (asc or desc)
+            memoize: Keep pages in the request memo
+            
+        Yields:
+            Individual items from all pages
+        """
+        keyset_params = dict(params or {})
+        keyset_params.update({
+            'pagination': 'keyset',
+            'order_by': order_by,
+            'sort': sort,
+            'per_page': min(per_page, 100)
+        })
+        
+        response = await self._fetch_page(endpoint, keyset_params, memoize=memoize)
+        if response is None:
+            self.logger.info(f"Keyset pagination unavailable for {endpoint}, using offset pagination")
+            async for item in self.paginated_request(
+                endpoint, params=params, per_page=per_page, max_pages=max_pages, memoize=memoize
+            ):
+                yield item
+            return
+        
+        pages = 1
+        while True:
+            items = response.json()
+            if not items:
+                break
+            for item in items:
+                yield item
+            
+            next_url = response.links.get('next', {}).get('url')
+            if not next_url:
+                break
+            pages += 1
+            if max_pages and pages > max_pages:
                 break
+            
+            # The cursor URL already carries every query parameter
+            response = await self._fetch_page(next_url, None, memoize=memoize)
+            if response is None:
+                break
+    
+    async def _exceeds_keyset_threshold(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Check whether a collection is large enough to warrant keyset pagination.
+        
+        Sends a single ``per_page=1`` request and reads ``x-total``. GitLab
+        omits that header for collections too large to count cheaply, which is
+        itself treated as exceeding the threshold.
+        """
+        try:
+            response = await self._request(
+                'GET', endpoint, params=dict(params or {}, per_page=1, page=1)
+            )
+        except Exception as e:
+            self.logger.warning(f"Size probe failed for {endpoint}: {e}")
+            return False
+        
+        total = response.headers.get('x-total')
+        if total is None:
+            return True
+        return int(total) > self.keyset_threshold
+    
+    async def count_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        memoize: bool = False
+    ) -> int:
+        """
+        Count the items of a collection without downloading it.
+        
+        Sends a single ``per_page=1`` request and reads ``x-total``. Endpoints
+        that are not paginated are counted from the returned list, and
+        collections too large for GitLab to report a total are counted by
+        walking their pages.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters (filters such as ``state``)
+            memoize: Use the request memo (small settings collections)
+            
+        Returns:
+            Number of items (0 if the endpoint is not accessible)
+            
+        Raises:
+            httpx.HTTPError: If the probe keeps failing after its retries
+        """
+        response = await self._fetch_page(endpoint, dict(params or {}, per_page=1), 1, memoize=memoize)
+        if response is None:
+            return 0
+        
+        total = response.headers.get('x-total')
+        if total is not None:
+            return int(total)
+        
+        if not response.headers.get('x-next-page') and not response.links.get('next'):
+            # Unpaginated endpoint (or a single page): everything is here
+            items = response.json()
+            return len(items) if isinstance(items, list) else 0
+        
+        self.logger.debug(f"No x-total for {endpoint}, counting by pagination")
+        count = 0
+        async for _ in self.paginated_request(endpoint, params=params, memoize=memoize):
+            count += 1
+        return count
+    
+    async def _iter_large_listing(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        max_pages: Optional[int],
+        order_by: str,
+        sort: str = 'asc',
+        memoize: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate a listing, switching to keyset pagination above the threshold"""
+        if max_pages is None and await self._exceeds_keyset_threshold(endpoint, params):
+            self.logger.info(f"Using keyset pagination for {endpoint}")
+            async for item in self.keyset_request(
+                endpoint, params=params, order_by=order_by, sort=sort, memoize=memoize
+            ):
+                yield item
+            return
+        
+        async for item in self.paginated_request(
+            endpoint, params=params, max_pages=max_pages, memoize=memoize
+        ):
+            yield item
     
     # ===== User Methods =====
     
@@ -280,21 +698,21 @@ class GitLabClient:
         Raises:
             httpx.HTTPError: If request fails (e.g., invalid token, network error)
         """
-        response = await self._request('GET', 'user')
+        response = await self._request('GET', 'user', memoize=True)
         return response.json()
     
     # ===== Group Methods =====
     
-    async def list_groups(
+    async def iter_groups(
         self,
         top_level_only: bool = False,
         owned: bool = False,
         min_access_level: Optional[int] = None,
         search: Optional[str] = None,
         max_pages: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        List accessible groups.
+        Iterate accessible groups as pages arrive.
         
         Args:
             top_level_only: Only return top-level groups
@@ -303,8 +721,8 @@ class GitLabClient:
             search: Search term
             max_pages: Maximum pages to fetch
             
-        Returns:
-            List of group dictionaries
+        Yields:
+            Group dictionaries
         """
         params = {
             "top_level_only": top_level_only,
@@ -315,10 +733,23 @@ class GitLabClient:
         if search:
             params["search"] = search
             
-        groups = []
         async for group in self.paginated_request("groups", params=params, max_pages=max_pages):
-            groups.append(group)
-        return groups
+            yield group
+    
+    async def list_groups(
+        self,
+        top_level_only: bool = False,
+        owned: bool = False,
+        min_access_level: Optional[int] = None,
+        search: Optional[str] = None,
+        max_pages: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """List accessible groups (see ``iter_groups``)"""
+        return [
+            group async for group in self.iter_groups(
+                top_level_only, owned, min_access_level, search, max_pages
+            )
+        ]
     
     async def get_group(self, group_id: Union[int, str]) -> Dict[str, Any]:
         """
@@ -332,55 +763,91 @@ class GitLabClient:
         """
         if isinstance(group_id, str):
             group_id = urllib.parse.quote(group_id, safe='')
-        response = await self._request('GET', f'groups/{group_id}')
+        response = await self._request('GET', f'groups/{group_id}', memoize=True)
         return response.json()
     
-    async def list_subgroups(
+    async def iter_subgroups(
         self,
         group_id: Union[int, str],
         max_pages: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        List subgroups of a group.
+        Iterate subgroups of a group as pages arrive.
         
         Args:
             group_id: Parent group ID or path
             max_pages: Maximum pages to fetch
             
-        Returns:
-            List of subgroup dictionaries
+        Yields:
+            Subgroup dictionaries
         """
         if isinstance(group_id, str):
             group_id = urllib.parse.quote(group_id, safe='')
             
-        subgroups = []
         async for subgroup in self.paginated_request(f"groups/{group_id}/subgroups", max_pages=max_pages):
-            subgroups.append(subgroup)
-        return subgroups
+            yield subgroup
+    
+    async def list_subgroups(
+        self,
+        group_id: Union[int, str],
+        max_pages: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """List subgroups of a group (see ``iter_subgroups``)"""
+        return [subgroup async for subgroup in self.iter_subgroups(group_id, max_pages)]
     
     async def get_group_hierarchy(
         self,
         group_id: Optional[Union[int, str]] = None,
         include_projects: bool = True,
-        max_depth: int = 3
+        max_depth: int = 3,
+        concurrency: int = 8
     ) -> Dict[str, Any]:
         """
         Get the full hierarchy of groups, subgroups, and optionally projects.
         
+        Sibling groups are expanded concurrently, and each group's subgroups
+        and projects are listed in parallel, with at most ``concurrency``
+        requests in flight. Child groups are built from the subgroup listing
+        rather than fetched one by one. Trees are cached per connection and
+        starting group for ``HIERARCHY_CACHE_TTL`` seconds, so repeated
+        expansions in the UI are served without API calls.
+        
         Args:
             group_id: Starting group ID/path (None for all accessible groups)
             include_projects: Include projects in the response
             max_depth: Maximum depth to traverse
+            concurrency: Maximum concurrent API requests
             
         Returns:
             Hierarchical dictionary with groups, subgroups, and projects
         """
-        async def _build_hierarchy(gid: Union[int, str], depth: int) -> Dict[str, Any]:
-            if depth > max_depth:
-                return None
-                
-            group = await self.get_group(gid)
-            result = {
+        key = RequestMemo.make_key(
+            self._connection_id,
+            'HIERARCHY',
+            str(group_id or ''),
+            {"include_projects": include_projects, "max_depth": max_depth}
+        )
+        return await _hierarchy_memo.get_or_fetch(
+            key,
+            lambda: self._build_group_hierarchy(group_id, include_projects, max_depth, concurrency)
+        )
+    
+    async def _build_group_hierarchy(
+        self,
+        group_id: Optional[Union[int, str]],
+        include_projects: bool,
+        max_depth: int,
+        concurrency: int
+    ) -> Dict[str, Any]:
+        """Traverse the group tree for ``get_group_hierarchy``"""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def _limited(coro):
+            async with semaphore:
+                return await coro
+        
+        def _group_node(group: Dict[str, Any]) -> Dict[str, Any]:
+            return {
                 "id": group["id"],
                 "name": group["name"],
                 "full_path": group["full_path"],
@@ -389,42 +856,55 @@ class GitLabClient:
                 "type": "group",
                 "children": []
             }
-            
-            # Get subgroups
+        
+        async def _list_subgroups(gid: Union[int, str]) -> List[Dict[str, Any]]:
             try:
-                subgroups = await self.list_subgroups(gid, max_pages=5)
-                for sg in subgroups:
-                    child = await _build_hierarchy(sg["id"], depth + 1)
-                    if child:
-                        result["children"].append(child)
+                return await _limited(self.list_subgroups(gid, max_pages=5))
             except Exception as e:
                 self.logger.warning(f"Could not fetch subgroups for {gid}: {e}")
+                return []
+        
+        async def _list_projects(gid: Union[int, str]) -> List[Dict[str, Any]]:
+            try:
+                return await _limited(self.list_group_projects(gid, include_subgroups=False, max_pages=5))
+            except Exception as e:
+                self.logger.warning(f"Could not fetch projects for {gid}: {e}")
+                return []
+        
+        async def _expand(result: Dict[str, Any], depth: int) -> Dict[str, Any]:
+            gid = result["id"]
             
-            # Get projects
+            # Subgroups and projects are independent: list them together
+            listings = [_list_subgroups(gid)]
             if include_projects:
-                try:
-                    projects = await self.list_group_projects(gid, include_subgroups=False, max_pages=5)
-                    for proj in projects:
-                        result["children"].append({
-                            "id": proj["id"],
-                            "name": proj["name"],
-                            "full_path": proj["path_with_namespace"],
-                            "description": proj.get("description"),
-                            "visibility": proj.get("visibility"),
-                            "type": "project",
-                            "default_branch": proj.get("default_branch"),
-                            "last_activity_at": proj.get("last_activity_at"),
-                        })
-                except Exception as e:
-                    self.logger.warning(f"Could not fetch projects for {gid}: {e}")
+                listings.append(_list_projects(gid))
+            subgroups, *projects = await asyncio.gather(*listings)
+            
+            if depth + 1 <= max_depth:
+                result["children"].extend(await asyncio.gather(*(
+                    _expand(_group_node(sg), depth + 1) for sg in subgroups
+                )))
+            
+            for proj in (projects[0] if projects else []):
+                result["children"].append({
+                    "id": proj["id"],
+                    "name": proj["name"],
+                    "full_path": proj["path_with_namespace"],
+                    "description": proj.get("description"),
+                    "visibility": proj.get("visibility"),
+                    "type": "project",
+                    "default_branch": proj.get("default_branch"),
+                    "last_activity_at": proj.get("last_activity_at"),
+                })
             
             return result
         
         if group_id:
-            return await _build_hierarchy(group_id, 0)
+            group = await _limited(self.get_group(group_id))
+            return await _expand(_group_node(group), 0)
         else:
             # Get top-level groups the user has access to
-            groups = await self.list_groups(top_level_only=True, max_pages=5)
+            groups = await _limited(self.list_groups(top_level_only=True, max_pages=5))
             root = {
                 "id": None,
                 "name": "Root",
@@ -432,49 +912,62 @@ class GitLabClient:
                 "type": "root",
                 "children": []
             }
-            for g in groups:
-                child = await _build_hierarchy(g["id"], 1)
-                if child:
-                    root["children"].append(child)
+            if max_depth >= 1:
+                root["children"] = list(await asyncio.gather(*(
+                    _expand(_group_node(g), 1) for g in groups
+                )))
             return root
 
     # ===== Project Methods =====
     
-    async def list_projects(
+    async def iter_projects(
         self,
         membership: bool = True,
         archived: bool = False,
         max_pages: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        List accessible projects.
+        Iterate accessible projects as pages arrive.
+        
+        Collections larger than ``keyset_threshold`` are read with keyset
+        pagination unless ``max_pages`` is set.
         
         Args:
             membership: Only list projects user is member of
             archived: Include archived projects
             max_pages: Maximum pages to fetch
             
-        Returns:
-            List of project dictionaries
+        Yields:
+            Project dictionaries
         """
         params = {
             "membership": membership,
             "archived": archived
         }
-        projects = []
-        async for project in self.paginated_request("projects", params=params, max_pages=max_pages):
-            projects.append(project)
-        return projects
+        async for project in self._iter_large_listing("projects", params, max_pages, order_by='id'):
+            yield project
     
-    async def list_group_projects(
+    async def list_projects(
+        self,
+        membership: bool = True,
+        archived: bool = False,
+        max_pages: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """List accessible projects (see ``iter_projects``)"""
+        return [project async for project in self.iter_projects(membership, archived, max_pages)]
+    
+    async def iter_group_projects(
         self,
         group_id: Union[int, str],
         include_subgroups: bool = True,
         archived: bool = False,
         max_pages: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        List all projects in a group.
+        Iterate all projects in a group as pages arrive.
+        
+        Collections larger than ``keyset_threshold`` are read with keyset
+        pagination unless ``max_pages`` is set.
         
         Args:
             group_id: Group ID or path
@@ -482,8 +975,8 @@ class GitLabClient:
             archived: Include archived projects
             max_pages: Maximum pages to fetch
             
-        Returns:
-            List of project dictionaries
+        Yields:
+            Project dictionaries
         """
         # URL encode if it's a path
         if isinstance(group_id, str):
@@ -493,10 +986,24 @@ class GitLabClient:
             "include_subgroups": include_subgroups,
             "archived": archived
         }
-        projects = []
-        async for project in self.paginated_request(f"groups/{group_id}/projects", params=params, max_pages=max_pages):
-            projects.append(project)
-        return projects
+        async for project in self._iter_large_listing(
+            f"groups/{group_id}/projects", params, max_pages, order_by='id'
+        ):
+            yield project
+    
+    async def list_group_projects(
+        self,
+        group_id: Union[int, str],
+        include_subgroups: bool = True,
+        archived: bool = False,
+        max_pages: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """List all projects in a group (see ``iter_group_projects``)"""
+        return [
+            project async for project in self.iter_group_projects(
+                group_id, include_subgroups, archived, max_pages
+            )
+        ]
     
     async def get_current_user(self) -> Dict[str, Any]:
         """
@@ -508,36 +1015,40 @@ class GitLabClient:
         Raises:
             httpx.HTTPError: On request failure
         """
-        response = await self._request("GET", "/user")
+        response = await self._request("GET", "/user", memoize=True)
         return response.json()
     
     async def get_project(self, project_id: int) -> Dict[str, Any]:
         """Get project details"""
-        response = await self._request('GET', f"projects/{project_id}")
+        response = await self._request('GET', f"projects/{project_id}", memoize=True)
         return response.json()
     
     async def get_project_by_path(self, path_with_namespace: str) -> Dict[str, Any]:
         """Get project by path"""
         # URL encode the path
         encoded_path = urllib.parse.quote(path_with_namespace, safe='')
-        response = await self._request('GET', f"projects/{encoded_path}")
+        response = await self._request('GET', f"projects/{encoded_path}", memoize=True)
         return response.json()
     
     # ===== Repository Methods =====
     
+    async def iter_branches(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate branches"""
+        async for branch in self.paginated_request(f"projects/{project_id}/repository/branches"):
+            yield branch
+    
     async def list_branches(self, project_id: int) -> List[Dict[str, Any]]:
         """List all branches"""
-        branches = []
-        async for branch in self.paginated_request(f"projects/{project_id}/repository/branches"):
-            branches.append(branch)
-        return branches
+        return [branch async for branch in self.iter_branches(project_id)]
+    
+    async def iter_tags(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate tags"""
+        async for tag in self.paginated_request(f"projects/{project_id}/repository/tags"):
+            yield tag
     
     async def list_tags(self, project_id: int) -> List[Dict[str, Any]]:
         """List all tags"""
-        tags = []
-        async for tag in self.paginated_request(f"projects/{project_id}/repository/tags"):
-            tags.append(tag)
-        return tags
+        return [tag async for tag in self.iter_tags(project_id)]
     
     async def get_file_content(
         self,
@@ -560,150 +1071,219 @@ class GitLabClient:
     
     # ===== CI/CD Methods =====
     
+    async def iter_variables(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate CI/CD variables (metadata only, not values)"""
+        async for var in self.paginated_request(f"projects/{project_id}/variables", memoize=True):
+            yield var
+    
     async def list_variables(self, project_id: int) -> List[Dict[str, Any]]:
         """List CI/CD variables (metadata only, not values)"""
-        variables = []
-        async for var in self.paginated_request(f"projects/{project_id}/variables"):
-            variables.append(var)
-        return variables
+        return [var async for var in self.iter_variables(project_id)]
+    
+    async def iter_environments(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate environments"""
+        async for env in self.paginated_request(f"projects/{project_id}/environments", memoize=True):
+            yield env
     
     async def list_environments(self, project_id: int) -> List[Dict[str, Any]]:
         """List environments"""
-        environments = []
-        async for env in self.paginated_request(f"projects/{project_id}/environments"):
-            environments.append(env)
-        return environments
+        return [env async for env in self.iter_environments(project_id)]
     
-    async def list_pipeline_schedules(self, project_id: int) -> List[Dict[str, Any]]:
-        """List pipeline schedules"""
-        schedules = []
-        async for schedule in self.paginated_request(f"projects/{project_id}/pipeline_schedules"):
+    async def iter_pipeline_schedules(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate pipeline schedules with full details"""
+        async for schedule in self.paginated_request(f"projects/{project_id}/pipeline_schedules", memoize=True):
             # Get full schedule details
             try:
                 response = await self._request(
                     'GET',
-                    f"projects/{project_id}/pipeline_schedules/{schedule['id']}"
+                    f"projects/{project_id}/pipeline_schedules/{schedule['id']}",
+                    memoize=True
                 )
-                schedules.append(response.json())
+                yield response.json()
             except Exception as e:
                 self.logger.warning(f"Failed to get schedule {schedule['id']}: {e}")
-                schedules.append(schedule)
-        return schedules
+                yield schedule
     
-    async def list_pipelines(
+    async def list_pipeline_schedules(self, project_id: int) -> List[Dict[str, Any]]:
+        """List pipeline schedules"""
+        return [schedule async for schedule in self.iter_pipeline_schedules(project_id)]
+    
+    async def iter_pipelines(
         self,
         project_id: int,
         max_count: Optional[int] = 100
-    ) -> List[Dict[str, Any]]:
-        """List recent pipelines"""
-        pipelines = []
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate recent pipelines, newest first"""
         count = 0
         async for pipeline in self.paginated_request(f"projects/{project_id}/pipelines"):
-            pipelines.append(pipeline)
+            yield pipeline
             count += 1
             if max_count and count >= max_count:
                 break
-        return pipelines
+    
+    async def list_pipelines(
+        self,
+        project_id: int,
+        max_count: Optional[int] = 100
+    ) -> List[Dict[str, Any]]:
+        """List recent pipelines"""
+        return [pipeline async for pipeline in self.iter_pipelines(project_id, max_count)]
     
     # ===== Labels and Milestones Methods =====
     
+    async def iter_labels(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate project labels"""
+        async for label in self.paginated_request(f"projects/{project_id}/labels"):
+            yield label
+    
     async def list_labels(self, project_id: int) -> List[Dict[str, Any]]:
         """List all project labels"""
-        labels = []
-        async for label in self.paginated_request(f"projects/{project_id}/labels"):
-            labels.append(label)
-        return labels
+        return [label async for label in self.iter_labels(project_id)]
     
-    async def list_milestones(self, project_id: int, state: Optional[str] = None) -> List[Dict[str, Any]]:
-        """List all project milestones"""
+    async def iter_milestones(
+        self,
+        project_id: int,
+        state: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate project milestones"""
         params = {}
         if state:
             params['state'] = state
-        milestones = []
         async for milestone in self.paginated_request(
             f"projects/{project_id}/milestones",
             params=params
         ):
-            milestones.append(milestone)
-        return milestones
+            yield milestone
+    
+    async def list_milestones(self, project_id: int, state: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List all project milestones"""
+        return [milestone async for milestone in self.iter_milestones(project_id, state)]
     
     # ===== Issue Methods =====
     
-    async def list_issues(
+    async def iter_issues(
         self,
         project_id: int,
         state: Optional[str] = None,
-        max_pages: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+        max_pages: Optional[int] = None,
+        updated_after: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        List all issues.
+        Iterate issues as pages arrive.
+        
+        Only the pages in flight are held in memory: pages are not kept in
+        the request memo. Collections larger than ``keyset_threshold`` are
+        read with keyset pagination unless ``max_pages`` is set. Both are
+        ordered newest first by ``created_at`` (the issues API has no ``id``
+        ordering), like the GraphQL export.
         
         Args:
             project_id: Project ID
             state: Filter by state (opened, closed, all)
             max_pages: Maximum pages to fetch
+            updated_after: Only issues updated after this ISO 8601 time
             
-        Returns:
-            List of issues
+        Yields:
+            Issues
         """
-        params = {'scope': 'all'}
+        params = {'scope': 'all', 'order_by': 'created_at', 'sort': 'desc'}
         if state:
             params['state'] = state
+        if updated_after:
+            params['updated_after'] = updated_after
         
-        issues = []
-        async for issue in self.paginated_request(
-            f"projects/{project_id}/issues",
-            params=params,
-            max_pages=max_pages
+        async for issue in self._iter_large_listing(
+            f"projects/{project_id}/issues", params, max_pages,
+            order_by='created_at', sort='desc'
         ):
-            issues.append(issue)
-        return issues
+            yield issue
+    
+    async def list_issues(
+        self,
+        project_id: int,
+        state: Optional[str] = None,
+        max_pages: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """List all issues (see ``iter_issues``)"""
+        return [issue async for issue in self.iter_issues(project_id, state, max_pages)]
     
     async def get_issue(self, project_id: int, issue_iid: int) -> Dict[str, Any]:
         """Get issue details"""
         response = await self._request('GET', f"projects/{project_id}/issues/{issue_iid}")
         return response.json()
     
-    async def list_issue_notes(self, project_id: int, issue_iid: int) -> List[Dict[str, Any]]:
-        """List issue comments/notes"""
-        notes = []
+    async def iter_notes(
+        self,
+        project_id: int,
+        noteable_type: str,
+        noteable_iid: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate the notes of an issue or merge request.
+        
+        Args:
+            project_id: Project ID
+            noteable_type: ``issues`` or ``merge_requests``
+            noteable_iid: Issue or merge request IID
+            
+        Yields:
+            Notes in API order
+        """
         async for note in self.paginated_request(
-            f"projects/{project_id}/issues/{issue_iid}/notes"
+            f"projects/{project_id}/{noteable_type}/{noteable_iid}/notes"
         ):
-            notes.append(note)
-        return notes
+            yield note
+    
+    async def list_issue_notes(self, project_id: int, issue_iid: int) -> List[Dict[str, Any]]:
+        """List issue comments/notes"""
+        return [note async for note in self.iter_notes(project_id, 'issues', issue_iid)]
     
     # ===== Merge Request Methods =====
     
-    async def list_merge_requests(
+    async def iter_merge_requests(
         self,
         project_id: int,
         state: Optional[str] = None,
-        max_pages: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+        max_pages: Optional[int] = None,
+        updated_after: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        List all merge requests.
+        Iterate merge requests as pages arrive.
+        
+        Only the pages in flight are held in memory: pages are not kept in
+        the request memo. Collections larger than ``keyset_threshold`` are
+        read with keyset pagination unless ``max_pages`` is set. Both are
+        ordered newest first by ``created_at``, as ``iter_issues``.
         
         Args:
             project_id: Project ID
             state: Filter by state (opened, closed, merged, all)
             max_pages: Maximum pages to fetch
+            updated_after: Only merge requests updated after this ISO 8601 time
             
-        Returns:
-            List of merge requests
+        Yields:
+            Merge requests
         """
-        params = {'scope': 'all'}
+        params = {'scope': 'all', 'order_by': 'created_at', 'sort': 'desc'}
         if state:
             params['state'] = state
+        if updated_after:
+            params['updated_after'] = updated_after
         
-        mrs = []
-        async for mr in self.paginated_request(
-            f"projects/{project_id}/merge_requests",
-            params=params,
-            max_pages=max_pages
+        async for mr in self._iter_large_listing(
+            f"projects/{project_id}/merge_requests", params, max_pages,
+            order_by='created_at', sort='desc'
         ):
-            mrs.append(mr)
-        return mrs
+            yield mr
+    
+    async def list_merge_requests(
+        self,
+        project_id: int,
+        state: Optional[str] = None,
+        max_pages: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """List all merge requests (see ``iter_merge_requests``)"""
+        return [mr async for mr in self.iter_merge_requests(project_id, state, max_pages)]
     
     async def get_merge_request(self, project_id: int, mr_iid: int) -> Dict[str, Any]:
         """Get merge request details"""
@@ -719,12 +1299,18 @@ class GitLabClient:
         mr_iid: int
     ) -> List[Dict[str, Any]]:
         """List merge request discussions/notes"""
-        notes = []
-        async for note in self.paginated_request(
-            f"projects/{project_id}/merge_requests/{mr_iid}/notes"
+        return [note async for note in self.iter_notes(project_id, 'merge_requests', mr_iid)]
+    
+    async def iter_merge_request_discussions(
+        self,
+        project_id: int,
+        mr_iid: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate merge request discussions (with position data)"""
+        async for discussion in self.paginated_request(
+            f"projects/{project_id}/merge_requests/{mr_iid}/discussions"
         ):
-            notes.append(note)
-        return notes
+            yield discussion
     
     async def list_merge_request_discussions(
         self,
@@ -732,12 +1318,9 @@ class GitLabClient:
         mr_iid: int
     ) -> List[Dict[str, Any]]:
         """List merge request discussions (with position data)"""
-        discussions = []
-        async for discussion in self.paginated_request(
-            f"projects/{project_id}/merge_requests/{mr_iid}/discussions"
-        ):
-            discussions.append(discussion)
-        return discussions
+        return [
+            discussion async for discussion in self.iter_merge_request_discussions(project_id, mr_iid)
+        ]
     
     async def list_merge_request_approvals(
         self,
@@ -757,21 +1340,25 @@ class GitLabClient:
     
     # ===== Release Methods =====
     
+    async def iter_releases(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate releases"""
+        async for release in self.paginated_request(f"projects/{project_id}/releases"):
+            yield release
+    
     async def list_releases(self, project_id: int) -> List[Dict[str, Any]]:
         """List all releases"""
-        releases = []
-        async for release in self.paginated_request(f"projects/{project_id}/releases"):
-            releases.append(release)
-        return releases
+        return [release async for release in self.iter_releases(project_id)]
     
     # ===== Package Methods =====
     
+    async def iter_packages(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate packages"""
+        async for package in self.paginated_request(f"projects/{project_id}/packages"):
+            yield package
+    
     async def list_packages(self, project_id: int) -> List[Dict[str, Any]]:
         """List packages"""
-        packages = []
-        async for package in self.paginated_request(f"projects/{project_id}/packages"):
-            packages.append(package)
-        return packages
+        return [package async for package in self.iter_packages(project_id)]
     
     async def get_package_details(self, project_id: int, package_id: int) -> Dict[str, Any]:
         """
@@ -792,121 +1379,138 @@ class GitLabClient:
         project_id: int, 
         package_id: int, 
         package_file_id: int,
-        output_path: Path
+        output_path: Path,
+        expected_sha256: Optional[str] = None,
+        expected_md5: Optional[str] = None,
+        expected_size: Optional[int] = None
     ) -> bool:
         """
         Download a package file from GitLab.
         
+        Pass the ``file_sha256``/``file_md5``/``size`` values GitLab reports
+        for the file to have the download verified.
+        
         Args:
             project_id: Project ID
             package_id: Package ID
             package_file_id: Package file ID
             output_path: Where to save the downloaded file
+            expected_sha256: Expected SHA-256 hex digest
+            expected_md5: Expected MD5 hex digest (used when no SHA-256)
+            expected_size: Expected size in bytes
             
         Returns:
             True if successful, False otherwise
         """
-        try:
-            # Ensure parent directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Rate limiting
-            await self.rate_limiter.wait_if_needed()
-            
-            # Download the file
-            url = f"{self.api_url}/projects/{project_id}/packages/{package_id}/package_files/{package_file_id}"
-            
-            async with self.client.stream("GET", url) as response:
-                response.raise_for_status()
-                
-                with open(output_path, 'wb') as f:
-                    async for chunk in response.aiter_bytes(chunk_size=8192):
-                        f.write(chunk)
-            
+        url = f"{self.api_url}/projects/{project_id}/packages/{package_id}/package_files/{package_file_id}"
+        success = await self.download_file(
+            url,
+            output_path,
+            expected_size=expected_size,
+            expected_sha256=expected_sha256,
+            expected_md5=expected_md5
+        )
+        if success:
             self.logger.info(f"Downloaded package file to {output_path}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Failed to download package file: {e}")
-            return False
+        return success
     
     # ===== Settings Methods =====
     
-    async def list_protected_branches(self, project_id: int) -> List[Dict[str, Any]]:
-        """List protected branches"""
-        branches = []
+    async def iter_protected_branches(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate protected branches"""
         async for branch in self.paginated_request(
-            f"projects/{project_id}/protected_branches"
+            f"projects/{project_id}/protected_branches", memoize=True
         ):
-            branches.append(branch)
-        return branches
+            yield branch
+    
+    async def list_protected_branches(self, project_id: int) -> List[Dict[str, Any]]:
+        """List protected branches"""
+        return [branch async for branch in self.iter_protected_branches(project_id)]
+    
+    async def iter_protected_tags(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate protected tags"""
+        async for tag in self.paginated_request(f"projects/{project_id}/protected_tags", memoize=True):
+            yield tag
     
     async def list_protected_tags(self, project_id: int) -> List[Dict[str, Any]]:
         """List protected tags"""
-        tags = []
-        async for tag in self.paginated_request(f"projects/{project_id}/protected_tags"):
-            tags.append(tag)
-        return tags
+        return [tag async for tag in self.iter_protected_tags(project_id)]
     
-    async def list_project_members(self, project_id: int) -> List[Dict[str, Any]]:
-        """List project members"""
-        members = []
+    async def iter_project_members(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate direct project members, then inherited ones flagged ``inherited``"""
+        seen = set()
         # Direct members
         async for member in self.paginated_request(f"projects/{project_id}/members"):
-            members.append(member)
+            seen.add(member['id'])
+            yield member
         # Inherited members
         async for member in self.paginated_request(
             f"projects/{project_id}/members/all"
         ):
-            if not any(m['id'] == member['id'] for m in members):
+            if member['id'] not in seen:
+                seen.add(member['id'])
                 member['inherited'] = True
-                members.append(member)
-        return members
+                yield member
+    
+    async def list_project_members(self, project_id: int) -> List[Dict[str, Any]]:
+        """List project members"""
+        return [member async for member in self.iter_project_members(project_id)]
+    
+    async def iter_webhooks(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate webhooks"""
+        async for hook in self.paginated_request(f"projects/{project_id}/hooks", memoize=True):
+            yield hook
     
     async def list_webhooks(self, project_id: int) -> List[Dict[str, Any]]:
         """List webhooks"""
-        hooks = []
-        async for hook in self.paginated_request(f"projects/{project_id}/hooks"):
-            hooks.append(hook)
-        return hooks
+        return [hook async for hook in self.iter_webhooks(project_id)]
     
     # Alias for backwards compatibility
     list_hooks = list_webhooks
     
+    async def iter_deploy_keys(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate deploy keys"""
+        async for key in self.paginated_request(f"projects/{project_id}/deploy_keys", memoize=True):
+            yield key
+    
     async def list_deploy_keys(self, project_id: int) -> List[Dict[str, Any]]:
         """List deploy keys"""
-        keys = []
-        async for key in self.paginated_request(f"projects/{project_id}/deploy_keys"):
-            keys.append(key)
-        return keys
+        return [key async for key in self.iter_deploy_keys(project_id)]
     
     # ===== Commits Methods =====
     
-    async def get_commits(
+    async def iter_commits(
         self,
         project_id: int,
         ref_name: Optional[str] = None,
         max_pages: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Get commits for a project.
+        Iterate commits for a project as pages arrive.
         
         Args:
             project_id: Project ID
             ref_name: Branch or tag name
             max_pages: Maximum pages to fetch
             
-        Returns:
-            List of commits
+        Yields:
+            Commits
         """
         params = {}
         if ref_name:
             params['ref_name'] = ref_name
         
-        commits = []
         async for commit in self.paginated_request(f"projects/{project_id}/repository/commits", params=params, max_pages=max_pages):
-            commits.append(commit)
-        return commits
+            yield commit
+    
+    async def get_commits(
+        self,
+        project_id: int,
+        ref_name: Optional[str] = None,
+        max_pages: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get commits for a project (see ``iter_commits``)"""
+        return [commit async for commit in self.iter_commits(project_id, ref_name, max_pages)]
     
     # ===== CI/CD Methods =====
     
@@ -928,12 +1532,14 @@ class GitLabClient:
         except Exception:
             return False
     
+    async def iter_wiki_pages(self, project_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate wiki pages for a project"""
+        async for page in self.paginated_request(f"projects/{project_id}/wikis"):
+            yield page
+    
     async def get_wiki_pages(self, project_id: int) -> List[Dict[str, Any]]:
         """Get wiki pages for a project"""
-        pages = []
-        async for page in self.paginated_request(f"projects/{project_id}/wikis"):
-            pages.append(page)
-        return pages
+        return [page async for page in self.iter_wiki_pages(project_id)]
     
     # ===== Package Methods =====
     
@@ -998,37 +1604,376 @@ class GitLabClient:
             return True
         return False
     
+    # ===== Project Export Methods =====
+    
+    async def start_project_export(self, project_id: int) -> Dict[str, Any]:
+        """Schedule a server-side project export (``POST /projects/:id/export``)"""
+        response = await self._request('POST', f"projects/{project_id}/export", data={})
+        return response.json()
+    
+    async def get_project_export(self, project_id: int) -> Dict[str, Any]:
+        """Project export status (``export_status``: none, queued, started, finished, ...)"""
+        response = await self._request('GET', f"projects/{project_id}/export")
+        return response.json()
+    
+    async def download_project_export(self, project_id: int, output_path: Path) -> bool:
+        """
+        Download a finished project export archive.
+        
+        Resumes across calls like ``download_file``.
+        
+        Args:
+            project_id: Project ID
+            output_path: Destination of the ``.tar.gz``
+            
+        Returns:
+            True if successful
+        """
+        return await self.download_file(f"{self.api_url}/projects/{project_id}/export/download", output_path)
+    
+    # ===== Count Methods =====
+    
+    async def count_commits(self, project_id: int) -> int:
+        """
+        Count commits from the project statistics.
+        
+        Same figure as the GraphQL ``statistics.commitCount``; listing
+        commits can't be counted from headers on large repositories.
+        """
+        response = await self._request('GET', f"projects/{project_id}", params={"statistics": "true"})
+        statistics = response.json().get("statistics") or {}
+        return int(statistics.get("commit_count") or 0)
+    
+    async def count_branches(self, project_id: int) -> int:
+        """Count branches"""
+        return await self.count_request(f"projects/{project_id}/repository/branches")
+    
+    async def count_tags(self, project_id: int) -> int:
+        """Count tags"""
+        return await self.count_request(f"projects/{project_id}/repository/tags")
+    
+    async def count_issues(self, project_id: int, state: Optional[str] = None) -> int:
+        """Count issues, optionally filtered by state (opened, closed)"""
+        params = {'scope': 'all'}
+        if state:
+            params['state'] = state
+        return await self.count_request(f"projects/{project_id}/issues", params)
+    
+    async def count_merge_requests(self, project_id: int, state: Optional[str] = None) -> int:
+        """Count merge requests, optionally filtered by state (opened, closed, merged)"""
+        params = {'scope': 'all'}
+        if state:
+            params['state'] = state
+        return await self.count_request(f"projects/{project_id}/merge_requests", params)
+    
+    async def count_labels(self, project_id: int) -> int:
+        """Count project labels, including ancestor group labels (as the GraphQL count)"""
+        return await self.count_request(
+            f"projects/{project_id}/labels", {'include_ancestor_groups': 'true'}
+        )
+    
+    async def count_milestones(self, project_id: int, state: Optional[str] = None) -> int:
+        """Count project milestones"""
+        params = {'state': state} if state else None
+        return await self.count_request(f"projects/{project_id}/milestones", params)
+    
+    async def count_releases(self, project_id: int) -> int:
+        """Count releases"""
+        return await self.count_request(f"projects/{project_id}/releases")
+    
+    async def count_packages(self, project_id: int) -> int:
+        """Count packages"""
+        return await self.count_request(f"projects/{project_id}/packages")
+    
+    async def count_wiki_pages(self, project_id: int) -> int:
+        """Count wiki pages"""
+        return await self.count_request(f"projects/{project_id}/wikis")
+    
+    async def count_pipelines(self, project_id: int) -> int:
+        """Count pipelines"""
+        return await self.count_request(f"projects/{project_id}/pipelines")
+    
+    async def count_variables(self, project_id: int) -> int:
+        """Count CI/CD variables"""
+        return await self.count_request(f"projects/{project_id}/variables", memoize=True)
+    
+    async def count_environments(self, project_id: int) -> int:
+        """Count environments"""
+        return await self.count_request(f"projects/{project_id}/environments", memoize=True)
+    
+    async def count_pipeline_schedules(self, project_id: int) -> int:
+        """Count pipeline schedules"""
+        return await self.count_request(f"projects/{project_id}/pipeline_schedules", memoize=True)
+    
+    async def count_protected_branches(self, project_id: int) -> int:
+        """Count protected branches"""
+        return await self.count_request(f"projects/{project_id}/protected_branches", memoize=True)
+    
+    async def count_protected_tags(self, project_id: int) -> int:
+        """Count protected tags"""
+        return await self.count_request(f"projects/{project_id}/protected_tags", memoize=True)
+    
+    async def count_project_members(self, project_id: int) -> int:
+        """Count project members, including inherited ones"""
+        return await self.count_request(f"projects/{project_id}/members/all")
+    
+    async def count_webhooks(self, project_id: int) -> int:
+        """Count webhooks"""
+        return await self.count_request(f"projects/{project_id}/hooks", memoize=True)
+    
+    async def count_deploy_keys(self, project_id: int) -> int:
+        """Count deploy keys"""
+        return await self.count_request(f"projects/{project_id}/deploy_keys", memoize=True)
+    
     # ===== Download Methods =====
     
+    async def get_content_length(self, url: str) -> Optional[int]:
+        """
+        Get the size of a downloadable file with a HEAD request.
+        
+        Args:
+            url: File URL
+            
+        Returns:
+            Size in bytes, or None if the server doesn't report it
+        """
+        try:
+            await self.rate_limiter.wait_if_needed()
+            async with self.download_slots:
+                response = await self.client.head(url)
+        except httpx.HTTPError as e:
+            self.logger.debug(f"HEAD {url} failed: {e}")
+            return None
+        
+        length = response.headers.get('Content-Length', '')
+        if response.status_code >= 400 or not length.isdigit():
+            return None
+        return int(length)
+    
     async def download_file(
         self,
         url: str,
         output_path: Path,
-        chunk_size: int = 8192
+        chunk_size: Optional[int] = None,
+        expected_size: Optional[int] = None,
+        expected_sha256: Optional[str] = None,
+        expected_md5: Optional[str] = None
     ) -> bool:
         """
-        Download file from URL.
+        Download file from URL, resuming interrupted transfers.
+        
+        Bytes are written to ``<output_path>.part`` and resumed with HTTP
+        Range requests after network errors, also across calls: a failed
+        download keeps its ``.part`` file and the next call continues from
+        it. Files of at least ``segment_threshold`` bytes on servers that
+        accept ranges are fetched as ``download_segments`` parallel ranges.
+        The file is moved into place only once it matches the expected size
+        and checksum; a mismatching download is discarded and fetched again
+        once from scratch.
         
         Args:
             url: File URL
             output_path: Output file path
-            chunk_size: Download chunk size
+            chunk_size: Download chunk size (default: ``download_chunk_size``)
+            expected_size: Expected size in bytes
+            expected_sha256: Expected SHA-256 hex digest
+            expected_md5: Expected MD5 hex digest (used when no SHA-256)
             
         Returns:
             True if successful
         """
+        output_path = Path(output_path)
+        part_path = output_path.with_name(f"{output_path.name}.part")
+        chunk_size = chunk_size or self.download_chunk_size
+        
         try:
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            async with self.client.stream('GET', url) as response:
-                response.raise_for_status()
-                
-                with open(output_path, 'wb') as f:
-                    async for chunk in response.aiter_bytes(chunk_size):
-                        f.write(chunk)
+            for _ in range(2):
+                await self._download_to_part(url, part_path, chunk_size)
+                problem = await asyncio.to_thread(
+                    self._verify_download, part_path, expected_size, expected_sha256, expected_md5
+                )
+                if problem is None:
+                    part_path.replace(output_path)
+                    return True
+                self.logger.warning(f"Discarding download of {url}: {problem}")
+                part_path.unlink(missing_ok=True)
             
-            return True
+            self.logger.error(f"Failed to download {url}: {problem}")
+            return False
             
         except Exception as e:
             self.logger.error(f"Failed to download {url}: {e}")
             return False
+    
+    async def _download_to_part(self, url: str, part_path: Path, chunk_size: int):
+        """Fill ``part_path`` with the complete body of ``url``"""
+        segments = self._pending_segments(part_path)
+        if segments:
+            await self._download_segments(url, part_path, segments, chunk_size)
+            return
+        
+        total_size = await self._retry_download(
+            url,
+            lambda: self._stream_to_part(url, part_path, chunk_size),
+            lambda: part_path.stat().st_size if part_path.exists() else 0
+        )
+        if total_size:
+            segment_size = -(-total_size // self.download_segments)
+            segments = [
+                (start, min(start + segment_size, total_size) - 1)
+                for start in range(0, total_size, segment_size)
+            ]
+            await self._download_segments(url, part_path, segments, chunk_size)
+    
+    async def _stream_to_part(self, url: str, part_path: Path, chunk_size: int) -> Optional[int]:
+        """
+        Append the rest of ``url`` to ``part_path`` in a single stream.
+        
+        Returns:
+            The total size when the file should be fetched in segments
+            instead (nothing is written then), otherwise None
+        """
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+        
+        await self.rate_limiter.wait_if_needed()
+        async with self.download_slots, self.client.stream('GET', url, headers=headers) as response:
+            if offset and response.status_code == 416:
+                # Nothing left past our offset: the part file is complete
+                return None
+            response.raise_for_status()
+            
+            if response.status_code != 206:
+                # Fresh download, or the server ignored the range: start over
+                offset = 0
+                total_size = int(response.headers.get('Content-Length') or 0)
+                if (
+                    self.download_segments > 1
+                    and total_size >= self.segment_threshold
+                    and response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+                ):
+                    return total_size
+            
+            with open(part_path, 'ab' if offset else 'wb') as f:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    f.write(chunk)
+        return None
+    
+    async def _download_segments(
+        self,
+        url: str,
+        part_path: Path,
+        segments: List[tuple],
+        chunk_size: int
+    ):
+        """Fetch byte ranges in parallel, then join them into ``part_path``"""
+        segment_paths = [part_path.with_name(f"{part_path.name}.{start}-{end}") for start, end in segments]
+        
+        await asyncio.gather(*(
+            self._retry_download(
+                url,
+                lambda path=path, start=start, end=end: self._stream_segment(url, path, start, end, chunk_size),
+                lambda path=path: path.stat().st_size if path.exists() else 0
+            )
+            for path, (start, end) in zip(segment_paths, segments)
+        ))
+        
+        def join():
+            with open(part_path, 'wb') as out:
+                for path in segment_paths:
+                    with open(path, 'rb') as f:
+                        shutil.copyfileobj(f, out, chunk_size)
+            for path in segment_paths:
+                path.unlink()
+        
+        await asyncio.to_thread(join)
+    
+    async def _stream_segment(self, url: str, path: Path, start: int, end: int, chunk_size: int):
+        """Append the missing tail of the ``start``-``end`` range to ``path``"""
+        offset = start + (path.stat().st_size if path.exists() else 0)
+        if offset > end:
+            return
+        
+        await self.rate_limiter.wait_if_needed()
+        async with self.download_slots, self.client.stream('GET', url, headers={"Range": f"bytes={offset}-{end}"}) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise ValueError(f"Server ignored range request for {url}")
+            with open(path, 'ab') as f:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    f.write(chunk)
+    
+    async def _retry_download(self, url: str, attempt, progress):
+        """
+        Run a download step, retrying transient failures.
+        
+        Attempts only count while no bytes arrive, so a slow but moving
+        transfer is never abandoned.
+        
+        Args:
+            url: URL being downloaded (for logging)
+            attempt: Coroutine factory performing one try
+            progress: Callable returning the bytes downloaded so far
+        """
+        failures = 0
+        while True:
+            before = progress()
+            try:
+                return await attempt()
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if isinstance(e, httpx.HTTPStatusError):
+                    status = e.response.status_code
+                    if status < 500 and status != 429:
+                        raise
+                failures = 0 if progress() > before else failures + 1
+                if failures >= self.download_attempts:
+                    raise
+                wait_time = min(2 ** failures, 60)
+                self.logger.warning(
+                    f"Download of {url} interrupted at {progress()} bytes: {e}, resuming in {wait_time}s"
+                )
+                await asyncio.sleep(wait_time)
+    
+    @staticmethod
+    def _pending_segments(part_path: Path) -> List[tuple]:
+        """Byte ranges of segment files left behind by an interrupted download"""
+        segments = []
+        for path in part_path.parent.glob(f"{glob.escape(part_path.name)}.*-*"):
+            start, _, end = path.name[len(part_path.name) + 1:].partition('-')
+            if start.isdigit() and end.isdigit():
+                segments.append((int(start), int(end)))
+        return sorted(segments)
+    
+    @staticmethod
+    def _verify_download(
+        path: Path,
+        expected_size: Optional[int],
+        expected_sha256: Optional[str],
+        expected_md5: Optional[str]
+    ) -> Optional[str]:
+        """
+        Check a downloaded file against its expected size and checksum.
+        
+        Returns:
+            Description of the mismatch, or None if the file is valid
+        """
+        size = path.stat().st_size
+        if expected_size is not None and size != expected_size:
+            return f"size {size} does not match expected {expected_size}"
+        
+        if expected_sha256:
+            algorithm, expected = 'sha256', expected_sha256
+        elif expected_md5:
+            algorithm, expected = 'md5', expected_md5
+        else:
+            return None
+        
+        digest = hashlib.new(algorithm)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        if digest.hexdigest() != expected.lower():
+            return f"{algorithm} {digest.hexdigest()} does not match expected {expected}"
+        return None
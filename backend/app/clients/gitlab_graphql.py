@@ -0,0 +1,659 @@
+"""GitLab GraphQL helpers for bulk read operations"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from app.clients.gitlab_client import GitLabClient
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class GitLabGraphQLError(Exception):
+    """GraphQL request rejected as a whole (syntax, complexity, auth)"""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        self.errors = errors
+        messages = "; ".join(str(e.get("message", e)) for e in errors)
+        super().__init__(messages or "GraphQL request failed")
+
+    @property
+    def is_complexity_error(self) -> bool:
+        """Whether the query was too large for the server's complexity limits"""
+        text = str(self).lower()
+        return "complexity" in text or "too many" in text
+
+
+# Counts and flags needed by discovery, resolved in a single query per batch
+PROJECT_COUNTS_FRAGMENT = """
+fragment ProjectCounts on Project {
+  fullPath
+  issuesEnabled
+  mergeRequestsEnabled
+  wikiEnabled
+  lfsEnabled
+  statistics {
+    commitCount
+    repositorySize
+    lfsObjectsSize
+    wikiSize
+    packagesSize
+  }
+  openedIssues: issues(state: opened) { count }
+  closedIssues: issues(state: closed) { count }
+  openedMergeRequests: mergeRequests(state: opened) { count }
+  mergedMergeRequests: mergeRequests(state: merged) { count }
+  closedMergeRequests: mergeRequests(state: closed) { count }
+  labels(includeAncestorGroups: true) { count }
+  milestones { count }
+  releases { count }
+  packages { count }
+}
+"""
+
+
+# Shared selections of the issue and merge request export queries. ExportUser
+# is declared on the User interface: authors are UserCore, while MR assignees,
+# reviewers and approvers are MR-specific types that only share that interface.
+EXPORT_FRAGMENTS = """
+fragment ExportUser on User {
+  id
+  username
+  name
+  state
+  avatarUrl
+  webUrl
+}
+
+fragment ExportNote on Note {
+  id
+  body
+  system
+  resolvable
+  resolved
+  createdAt
+  updatedAt
+  author { ...ExportUser }
+  position {
+    diffRefs { baseSha startSha headSha }
+    filePath
+    oldPath
+    newPath
+    oldLine
+    newLine
+    positionType
+  }
+}
+
+fragment ExportMilestone on Milestone {
+  id
+  iid
+  title
+  description
+  state
+  dueDate
+  startDate
+  webPath
+}
+"""
+
+EXPORT_ISSUES_QUERY = """
+query ExportIssues(
+  $fullPath: ID!, $first: Int!, $after: String, $notes: Int!, $updatedAfter: Time
+) {
+  project(fullPath: $fullPath) {
+    issues(first: $first, after: $after, sort: CREATED_DESC, updatedAfter: $updatedAfter) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        id
+        iid
+        title
+        description
+        state
+        confidential
+        discussionLocked
+        createdAt
+        updatedAt
+        closedAt
+        dueDate
+        webUrl
+        upvotes
+        downvotes
+        userNotesCount
+        author { ...ExportUser }
+        assignees { nodes { ...ExportUser } }
+        labels { nodes { title } }
+        milestone { ...ExportMilestone }
+        notes(first: $notes) {
+          pageInfo { hasNextPage }
+          nodes { ...ExportNote }
+        }
+      }
+    }
+  }
+}
+""" + EXPORT_FRAGMENTS
+
+EXPORT_MERGE_REQUESTS_QUERY = """
+query ExportMergeRequests(
+  $fullPath: ID!, $first: Int!, $after: String, $discussions: Int!, $notes: Int!,
+  $updatedAfter: Time
+) {
+  project(fullPath: $fullPath) {
+    mergeRequests(first: $first, after: $after, sort: CREATED_DESC, updatedAfter: $updatedAfter) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        id
+        iid
+        title
+        description
+        state
+        draft
+        createdAt
+        updatedAt
+        mergedAt
+        closedAt
+        sourceBranch
+        targetBranch
+        sourceProjectId
+        targetProjectId
+        diffHeadSha
+        mergeCommitSha
+        squashCommitSha
+        squash
+        webUrl
+        upvotes
+        downvotes
+        userNotesCount
+        author { ...ExportUser }
+        mergeUser { ...ExportUser }
+        assignees { nodes { ...ExportUser } }
+        reviewers { nodes { ...ExportUser } }
+        labels { nodes { title } }
+        milestone { ...ExportMilestone }
+        approved
+        approvedBy { nodes { ...ExportUser } }
+        discussions(first: $discussions) {
+          pageInfo { hasNextPage }
+          nodes {
+            id
+            resolvable
+            resolved
+            notes(first: $notes) {
+              pageInfo { hasNextPage }
+              nodes { ...ExportNote }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+""" + EXPORT_FRAGMENTS
+
+
+class GitLabGraphQL:
+    """
+    Thin GraphQL layer on top of GitLabClient.
+
+    Requests go through the client's ``_request`` so they share its rate
+    limiter, retries and authentication. Per-project lookups are batched into
+    one query using field aliases (``p0: project(fullPath: ...)``), which
+    turns hundreds of REST listing calls into a handful of round trips.
+    """
+
+    def __init__(self, client: GitLabClient, batch_size: int = 25):
+        """
+        Initialize GraphQL helper.
+
+        Args:
+            client: Authenticated GitLab REST client
+            batch_size: Projects resolved per query
+        """
+        self.client = client
+        self.batch_size = max(1, batch_size)
+        self.graphql_url = f"{client.base_url}/api/graphql"
+
+    async def execute(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Execute a GraphQL query.
+
+        Args:
+            query: GraphQL document
+            variables: Query variables
+
+        Returns:
+            The ``data`` object (fields that failed individually are null)
+
+        Raises:
+            GitLabGraphQLError: If the server returned errors and no data
+            httpx.HTTPError: On transport failure
+        """
+        response = await self.client._request(
+            'POST',
+            self.graphql_url,
+            data={"query": query, "variables": variables or {}}
+        )
+        payload = response.json()
+        errors = payload.get("errors") or []
+        data = payload.get("data")
+
+        if errors and not data:
+            raise GitLabGraphQLError(errors)
+        if errors:
+            logger.debug(f"GraphQL returned partial errors: {errors}")
+        return data or {}
+
+    async def get_project_counts(self, full_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch discovery counts for many projects in batched queries.
+
+        Batches that exceed the server's complexity limit are split in half
+        and retried. Projects that cannot be resolved (missing, no access,
+        query rejected) are simply absent from the result so callers can fall
+        back to REST for them.
+
+        Args:
+            full_paths: Project paths with namespace
+
+        Returns:
+            Dict mapping full path to normalized counts (see
+            ``_normalize_counts``)
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(full_paths), self.batch_size):
+            batch = full_paths[start:start + self.batch_size]
+            results.update(await self._fetch_counts_batch(batch))
+        return results
+
+    async def _fetch_counts_batch(self, full_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Resolve one batch, halving it on complexity errors"""
+        if not full_paths:
+            return {}
+
+        query, variables = self._build_counts_query(full_paths)
+        try:
+            data = await self.execute(query, variables)
+        except GitLabGraphQLError as e:
+            if e.is_complexity_error and len(full_paths) > 1:
+                middle = len(full_paths) // 2
+                logger.debug(f"Splitting GraphQL batch of {len(full_paths)} projects: {e}")
+                first = await self._fetch_counts_batch(full_paths[:middle])
+                second = await self._fetch_counts_batch(full_paths[middle:])
+                return {**first, **second}
+            logger.warning(f"GraphQL count query failed for {len(full_paths)} projects: {e}")
+            return {}
+
+        results = {}
+        for index, path in enumerate(full_paths):
+            node = data.get(f"p{index}")
+            if node:
+                results[path] = self._normalize_counts(node)
+        return results
+
+    @staticmethod
+    def _build_counts_query(full_paths: List[str]):
+        """Build an aliased query selecting ``ProjectCounts`` for each path"""
+        declarations = ", ".join(f"$p{i}: ID!" for i in range(len(full_paths)))
+        selections = "\n".join(
+            f"  p{i}: project(fullPath: $p{i}) {{ ...ProjectCounts }}"
+            for i in range(len(full_paths))
+        )
+        query = f"query ProjectCountsBatch({declarations}) {{\n{selections}\n}}\n{PROJECT_COUNTS_FRAGMENT}"
+        variables = {f"p{i}": path for i, path in enumerate(full_paths)}
+        return query, variables
+
+    @staticmethod
+    def _normalize_counts(node: Dict[str, Any]) -> Dict[str, Any]:
+        """Flatten a ``ProjectCounts`` node; unknown values are None"""
+        def count(field: str) -> Optional[int]:
+            value = node.get(field)
+            return value.get("count") if isinstance(value, dict) else None
+
+        statistics = node.get("statistics") or {}
+
+        def stat(field: str) -> Optional[int]:
+            value = statistics.get(field)
+            return int(value) if value is not None else None
+
+        return {
+            "issues_enabled": node.get("issuesEnabled"),
+            "merge_requests_enabled": node.get("mergeRequestsEnabled"),
+            "wiki_enabled": node.get("wikiEnabled"),
+            "lfs_enabled": node.get("lfsEnabled"),
+            "commit_count": stat("commitCount"),
+            "repository_size": stat("repositorySize"),
+            "lfs_objects_size": stat("lfsObjectsSize"),
+            "wiki_size": stat("wikiSize"),
+            "packages_size": stat("packagesSize"),
+            "opened_issues": count("openedIssues"),
+            "closed_issues": count("closedIssues"),
+            "opened_merge_requests": count("openedMergeRequests"),
+            "merged_merge_requests": count("mergedMergeRequests"),
+            "closed_merge_requests": count("closedMergeRequests"),
+            "labels": count("labels"),
+            "milestones": count("milestones"),
+            "releases": count("releases"),
+            "packages": count("packages"),
+        }
+    
+    # ===== Export Methods =====
+    
+    async def iter_issues(
+        self,
+        full_path: str,
+        project_id: int,
+        page_size: int = 50,
+        notes_per_issue: int = 20,
+        updated_after: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate issues with their notes, labels, assignees and milestone.
+        
+        Each GraphQL page carries up to ``notes_per_issue`` notes per issue;
+        the few issues with longer threads get their notes from REST. Items
+        have the REST ``get_issue`` shape plus a ``notes`` list in REST order
+        (newest first), newest issues first.
+        
+        Args:
+            full_path: Project path with namespace
+            project_id: Project ID (REST fallback and ``project_id`` fields)
+            page_size: Issues per query (halved on complexity errors)
+            notes_per_issue: Notes fetched inline per issue
+            updated_after: Only issues updated after this ISO 8601 time
+            
+        Yields:
+            REST-shaped issues with ``notes``
+        """
+        variables = {"fullPath": full_path, "notes": notes_per_issue, "updatedAfter": updated_after}
+        async for node in self._iter_project_connection(
+            EXPORT_ISSUES_QUERY, variables, "issues", page_size
+        ):
+            issue = self._to_rest_issue(node, project_id)
+            notes = node.get("notes") or {}
+            if (notes.get("pageInfo") or {}).get("hasNextPage"):
+                issue["notes"] = await self.client.list_issue_notes(project_id, issue["iid"])
+            else:
+                issue["notes"] = [
+                    self._to_rest_note(note, project_id, "Issue", issue)
+                    for note in reversed(notes.get("nodes") or [])
+                ]
+            yield issue
+    
+    async def iter_merge_requests(
+        self,
+        full_path: str,
+        project_id: int,
+        page_size: int = 20,
+        discussions_per_mr: int = 20,
+        notes_per_discussion: int = 10,
+        updated_after: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate merge requests with discussions and approvals.
+        
+        Merge requests whose discussions don't fit in the inline limits get
+        them from REST instead. Items have the REST ``get_merge_request``
+        shape plus ``discussions`` and ``approvals``; approvals carry the
+        ``approved`` and ``approved_by`` fields, which are the ones available
+        on every GitLab edition.
+        
+        Args:
+            full_path: Project path with namespace
+            project_id: Project ID (REST fallback and ``project_id`` fields)
+            page_size: Merge requests per query (halved on complexity errors)
+            discussions_per_mr: Discussions fetched inline per merge request
+            notes_per_discussion: Notes fetched inline per discussion
+            updated_after: Only merge requests updated after this ISO 8601 time
+            
+        Yields:
+            REST-shaped merge requests with ``discussions`` and ``approvals``
+        """
+        variables = {
+            "fullPath": full_path,
+            "discussions": discussions_per_mr,
+            "notes": notes_per_discussion,
+            "updatedAfter": updated_after
+        }
+        async for node in self._iter_project_connection(
+            EXPORT_MERGE_REQUESTS_QUERY, variables, "mergeRequests", page_size
+        ):
+            mr = self._to_rest_merge_request(node, project_id)
+            discussions = node.get("discussions") or {}
+            nodes = discussions.get("nodes") or []
+            truncated = (discussions.get("pageInfo") or {}).get("hasNextPage") or any(
+                ((d.get("notes") or {}).get("pageInfo") or {}).get("hasNextPage") for d in nodes
+            )
+            if truncated:
+                mr["discussions"] = await self.client.list_merge_request_discussions(project_id, mr["iid"])
+            else:
+                mr["discussions"] = [
+                    self._to_rest_discussion(d, project_id, mr) for d in nodes
+                ]
+            mr["approvals"] = {
+                "id": mr["id"],
+                "iid": mr["iid"],
+                "project_id": project_id,
+                "approved": node.get("approved"),
+                "approved_by": [
+                    {"user": self._to_rest_user(user)}
+                    for user in (node.get("approvedBy") or {}).get("nodes") or []
+                ]
+            }
+            yield mr
+    
+    async def _iter_project_connection(
+        self,
+        query: str,
+        variables: Dict[str, Any],
+        connection: str,
+        page_size: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Page through a connection of ``project(fullPath:)``.
+        
+        The page size is halved whenever the server rejects a page as too
+        complex, and kept at the smaller size for the following pages.
+        
+        Raises:
+            GitLabGraphQLError: If the project can't be resolved or a single
+                item per page is still too complex
+        """
+        first = max(1, page_size)
+        after = None
+        
+        while True:
+            try:
+                data = await self.execute(query, {**variables, "first": first, "after": after})
+            except GitLabGraphQLError as e:
+                if e.is_complexity_error and first > 1:
+                    first //= 2
+                    logger.debug(f"Reducing GraphQL {connection} page size to {first}: {e}")
+                    continue
+                raise
+            
+            project = data.get("project")
+            if not isinstance(project, dict):
+                raise GitLabGraphQLError([{"message": f"Project {variables['fullPath']} not found"}])
+            page = project.get(connection) or {}
+            
+            for node in page.get("nodes") or []:
+                yield node
+            
+            page_info = page.get("pageInfo") or {}
+            if not page_info.get("hasNextPage") or not page_info.get("endCursor"):
+                return
+            after = page_info["endCursor"]
+    
+    # ===== REST Shape Conversion =====
+    
+    @staticmethod
+    def _gid_to_id(gid: Optional[str]) -> Optional[int]:
+        """``gid://gitlab/Issue/123`` -> ``123``"""
+        if gid is None:
+            return None
+        tail = str(gid).rsplit('/', 1)[-1]
+        return int(tail) if tail.isdigit() else None
+    
+    @classmethod
+    def _to_rest_user(cls, user: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Convert an ``ExportUser`` node to the REST user shape"""
+        if not user:
+            return None
+        return {
+            "id": cls._gid_to_id(user.get("id")),
+            "username": user.get("username"),
+            "name": user.get("name"),
+            "state": user.get("state"),
+            "avatar_url": user.get("avatarUrl"),
+            "web_url": user.get("webUrl"),
+        }
+    
+    def _to_rest_milestone(
+        self,
+        milestone: Optional[Dict[str, Any]],
+        project_id: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Convert an ``ExportMilestone`` node to the REST milestone shape.
+        
+        GraphQL only exposes the milestone's relative ``webPath``, so
+        ``web_url`` is built against the instance base URL.
+        """
+        if not milestone:
+            return None
+        web_path = milestone.get("webPath")
+        return {
+            "id": self._gid_to_id(milestone.get("id")),
+            "iid": int(milestone["iid"]) if milestone.get("iid") else None,
+            "project_id": project_id,
+            "title": milestone.get("title"),
+            "description": milestone.get("description"),
+            "state": milestone.get("state"),
+            "due_date": milestone.get("dueDate"),
+            "start_date": milestone.get("startDate"),
+            "web_url": f"{self.client.base_url}{web_path}" if web_path else None,
+        }
+    
+    def _common_fields(self, node: Dict[str, Any], project_id: int) -> Dict[str, Any]:
+        """Fields issues and merge requests share"""
+        assignees = [self._to_rest_user(u) for u in (node.get("assignees") or {}).get("nodes") or []]
+        return {
+            "id": self._gid_to_id(node.get("id")),
+            "iid": int(node["iid"]),
+            "project_id": project_id,
+            "title": node.get("title"),
+            "description": node.get("description"),
+            "state": node.get("state"),
+            "created_at": node.get("createdAt"),
+            "updated_at": node.get("updatedAt"),
+            "closed_at": node.get("closedAt"),
+            "labels": [label["title"] for label in (node.get("labels") or {}).get("nodes") or []],
+            "milestone": self._to_rest_milestone(node.get("milestone"), project_id),
+            "author": self._to_rest_user(node.get("author")),
+            "assignees": assignees,
+            "assignee": assignees[0] if assignees else None,
+            "upvotes": node.get("upvotes"),
+            "downvotes": node.get("downvotes"),
+            "user_notes_count": node.get("userNotesCount"),
+            "web_url": node.get("webUrl"),
+        }
+    
+    def _to_rest_issue(self, node: Dict[str, Any], project_id: int) -> Dict[str, Any]:
+        """Convert an issue node to the REST ``get_issue`` shape"""
+        issue = self._common_fields(node, project_id)
+        issue.update({
+            "confidential": node.get("confidential"),
+            "discussion_locked": node.get("discussionLocked"),
+            "due_date": node.get("dueDate"),
+        })
+        return issue
+    
+    def _to_rest_merge_request(self, node: Dict[str, Any], project_id: int) -> Dict[str, Any]:
+        """Convert a merge request node to the REST ``get_merge_request`` shape"""
+        mr = self._common_fields(node, project_id)
+        merge_user = self._to_rest_user(node.get("mergeUser"))
+        mr.update({
+            "merged_at": node.get("mergedAt"),
+            "source_branch": node.get("sourceBranch"),
+            "target_branch": node.get("targetBranch"),
+            "source_project_id": node.get("sourceProjectId"),
+            "target_project_id": node.get("targetProjectId"),
+            "draft": node.get("draft"),
+            "work_in_progress": node.get("draft"),
+            "sha": node.get("diffHeadSha"),
+            "merge_commit_sha": node.get("mergeCommitSha"),
+            "squash_commit_sha": node.get("squashCommitSha"),
+            "squash": node.get("squash"),
+            "merge_user": merge_user,
+            "merged_by": merge_user,
+            "reviewers": [self._to_rest_user(u) for u in (node.get("reviewers") or {}).get("nodes") or []],
+        })
+        return mr
+    
+    @classmethod
+    def _to_rest_note(
+        cls,
+        note: Dict[str, Any],
+        project_id: int,
+        noteable_type: str,
+        noteable: Dict[str, Any],
+        note_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Convert an ``ExportNote`` node to the REST note shape"""
+        rest_note = {
+            "id": cls._gid_to_id(note.get("id")),
+            "type": note_type,
+            "body": note.get("body"),
+            "author": cls._to_rest_user(note.get("author")),
+            "created_at": note.get("createdAt"),
+            "updated_at": note.get("updatedAt"),
+            "system": note.get("system"),
+            "noteable_id": noteable["id"],
+            "noteable_type": noteable_type,
+            "noteable_iid": noteable["iid"],
+            "project_id": project_id,
+            "resolvable": note.get("resolvable"),
+        }
+        if note.get("resolvable"):
+            rest_note["resolved"] = note.get("resolved")
+        
+        position = note.get("position")
+        if position:
+            diff_refs = position.get("diffRefs") or {}
+            rest_note["type"] = "DiffNote"
+            rest_note["position"] = {
+                "base_sha": diff_refs.get("baseSha"),
+                "start_sha": diff_refs.get("startSha"),
+                "head_sha": diff_refs.get("headSha"),
+                "old_path": position.get("oldPath") or position.get("filePath"),
+                "new_path": position.get("newPath") or position.get("filePath"),
+                "position_type": (position.get("positionType") or "text").lower(),
+                "old_line": position.get("oldLine"),
+                "new_line": position.get("newLine"),
+            }
+        return rest_note
+    
+    @classmethod
+    def _to_rest_discussion(
+        cls,
+        discussion: Dict[str, Any],
+        project_id: int,
+        mr: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Convert a discussion node to the REST discussion shape.
+        
+        GraphQL has no ``individual_note`` flag; a discussion counts as an
+        individual note when it is a single, non-resolvable note, which is
+        how GitLab renders standalone comments.
+        """
+        notes = (discussion.get("notes") or {}).get("nodes") or []
+        individual = len(notes) == 1 and not discussion.get("resolvable")
+        note_type = None if individual else "DiscussionNote"
+        return {
+            "id": str(discussion.get("id", "")).rsplit('/', 1)[-1],
+            "individual_note": individual,
+            "notes": [
+                cls._to_rest_note(note, project_id, "MergeRequest", mr, note_type)
+                for note in notes
+            ],
+        }
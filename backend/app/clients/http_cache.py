@@ -0,0 +1,202 @@
+"""On-disk conditional-request cache for GitLab GET endpoints"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import httpx
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Response headers worth replaying with a cached body (pagination and type)
+CACHED_HEADERS = (
+    'content-type',
+    'etag',
+    'last-modified',
+    'link',
+    'x-next-page',
+    'x-page',
+    'x-per-page',
+    'x-prev-page',
+    'x-total',
+    'x-total-pages',
+)
+
+
+def default_cache_root() -> Path:
+    """Default cache root shared across runs: ``<ARTIFACTS_ROOT>/cache/http``"""
+    from app.config import settings
+    return Path(settings.ARTIFACTS_ROOT) / "cache" / "http"
+
+
+class HttpCache:
+    """
+    Size-bounded LRU cache of GET responses keyed by URL and query parameters.
+
+    Entries store the validators GitLab returned (``ETag``/``Last-Modified``)
+    so repeat requests can be sent conditionally; a ``304 Not Modified`` is then
+    answered from disk. Each connection gets its own directory (derived from
+    the instance URL and token) so cached bodies never leak between users with
+    different permissions. Recency is kept in memory (seeded from file
+    modification times, which hits also refresh for the next run). Once
+    ``max_bytes`` is exceeded, the least recently used entries are evicted
+    down to ``low_water`` of the bound, so steady-state writes don't evict
+    on every store.
+
+    The methods do blocking file I/O and are safe to call from worker
+    threads (``asyncio.to_thread``); the bookkeeping is lock-guarded.
+    """
+
+    def __init__(
+        self,
+        cache_root: Path,
+        base_url: str,
+        token: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        low_water: float = 0.9
+    ):
+        """
+        Initialize HTTP cache.
+
+        Args:
+            cache_root: Root directory shared by all connections
+            base_url: GitLab instance URL
+            token: Access token (hashed, never stored)
+            max_bytes: Maximum on-disk size for this connection
+            low_water: Fraction of ``max_bytes`` eviction brings the cache down to
+        """
+        connection_id = hashlib.sha256(f"{base_url}\0{token}".encode()).hexdigest()[:16]
+        self.cache_dir = Path(cache_root) / connection_id
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.low_water_bytes = int(max_bytes * low_water)
+        self._lock = threading.Lock()
+        # Key -> size, least recently used first
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        stats = [(entry.stem, entry.stat()) for entry in self.cache_dir.glob('*.json')]
+        for key, stat in sorted(stats, key=lambda item: item[1].st_mtime):
+            self._sizes[key] = stat.st_size
+        self.total_bytes = sum(self._sizes.values())
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build a stable cache key from the request line and parameters"""
+        normalized = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        raw = json.dumps([method.upper(), url, normalized])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached entry and mark it as recently used.
+
+        Returns:
+            Cached entry, or None if absent or unreadable
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            os.utime(path)
+            with self._lock:
+                if key in self._sizes:
+                    self._sizes.move_to_end(key)
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            self._remove(key)
+            return None
+
+    def conditional_headers(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """Headers that make a request conditional on the cached validators"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, key: str, response: httpx.Response):
+        """Store a successful response if it carries a validator"""
+        etag = response.headers.get('etag')
+        last_modified = response.headers.get('last-modified')
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': {
+                name: response.headers[name]
+                for name in CACHED_HEADERS
+                if name in response.headers
+            },
+            'body': base64.b64encode(response.content).decode('ascii')
+        }
+
+        path = self._path(key)
+        # Per-thread temp file: the same key may be stored concurrently
+        temp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        data = json.dumps(entry).encode()
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            temp_path.replace(path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache entry {key}: {e}")
+            return
+
+        size = len(data)
+        with self._lock:
+            self.total_bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+            self._sizes.move_to_end(key)
+            evicted = self._evict()
+        for old_key in evicted:
+            self._unlink(old_key)
+
+    def build_response(self, entry: Dict[str, Any], request: httpx.Request) -> httpx.Response:
+        """Rebuild a 200 response from a cached entry"""
+        return httpx.Response(
+            200,
+            headers=entry.get('headers', {}),
+            content=base64.b64decode(entry['body']),
+            request=request
+        )
+
+    def _unlink(self, key: str):
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _remove(self, key: str):
+        self._unlink(key)
+        with self._lock:
+            self.total_bytes -= self._sizes.pop(key, 0)
+
+    def _evict(self) -> List[str]:
+        """
+        Drop least recently used entries from the bookkeeping (lock held).
+
+        Returns:
+            Keys whose files the caller should delete
+        """
+        if self.total_bytes <= self.max_bytes:
+            return []
+
+        evicted = []
+        while self._sizes and self.total_bytes > self.low_water_bytes:
+            key, size = self._sizes.popitem(last=False)
+            self.total_bytes -= size
+            evicted.append(key)
+        return evicted
@@ -0,0 +1,413 @@
+"""Git LFS batch API client for moving LFS objects without a working clone"""
+
+import asyncio
+import hashlib
+import re
+import urllib.parse
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+import httpx
+from app.utils.git_runner import GitRunner, git_runner
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+LFS_MEDIA_TYPE = "application/vnd.git-lfs+json"
+
+# Pointer files are at most a few hundred bytes; the spec caps them at 1024
+MAX_POINTER_SIZE = 1024
+POINTER_PATTERN = re.compile(
+    rb'^version https://git-lfs\.github\.com/spec/v1\n'
+    rb'(?:[a-z0-9.-]+ .*\n)*?'
+    rb'oid sha256:(?P<oid>[0-9a-f]{64})\n'
+    rb'size (?P<size>\d+)\n'
+)
+
+
+class LFSError(Exception):
+    """Raised when an LFS server rejects a request or an object fails verification"""
+    pass
+
+
+def lfs_endpoint(repo_url: str) -> str:
+    """LFS API root for an HTTPS git remote, e.g. ``https://host/group/project.git/info/lfs``"""
+    repo_url = repo_url.rstrip('/')
+    if not repo_url.endswith('.git'):
+        repo_url += '.git'
+    return f"{repo_url}/info/lfs"
+
+
+def object_path(root: Path, oid: str) -> Path:
+    """Location of an object in a git-lfs style store (``<root>/ab/cd/abcd...``)"""
+    return Path(root) / oid[0:2] / oid[2:4] / oid
+
+
+async def scan_lfs_pointers(repo_path: Path, runner: Optional[GitRunner] = None) -> List[Dict[str, Any]]:
+    """
+    List the LFS objects referenced anywhere in a repository's history.
+
+    Reads pointer blobs straight from the object database, so it works on a
+    bare mirror and doesn't need git-lfs installed. Sizes are exact, as the
+    batch API requires.
+
+    Args:
+        repo_path: Repository (bare or not)
+        runner: Git runner (default: the shared ``git_runner``)
+
+    Returns:
+        One ``{"oid", "size", "path"}`` dict per distinct object
+    """
+    runner = runner or git_runner
+
+    result = await runner.run(['git', 'rev-list', '--objects', '--all'], cwd=repo_path)
+    paths: Dict[str, str] = {}
+    for line in result.stdout.splitlines():
+        sha, _, path = line.partition(' ')
+        if path and sha not in paths:
+            paths[sha] = path
+    if not paths:
+        return []
+
+    result = await runner.run(
+        ['git', 'cat-file', '--batch-check=%(objectname) %(objecttype) %(objectsize)'],
+        cwd=repo_path,
+        input='\n'.join(paths) + '\n'
+    )
+    candidates = []
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[1] == 'blob' and int(parts[2]) <= MAX_POINTER_SIZE:
+            candidates.append(parts[0])
+    if not candidates:
+        return []
+
+    result = await runner.run(
+        ['git', 'cat-file', '--batch'],
+        cwd=repo_path,
+        input='\n'.join(candidates) + '\n',
+        text=False
+    )
+    data = result.stdout
+    objects: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    while offset < len(data):
+        header_end = data.index(b'\n', offset)
+        sha, _, size = data[offset:header_end].decode().split(' ')
+        content = data[header_end + 1:header_end + 1 + int(size)]
+        offset = header_end + 1 + int(size) + 1
+        match = POINTER_PATTERN.match(content)
+        if match:
+            oid = match.group('oid').decode()
+            objects.setdefault(oid, {"oid": oid, "size": int(match.group('size')), "path": paths[sha]})
+    return list(objects.values())
+
+
+class LFSBatchClient:
+    """
+    Client for one repository's Git LFS batch API.
+
+    Objects are negotiated in batches of ``batch_size`` and transferred with
+    up to ``concurrency`` requests at once. Downloads are written to a
+    temporary file, verified against their OID (SHA-256) and size, and moved
+    into a git-lfs style store; objects already in the store are skipped.
+    Uploads are verified locally before they are sent, and objects the
+    server reports it already has (no ``upload`` action) are skipped.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        username: str,
+        token: str,
+        concurrency: int = 8,
+        batch_size: int = 100,
+        timeout: float = 300.0,
+        max_attempts: int = 3
+    ):
+        """
+        Initialize LFS client.
+
+        Args:
+            endpoint: LFS API root (see ``lfs_endpoint``)
+            username: Basic auth user, e.g. ``oauth2`` or ``x-access-token``
+            token: Access token
+            concurrency: Transfers running at once
+            batch_size: Objects per batch request
+            timeout: Request timeout in seconds
+            max_attempts: Attempts per transfer on network errors and 5xx
+        """
+        self.endpoint = endpoint.rstrip('/')
+        self.auth = httpx.BasicAuth(username, token)
+        self.batch_size = max(1, batch_size)
+        self.max_attempts = max(1, max_attempts)
+        self._concurrency = max(1, concurrency)
+        self.client = httpx.AsyncClient(timeout=timeout, follow_redirects=True)
+
+    async def close(self):
+        """Close HTTP client"""
+        await self.client.aclose()
+
+    async def batch(self, operation: str, objects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Negotiate transfers with the batch endpoint.
+
+        Args:
+            operation: ``download`` or ``upload``
+            objects: Dicts with ``oid`` and ``size``
+
+        Returns:
+            Object entries of the responses, with their ``actions`` or ``error``
+
+        Raises:
+            LFSError: If the server rejects a batch request
+        """
+        results = []
+        for start in range(0, len(objects), self.batch_size):
+            chunk = objects[start:start + self.batch_size]
+            response = await self._send(
+                'POST',
+                f"{self.endpoint}/objects/batch",
+                json={
+                    "operation": operation,
+                    "transfers": ["basic"],
+                    "objects": [{"oid": obj["oid"], "size": obj["size"]} for obj in chunk]
+                },
+                headers={"Accept": LFS_MEDIA_TYPE, "Content-Type": LFS_MEDIA_TYPE},
+                auth=self.auth
+            )
+            if response.status_code >= 400:
+                raise LFSError(f"LFS batch {operation} failed: HTTP {response.status_code} {_error_message(response)}")
+            results.extend(response.json().get("objects", []))
+        return results
+
+    async def download(self, objects: List[Dict[str, Any]], store: Path) -> Dict[str, int]:
+        """
+        Download objects into ``store``.
+
+        Args:
+            objects: Dicts with ``oid`` and ``size``
+            store: git-lfs style object directory
+
+        Returns:
+            Counts of ``downloaded`` and ``skipped`` (already stored) objects
+
+        Raises:
+            LFSError: If an object is missing on the server or fails verification
+        """
+        pending = [obj for obj in objects if not _is_stored(store, obj)]
+        stats = {"downloaded": 0, "skipped": len(objects) - len(pending)}
+        if not pending:
+            return stats
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def transfer(entry: Dict[str, Any]):
+            action = _action(entry, "download")
+            async with semaphore:
+                await self._download_object(entry, action, store)
+            stats["downloaded"] += 1
+
+        await _gather_all(transfer(entry) for entry in await self.batch("download", pending))
+        return stats
+
+    async def upload(self, objects: List[Dict[str, Any]], store: Path) -> Dict[str, int]:
+        """
+        Upload objects from ``store``.
+
+        Args:
+            objects: Dicts with ``oid`` and ``size``
+            store: git-lfs style object directory holding the objects
+
+        Returns:
+            Counts of ``uploaded`` and ``skipped`` (already on the server) objects
+
+        Raises:
+            LFSError: If a local object is missing or corrupt, or the server rejects it
+        """
+        for obj in objects:
+            if not object_path(store, obj["oid"]).exists():
+                raise LFSError(f"LFS object {obj['oid']} is missing from {store}")
+
+        stats = {"uploaded": 0, "skipped": 0}
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def transfer(entry: Dict[str, Any]):
+            if entry.get("error"):
+                raise LFSError(f"LFS object {entry.get('oid')}: {entry['error'].get('message', entry['error'])}")
+            actions = entry.get("actions") or {}
+            if "upload" not in actions:
+                stats["skipped"] += 1
+                return
+            async with semaphore:
+                await self._upload_object(entry, actions, store)
+            stats["uploaded"] += 1
+
+        await _gather_all(transfer(entry) for entry in await self.batch("upload", objects))
+        return stats
+
+    async def _download_object(self, entry: Dict[str, Any], action: Dict[str, Any], store: Path):
+        """Stream one object to a temporary file, verify it and move it into the store"""
+        oid, size = entry["oid"], entry["size"]
+        destination = object_path(store, oid)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = destination.with_name(destination.name + ".part")
+
+        for attempt in range(1, self.max_attempts + 1):
+            digest = hashlib.sha256()
+            written = 0
+            try:
+                async with self.client.stream(
+                    'GET',
+                    action["href"],
+                    headers=action.get("header", {}),
+                    auth=self._auth_for(action)
+                ) as response:
+                    if response.status_code >= 500 and attempt < self.max_attempts:
+                        await asyncio.sleep(2 ** attempt)
+                        continue
+                    if response.status_code >= 400:
+                        raise LFSError(f"Downloading LFS object {oid} failed: HTTP {response.status_code}")
+                    with open(temp_path, 'wb') as f:
+                        async for block in response.aiter_bytes(1024 * 1024):
+                            digest.update(block)
+                            written += len(block)
+                            f.write(block)
+            except httpx.TransportError:
+                if attempt == self.max_attempts:
+                    temp_path.unlink(missing_ok=True)
+                    raise
+                await asyncio.sleep(2 ** attempt)
+                continue
+            break
+
+        if written != size or digest.hexdigest() != oid:
+            temp_path.unlink(missing_ok=True)
+            raise LFSError(f"LFS object {oid} failed verification ({written} of {size} bytes)")
+        temp_path.replace(destination)
+
+    async def _upload_object(self, entry: Dict[str, Any], actions: Dict[str, Any], store: Path):
+        """Verify one stored object, PUT it and call the verify action if the server asks for it"""
+        oid, size = entry["oid"], entry["size"]
+        source = object_path(store, oid)
+        if await asyncio.to_thread(_file_digest, source) != (oid, size):
+            raise LFSError(f"Local LFS object {oid} is corrupt")
+
+        upload = actions["upload"]
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = await self.client.put(
+                    upload["href"],
+                    content=_read_chunks(source),
+                    headers={
+                        "Content-Type": "application/octet-stream",
+                        "Content-Length": str(size),
+                        **upload.get("header", {})
+                    },
+                    auth=self._auth_for(upload)
+                )
+            except httpx.TransportError:
+                if attempt == self.max_attempts:
+                    raise
+                await asyncio.sleep(2 ** attempt)
+                continue
+            if response.status_code >= 500 and attempt < self.max_attempts:
+                await asyncio.sleep(2 ** attempt)
+                continue
+            if response.status_code >= 400:
+                raise LFSError(f"Uploading LFS object {oid} failed: HTTP {response.status_code}")
+            break
+
+        verify = actions.get("verify")
+        if verify:
+            response = await self._send(
+                'POST',
+                verify["href"],
+                json={"oid": oid, "size": size},
+                headers={"Accept": LFS_MEDIA_TYPE, "Content-Type": LFS_MEDIA_TYPE, **verify.get("header", {})},
+                auth=self._auth_for(verify)
+            )
+            if response.status_code >= 400:
+                raise LFSError(f"Verifying LFS object {oid} failed: HTTP {response.status_code}")
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a small request, retrying network errors and 5xx responses"""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                if attempt == self.max_attempts:
+                    raise
+            else:
+                if response.status_code < 500 or attempt == self.max_attempts:
+                    return response
+            await asyncio.sleep(2 ** attempt)
+
+    def _auth_for(self, action: Dict[str, Any]) -> Optional[httpx.BasicAuth]:
+        """
+        Credentials for a transfer action.
+
+        Actions usually carry their own ``Authorization`` header; presigned
+        storage URLs on other hosts must not receive ours.
+        """
+        headers = {key.lower() for key in action.get("header", {})}
+        if "authorization" in headers:
+            return None
+        same_host = urllib.parse.urlsplit(action["href"]).netloc == urllib.parse.urlsplit(self.endpoint).netloc
+        return self.auth if same_host else None
+
+
+def _action(entry: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """The named action of a batch response entry"""
+    if entry.get("error"):
+        raise LFSError(f"LFS object {entry.get('oid')}: {entry['error'].get('message', entry['error'])}")
+    action = (entry.get("actions") or {}).get(name)
+    if not action:
+        raise LFSError(f"LFS server returned no {name} action for {entry.get('oid')}")
+    return action
+
+
+def _is_stored(store: Path, obj: Dict[str, Any]) -> bool:
+    """Whether ``store`` already holds an object of the expected size"""
+    path = object_path(store, obj["oid"])
+    return path.exists() and path.stat().st_size == obj["size"]
+
+
+def _file_digest(path: Path):
+    """SHA-256 and size of a file"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+            size += len(block)
+    return digest.hexdigest(), size
+
+
+async def _read_chunks(path: Path, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    """Stream a file without blocking the event loop"""
+    with open(path, 'rb') as f:
+        while True:
+            block = await asyncio.to_thread(f.read, chunk_size)
+            if not block:
+                return
+            yield block
+
+
+def _error_message(response: httpx.Response) -> str:
+    """Message of an LFS error response"""
+    try:
+        return response.json().get("message", "")
+    except ValueError:
+        return response.text[:200]
+
+
+async def _gather_all(coroutines):
+    """Run transfers concurrently; on the first failure cancel the rest and re-raise"""
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
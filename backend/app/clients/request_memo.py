@@ -0,0 +1,111 @@
+"""Request coalescing and short-lived memoization for API clients"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Seconds a memoized result stays valid by default: long enough for discovery
+# and export of the same run to share their reads
+DEFAULT_MEMO_TTL = 900
+
+
+class RequestMemo:
+    """
+    Singleflight + TTL memo for idempotent requests.
+
+    Concurrent callers asking for the same key share one in-flight fetch
+    instead of each hitting the API, and callers arriving within ``ttl``
+    seconds of a successful fetch get the memoized result. Failures are
+    shared with the callers that were waiting on them but never memoized.
+
+    A memo is meant to live for one migration run: create it when the run
+    starts and hand it to every client the run creates, so discovery and
+    export reuse each other's reads.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_MEMO_TTL, max_entries: int = 4096):
+        """
+        Initialize request memo.
+
+        Args:
+            ttl: Seconds a result stays valid (0 = coalesce only, no memo)
+            max_entries: Most recently used results kept
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"hits": 0, "coalesced": 0, "misses": 0}
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the memoized result for ``key`` or fetch it once.
+
+        Args:
+            key: Request identity (see ``make_key``)
+            fetch: Coroutine factory performing the actual request
+
+        Returns:
+            The shared result
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return result
+            del self._entries[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # The leading caller was cancelled, not us: fetch ourselves
+                if inflight.cancelled():
+                    return await self.get_or_fetch(key, fetch)
+                raise
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark as retrieved so a failure nobody waited on isn't logged
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        if self.ttl > 0:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        future.set_result(result)
+        return result
+
+    @staticmethod
+    def make_key(scope: str, method: str, url: str, params: Optional[Dict[str, Any]] = None) -> Tuple:
+        """
+        Build a memo key from the request identity.
+
+        Args:
+            scope: Connection identifier, so one memo can serve several tokens
+            method: HTTP method
+            url: Absolute request URL
+            params: Query parameters
+        """
+        normalized = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return (scope, method.upper(), url, normalized)
+
+    def clear(self):
+        """Drop all memoized results (in-flight requests are unaffected)"""
+        self._entries.clear()
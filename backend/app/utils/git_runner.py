@@ -0,0 +1,217 @@
+"""Non-blocking git subprocess runner"""
+
+import asyncio
+import os
+import re
+import signal
+import subprocess
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+# "Receiving objects:  45% (450/1000), 1.20 MiB | 2.00 MiB/s"
+PROGRESS_PATTERN = re.compile(
+    r'^(?:remote: )?(?P<phase>[A-Za-z][A-Za-z ]+?):\s+(?P<percent>\d{1,3})% \((?P<current>\d+)/(?P<total>\d+)\)'
+)
+
+ProgressCallback = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+def parse_progress(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse one ``--progress`` line of git.
+
+    Args:
+        line: A stderr line (git separates updates with ``\\r``)
+
+    Returns:
+        ``{"phase", "percent", "current", "total"}`` or None for other output
+    """
+    match = PROGRESS_PATTERN.match(line.strip())
+    if not match:
+        return None
+    return {
+        "phase": match.group("phase").strip(),
+        "percent": int(match.group("percent")),
+        "current": int(match.group("current")),
+        "total": int(match.group("total")),
+    }
+
+
+class GitRunner:
+    """
+    Run git commands without blocking the event loop.
+
+    Commands run through ``asyncio.create_subprocess_exec`` with at most
+    ``max_concurrency`` processes at once. Results and failures mirror
+    ``subprocess.run(..., check=True, capture_output=True, text=True)``:
+    a ``subprocess.CompletedProcess`` is returned, a non-zero exit raises
+    ``subprocess.CalledProcessError`` and an expired timeout raises
+    ``subprocess.TimeoutExpired``, so existing error handling keeps working.
+    Timed-out and cancelled commands are killed.
+
+    When ``progress`` is given, git's ``--progress`` output is parsed and the
+    callback receives an event whenever the phase changes or the percentage
+    advances by ``progress_step``.
+    """
+
+    def __init__(self, max_concurrency: int = 4):
+        """
+        Initialize git runner.
+
+        Args:
+            max_concurrency: Git processes allowed to run at once
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limit bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(
+        self,
+        args: Sequence[str],
+        cwd: Optional[Union[str, os.PathLike]] = None,
+        timeout: Optional[float] = None,
+        check: bool = True,
+        env: Optional[Dict[str, str]] = None,
+        progress: Optional[ProgressCallback] = None,
+        progress_step: int = 10,
+        input: Optional[Union[str, bytes]] = None,
+        text: bool = True
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a command and capture its output.
+
+        Args:
+            args: Command and arguments, e.g. ``['git', 'clone', ...]``
+            cwd: Working directory
+            timeout: Seconds before the process is killed (None = no limit)
+            check: Raise ``CalledProcessError`` on a non-zero exit
+            env: Extra environment variables (merged into ``os.environ``)
+            progress: Callback (sync or async) for parsed progress events
+            progress_step: Minimum percentage change between events
+            input: Data written to the command's stdin
+            text: Decode ``stdout`` (``stderr`` is always decoded)
+
+        Returns:
+            CompletedProcess with ``stdout`` and ``stderr``
+
+        Raises:
+            subprocess.CalledProcessError: If ``check`` and the exit is non-zero
+            subprocess.TimeoutExpired: If the timeout expired
+        """
+        args = [str(arg) for arg in args]
+        async with self._get_semaphore():
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                cwd=str(cwd) if cwd is not None else None,
+                env={**os.environ, **env} if env else None,
+                stdin=subprocess.DEVNULL if input is None else asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True
+            )
+            try:
+                _, stdout, stderr = await asyncio.wait_for(
+                    asyncio.gather(
+                        self._write_stdin(process.stdin, input),
+                        process.stdout.read(),
+                        self._read_stderr(process.stderr, progress, progress_step)
+                    ),
+                    timeout
+                )
+                returncode = await process.wait()
+            except asyncio.TimeoutError:
+                await self._kill(process)
+                raise subprocess.TimeoutExpired(args, timeout)
+            except asyncio.CancelledError:
+                await self._kill(process)
+                raise
+
+        result = subprocess.CompletedProcess(
+            args,
+            returncode,
+            stdout.decode('utf-8', errors='replace') if text else stdout,
+            stderr.decode('utf-8', errors='replace')
+        )
+        if check and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, args, output=result.stdout, stderr=result.stderr)
+        return result
+
+    @staticmethod
+    async def _write_stdin(stream: Optional[asyncio.StreamWriter], data: Optional[Union[str, bytes]]):
+        """Feed ``data`` to the process and close its stdin"""
+        if stream is None:
+            return
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        try:
+            stream.write(data)
+            await stream.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The process exited without reading everything
+        finally:
+            stream.close()
+
+    async def _read_stderr(
+        self,
+        stream: asyncio.StreamReader,
+        progress: Optional[ProgressCallback],
+        progress_step: int
+    ) -> bytes:
+        """Collect stderr, emitting progress events for ``\\r``/``\\n`` separated updates"""
+        captured = bytearray()
+        pending = b''
+        last: Dict[str, Any] = {}
+
+        while True:
+            chunk = await stream.read(4096)
+            if not chunk:
+                break
+            captured.extend(chunk)
+            if progress is None:
+                continue
+
+            pending += chunk
+            *lines, pending = re.split(rb'[\r\n]', pending)
+            for raw in lines:
+                event = parse_progress(raw.decode('utf-8', errors='replace'))
+                if event is None:
+                    continue
+                changed_phase = event["phase"] != last.get("phase")
+                advanced = event["percent"] - last.get("percent", 0) >= progress_step
+                if changed_phase or advanced or (event["percent"] == 100 and last.get("percent") != 100):
+                    last = event
+                    outcome = progress(event)
+                    if asyncio.iscoroutine(outcome):
+                        await outcome
+
+        return bytes(captured)
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process):
+        """Kill a process and the helpers it spawned (git-remote-https, ...)"""
+        if process.returncode is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError, AttributeError):
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        await process.wait()
+
+
+# Shared by every agent and action in the process so the limit is global
+git_runner = GitRunner()
+
+
+async def run_git(args: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """Run a command with the shared ``git_runner`` (see ``GitRunner.run``)"""
+    return await git_runner.run(args, **kwargs)
@@ -0,0 +1,186 @@
+"""Incremental JSON writers for exports too large to build in memory"""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterator, Union
+
+
+class JsonArrayWriter:
+    """
+    Write a JSON array one element at a time.
+
+    Output is byte-identical to ``json.dump(items, f, indent=indent)``, but
+    only the element being written has to be in memory. The array is written
+    to a temporary file and moved into place when the ``with`` block exits
+    cleanly, so a failed export never leaves a truncated file behind.
+
+    Example:
+        with JsonArrayWriter(path) as writer:
+            async for issue in client.iter_issues(project_id):
+                writer.write(issue)
+    """
+
+    def __init__(self, path: Union[str, Path], indent: int = 2):
+        self.path = Path(path)
+        self.indent = indent
+        self.count = 0
+        self._temp_path = self.path.with_name(f"{self.path.name}.tmp")
+        self._file = None
+
+    def __enter__(self) -> "JsonArrayWriter":
+        self._file = open(self._temp_path, 'w')
+        self._file.write('[')
+        return self
+
+    def write(self, item: Any):
+        """Append one element to the array"""
+        pad = ' ' * self.indent
+        text = json.dumps(item, indent=self.indent)
+        self._file.write(',\n' if self.count else '\n')
+        self._file.write('\n'.join(pad + line for line in text.split('\n')))
+        self.count += 1
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self._file.close()
+            self._temp_path.unlink(missing_ok=True)
+            return False
+        self._file.write('\n]' if self.count else ']')
+        self._file.close()
+        self._temp_path.replace(self.path)
+        return False
+
+
+class NdjsonWriter:
+    """
+    Durable append-only JSON Lines file.
+    
+    Every item is appended as one line as soon as it is written, and the
+    file is fsynced every ``fsync_every`` items and on close, so a crash
+    loses at most the last unsynced batch. Opened with ``resume=True``, an
+    existing file is kept: a torn last line left by a crash is cut off, and
+    ``count``/``last_item`` describe what survived so the caller can
+    continue right after it.
+    
+    From a coroutine, use ``async with`` and ``awrite``: recovery, the
+    batched fsyncs and the final sync then run in a worker thread instead of
+    stalling the event loop.
+    
+    Example:
+        async with NdjsonWriter(path, resume=True) as writer:
+            after = writer.last_item["iid"] if writer.last_item else None
+            ...
+            await writer.awrite(issue)
+    """
+    
+    def __init__(self, path: Union[str, Path], fsync_every: int = 50, resume: bool = False):
+        self.path = Path(path)
+        self.fsync_every = max(1, fsync_every)
+        self.resume = resume
+        self.count = 0
+        self.last_item: Any = None
+        self._unsynced = 0
+        self._file = None
+    
+    def __enter__(self) -> "NdjsonWriter":
+        if self.resume and self.path.exists():
+            self._recover()
+            self._file = open(self.path, 'ab')
+        else:
+            self._file = open(self.path, 'wb')
+        return self
+    
+    def _recover(self):
+        """Drop a torn trailing line, then count lines and read the last one"""
+        with open(self.path, 'r+b') as f:
+            size = f.seek(0, os.SEEK_END)
+            end = self._last_newline_end(f, size)
+            if end < size:
+                f.truncate(end)
+            
+            f.seek(0)
+            last_line = b''
+            for line in f:
+                self.count += 1
+                last_line = line
+        
+        if last_line:
+            self.last_item = json.loads(last_line)
+    
+    @staticmethod
+    def _last_newline_end(f, size: int, block: int = 64 * 1024) -> int:
+        """Offset just past the last newline (0 if there is none)"""
+        position = size
+        while position > 0:
+            start = max(0, position - block)
+            f.seek(start)
+            chunk = f.read(position - start)
+            index = chunk.rfind(b'\n')
+            if index != -1:
+                return start + index + 1
+            position = start
+        return 0
+    
+    def _append(self, item: Any) -> bool:
+        """Append one item; True when a batch is due for fsync"""
+        self._file.write(json.dumps(item).encode() + b'\n')
+        self.count += 1
+        self.last_item = item
+        self._unsynced += 1
+        return self._unsynced >= self.fsync_every
+    
+    def write(self, item: Any):
+        """Append one item"""
+        if self._append(item):
+            self.sync()
+    
+    async def awrite(self, item: Any):
+        """Append one item, syncing a due batch in a worker thread"""
+        if self._append(item):
+            await asyncio.to_thread(self.sync)
+    
+    def sync(self):
+        """Flush appended items to stable storage"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # Keep whatever was written, also on failure: that's what resume uses
+        self.sync()
+        self._file.close()
+        return False
+    
+    async def __aenter__(self) -> "NdjsonWriter":
+        return await asyncio.to_thread(self.__enter__)
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return await asyncio.to_thread(self.__exit__, exc_type, exc_val, exc_tb)
+
+
+def iter_ndjson(path: Union[str, Path]) -> Iterator[Any]:
+    """Iterate the items of a JSON Lines file"""
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def ndjson_to_json_array(source: Union[str, Path], destination: Union[str, Path], indent: int = 2) -> int:
+    """
+    Convert a JSON Lines file to a JSON array file, one item at a time.
+    
+    Args:
+        source: JSON Lines file
+        destination: JSON array file to write (replaced atomically)
+        indent: Indentation of the array output
+        
+    Returns:
+        Number of items converted
+    """
+    with JsonArrayWriter(destination, indent=indent) as writer:
+        for item in iter_ndjson(source):
+            writer.write(item)
+    return writer.count
@@ -0,0 +1,206 @@
+"""Persistent bare-mirror cache for git exports"""
+
+import asyncio
+import base64
+import hashlib
+import shutil
+import subprocess
+import urllib.parse
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+from app.utils.git_runner import GitRunner, ProgressCallback, git_runner
+from app.utils.logging import get_logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = get_logger(__name__)
+
+# In-process locks per mirror path, shared by every cache instance
+_mirror_locks: Dict[Path, asyncio.Lock] = {}
+
+# Applied to every mirror: protocol v2 ref filtering, commit-graph and bitmap
+# upkeep so fetches and ``bundle create`` stay fast as the mirror ages, and
+# foreground auto-gc so a background repack never races a bundle.
+MIRROR_CONFIG = {
+    "protocol.version": "2",
+    "fetch.writeCommitGraph": "true",
+    "gc.writeCommitGraph": "true",
+    "gc.autoDetach": "false",
+    "repack.writeBitmaps": "true",
+    "pack.writeBitmapHashCache": "true",
+    "pack.useBitmaps": "true",
+    "pack.threads": "0",
+    "core.deltaBaseCacheLimit": "256m",
+}
+
+
+def default_mirror_root() -> Path:
+    """Default cache shared across runs: ``<ARTIFACTS_ROOT>/cache/mirrors``"""
+    from app.config import settings
+    return Path(settings.ARTIFACTS_ROOT) / "cache" / "mirrors"
+
+
+def strip_credentials(url: str) -> str:
+    """Remove any ``user:password@`` part from a URL"""
+    parts = urllib.parse.urlsplit(url)
+    if "@" not in parts.netloc:
+        return url
+    return urllib.parse.urlunsplit(parts._replace(netloc=parts.netloc.rsplit("@", 1)[1]))
+
+
+def auth_env(token: Optional[str], username: str = "oauth2") -> Optional[Dict[str, str]]:
+    """
+    Environment that authenticates git HTTP requests with a token.
+
+    The credentials travel as an ``http.extraHeader`` set through
+    ``GIT_CONFIG_*`` variables, so they never appear in the mirror's config,
+    in remote URLs or in the process list.
+    """
+    if not token:
+        return None
+    credentials = base64.b64encode(f"{username}:{token}".encode()).decode()
+    return {
+        "GIT_CONFIG_COUNT": "1",
+        "GIT_CONFIG_KEY_0": "http.extraHeader",
+        "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials}",
+        "GIT_TERMINAL_PROMPT": "0",
+    }
+
+
+class MirrorCache:
+    """
+    Per-remote bare mirrors kept between exports.
+
+    The first export of a remote clones it with ``git clone --mirror``; later
+    exports only run ``git remote update --prune`` against the existing
+    mirror, so a re-export transfers just the new objects. Clones go to a
+    temporary directory and are renamed into place when complete, so an
+    interrupted clone never leaves a half-populated mirror behind. A mirror
+    whose update fails is discarded and cloned again.
+
+    ``mirror`` holds an exclusive lock (per process and, where ``fcntl`` is
+    available, across processes) while the caller reads the mirror, so a
+    concurrent export of the same project can't prune refs mid-bundle.
+    """
+
+    def __init__(self, root: Path, runner: Optional[GitRunner] = None):
+        """
+        Initialize mirror cache.
+
+        Args:
+            root: Cache directory
+            runner: Git runner (default: the shared ``git_runner``)
+        """
+        self.root = Path(root)
+        self.runner = runner or git_runner
+
+    def path_for(self, url: str) -> Path:
+        """Mirror directory for a remote URL (credentials are ignored)"""
+        url = strip_credentials(url)
+        digest = hashlib.sha256(url.encode()).hexdigest()[:16]
+        slug = url.rstrip("/").rsplit("/", 1)[-1].removesuffix(".git") or "repo"
+        return self.root / f"{slug}-{digest}.git"
+
+    @asynccontextmanager
+    async def mirror(
+        self,
+        url: str,
+        token: Optional[str] = None,
+        timeout: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> AsyncIterator[Path]:
+        """
+        Bring the mirror of ``url`` up to date and hold it for reading.
+
+        Args:
+            url: Remote URL without credentials
+            token: Access token for the remote
+            timeout: Seconds allowed for the clone or update
+            progress: Callback for clone progress events
+
+        Yields:
+            Path of the bare mirror
+
+        Raises:
+            subprocess.CalledProcessError: If the remote can't be cloned
+            subprocess.TimeoutExpired: If the clone or update timed out
+        """
+        url = strip_credentials(url)
+        path = self.path_for(url)
+        lock = _mirror_locks.setdefault(path, asyncio.Lock())
+        async with lock:
+            lock_file = await asyncio.to_thread(self._acquire_file_lock, path)
+            try:
+                await self._sync(path, url, auth_env(token), timeout, progress)
+                yield path
+            finally:
+                if lock_file is not None:
+                    lock_file.close()
+
+    def _acquire_file_lock(self, path: Path):
+        """Block until the cross-process lock for ``path`` is held"""
+        if fcntl is None:
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(path.with_name(path.name + ".lock"), "w")
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    async def _sync(
+        self,
+        path: Path,
+        url: str,
+        env: Optional[Dict[str, str]],
+        timeout: Optional[float],
+        progress: Optional[ProgressCallback]
+    ):
+        """Update an existing mirror, or clone it if missing or broken"""
+        if (path / "HEAD").exists():
+            try:
+                await self.runner.run(["git", "remote", "set-url", "origin", url], cwd=path, timeout=30)
+                await self.runner.run(
+                    ["git", "remote", "update", "--prune"],
+                    cwd=path,
+                    env=env,
+                    timeout=timeout
+                )
+                logger.info(f"Updated cached mirror {path.name}")
+                return
+            except subprocess.CalledProcessError as e:
+                logger.warning(f"Updating mirror {path.name} failed (exit {e.returncode}), cloning again")
+
+        await self._clone(path, url, env, timeout, progress)
+
+    async def _clone(
+        self,
+        path: Path,
+        url: str,
+        env: Optional[Dict[str, str]],
+        timeout: Optional[float],
+        progress: Optional[ProgressCallback]
+    ):
+        """Clone a fresh mirror next to ``path`` and move it into place"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            await self.runner.run(
+                ["git", "-c", "protocol.version=2", "clone", "--mirror", "--progress", url, str(temp_path)],
+                env=env,
+                timeout=timeout,
+                progress=progress
+            )
+            for key, value in MIRROR_CONFIG.items():
+                await self.runner.run(["git", "config", key, value], cwd=temp_path, timeout=30)
+
+            if path.exists():
+                shutil.rmtree(path, ignore_errors=True)
+            temp_path.rename(path)
+            logger.info(f"Created cached mirror {path.name}")
+        finally:
+            if temp_path.exists():
+                shutil.rmtree(temp_path, ignore_errors=True)
@@ -0,0 +1,95 @@
+"""Bounded-concurrency async pipelines"""
+
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Marks the end of the source in the work and order queues
+_DONE = object()
+
+
+async def ordered_map(
+    source: AsyncIterable[T],
+    func: Callable[[T], Awaitable[R]],
+    workers: int = 4,
+    buffer: Optional[int] = None
+) -> AsyncIterator[R]:
+    """
+    Apply ``func`` to every item of ``source`` concurrently, in source order.
+
+    A producer task reads ``source`` into a work queue consumed by
+    ``workers`` worker tasks. Results are yielded in the order the items were
+    produced, so callers can checkpoint "everything up to item N is done"
+    exactly as with a sequential loop. The producer stays at most ``buffer``
+    items (default: twice the worker count) ahead of the consumer.
+
+    The first exception raised by the source or by ``func`` is re-raised to
+    the consumer at that item's position; remaining work is cancelled.
+
+    Args:
+        source: Items to process
+        func: Coroutine function applied to each item
+        workers: Items processed concurrently
+        buffer: Items read ahead of the consumer
+
+    Yields:
+        ``func(item)`` for each item, in source order
+    """
+    workers = max(1, workers)
+    loop = asyncio.get_running_loop()
+    work: asyncio.Queue = asyncio.Queue()
+    order: asyncio.Queue = asyncio.Queue(maxsize=max(1, buffer or workers * 2))
+
+    async def produce():
+        try:
+            async for item in source:
+                future = loop.create_future()
+                await order.put(future)
+                await work.put((item, future))
+        except Exception as e:
+            failed = loop.create_future()
+            failed.set_exception(e)
+            await order.put(failed)
+        finally:
+            for _ in range(workers):
+                work.put_nowait(_DONE)
+        await order.put(_DONE)
+
+    async def work_loop():
+        while True:
+            entry = await work.get()
+            if entry is _DONE:
+                return
+            item, future = entry
+            try:
+                result = await func(item)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    tasks = [asyncio.create_task(produce())]
+    tasks.extend(asyncio.create_task(work_loop()) for _ in range(workers))
+
+    try:
+        while True:
+            future = await order.get()
+            if future is _DONE:
+                break
+            yield await future
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Retrieve failures nobody will await so they aren't logged as lost
+        while not order.empty():
+            future = order.get_nowait()
+            if future is not _DONE:
+                if future.done() and not future.cancelled():
+                    future.exception()
+                else:
+                    future.cancel()
@@ -0,0 +1,73 @@
+"""Unit tests for the content-addressed attachment store"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.clients.attachment_store import AttachmentStore
+
+
+def make_client(contents, sizes=None):
+    """Mock client serving ``contents`` (url -> bytes)"""
+    client = MagicMock()
+
+    async def download_file(url, output_path):
+        await asyncio.sleep(0.01)
+        output_path.write_bytes(contents[url])
+        return True
+
+    client.download_file = AsyncMock(side_effect=download_file)
+    client.get_content_length = AsyncMock(side_effect=lambda url: (sizes or {}).get(url))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_download_once(tmp_path):
+    """The same upload requested concurrently is fetched once"""
+    client = make_client({"https://g/p/uploads/s1/a.png": b"image"})
+    store = AttachmentStore(tmp_path, client, max_size=1024)
+
+    blobs = await asyncio.gather(*(
+        store.fetch("https://g/p/uploads/s1/a.png", "uploads/s1/a.png") for _ in range(5)
+    ))
+
+    assert len(set(blobs)) == 1
+    assert blobs[0].read_bytes() == b"image"
+    assert client.download_file.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_identical_content_shares_a_blob_and_survives_runs(tmp_path):
+    """Different keys with the same bytes share storage; the index persists"""
+    contents = {"https://g/p/uploads/s1/a.png": b"same", "https://g/q/uploads/s2/b.png": b"same"}
+    client = make_client(contents)
+    store = AttachmentStore(tmp_path, client)
+
+    first = await store.fetch("https://g/p/uploads/s1/a.png", "uploads/s1/a.png")
+    second = await store.fetch("https://g/q/uploads/s2/b.png", "uploads/s2/b.png")
+    assert first == second
+
+    next_run = AttachmentStore(tmp_path, make_client(contents))
+    assert await next_run.fetch("https://g/p/uploads/s1/a.png", "uploads/s1/a.png") == first
+    next_run.client.download_file.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_oversized_files_are_rejected_before_download(tmp_path):
+    """A HEAD-reported size over the limit skips the download"""
+    url = "https://g/p/uploads/s1/huge.zip"
+    client = make_client({url: b"x"}, sizes={url: 10_000})
+    store = AttachmentStore(tmp_path, client, max_size=1024)
+
+    assert await store.fetch(url, "uploads/s1/huge.zip") is None
+    client.download_file.assert_not_called()
+    assert store.stats["too_large"] == 1
+
+
+def test_materialize_links_blob(tmp_path):
+    """Exports get the blob content at their own path"""
+    blob = tmp_path / "blob"
+    blob.write_bytes(b"data")
+
+    target = AttachmentStore.materialize(blob, tmp_path / "export" / "a.png")
+
+    assert target.read_bytes() == b"data"
@@ -1,7 +1,7 @@
 """Unit tests for Discovery Agent component detection"""
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from app.agents.discovery_agent import DiscoveryAgent
 from app.clients.gitlab_client import GitLabClient
 
@@ -12,7 +12,7 @@ def mock_gitlab_client():
     client = Mock(spec=GitLabClient)
     
     # Mock project data
-    client.get_project.return_value = {
+    client.get_project = Mock(return_value={
         "id": 123,
         "name": "test-project",
         "path_with_namespace": "group/test-project",
@@ -23,7 +23,15 @@ def mock_gitlab_client():
         "last_activity_at": "2024-01-15T00:00:00Z",
         "web_url": "https://gitlab.com/group/test-project",
         "default_branch": "main"
-    }
+    })
+    
+    # Detection probes default to an empty project
+    for name in dir(GitLabClient):
+        if name.startswith("count_"):
+            setattr(client, name, AsyncMock(return_value=0))
+    client.get_commits = AsyncMock(return_value=[])
+    client.has_ci_config = AsyncMock(return_value=False)
+    client.has_lfs = AsyncMock(return_value=False)
     
     return client
 
@@ -80,16 +88,9 @@ class TestDiscoveryAgent:
     async def test_detect_repository_component(self, discovery_agent, mock_gitlab_client):
         """Test repository component detection"""
         # Setup mocks
-        mock_gitlab_client.list_branches.return_value = [
-            {"name": "main"},
-            {"name": "develop"}
-        ]
-        mock_gitlab_client.list_tags.return_value = [
-            {"name": "v1.0.0"}
-        ]
-        mock_gitlab_client.get_commits.return_value = [
-            {"id": "abc123"}
-        ]
+        mock_gitlab_client.count_branches.return_value = 2
+        mock_gitlab_client.count_tags.return_value = 1
+        mock_gitlab_client.count_commits.return_value = 250
         
         # Get mock project
         project = mock_gitlab_client.get_project(123)
@@ -103,17 +104,15 @@ class TestDiscoveryAgent:
         assert repo_comp["enabled"] is True
         assert repo_comp["branches_count"] == 2
         assert repo_comp["tags_count"] == 1
+        assert repo_comp["commits_count"] == 250
         assert repo_comp["has_content"] is True
+        mock_gitlab_client.get_commits.assert_not_called()
     
     async def test_detect_ci_cd_component(self, discovery_agent, mock_gitlab_client):
         """Test CI/CD component detection"""
         # Setup mocks
         mock_gitlab_client.has_ci_config.return_value = True
-        mock_gitlab_client.list_pipelines.return_value = [
-            {"id": 1, "status": "success"}
-        ]
-        mock_gitlab_client.list_branches.return_value = []
-        mock_gitlab_client.list_tags.return_value = []
+        mock_gitlab_client.count_pipelines.return_value = 1
         
         project = mock_gitlab_client.get_project(123)
         result = await discovery_agent._detect_project_components(mock_gitlab_client, project)
@@ -128,12 +127,7 @@ class TestDiscoveryAgent:
     async def test_detect_issues_component(self, discovery_agent, mock_gitlab_client):
         """Test issues component detection"""
         # Setup mocks
-        mock_gitlab_client.list_issues.return_value = [
-            {"id": 1, "title": "Issue 1"},
-            {"id": 2, "title": "Issue 2"}
-        ]
-        mock_gitlab_client.list_branches.return_value = []
-        mock_gitlab_client.list_tags.return_value = []
+        mock_gitlab_client.count_issues.side_effect = lambda project_id, state=None: 2 if state == "opened" else 5
         
         project = mock_gitlab_client.get_project(123)
         result = await discovery_agent._detect_project_components(mock_gitlab_client, project)
@@ -143,16 +137,14 @@ class TestDiscoveryAgent:
         issues_comp = result["components"]["issues"]
         assert issues_comp["enabled"] is True
         assert issues_comp["opened_count"] == 2
+        assert issues_comp["closed_count"] == 5
+        assert issues_comp["total_count"] == 7
         assert issues_comp["has_issues"] is True
     
     async def test_detect_merge_requests_component(self, discovery_agent, mock_gitlab_client):
         """Test merge requests component detection"""
         # Setup mocks
-        mock_gitlab_client.list_merge_requests.return_value = [
-            {"id": 1, "title": "MR 1"}
-        ]
-        mock_gitlab_client.list_branches.return_value = []
-        mock_gitlab_client.list_tags.return_value = []
+        mock_gitlab_client.count_merge_requests.side_effect = lambda project_id, state=None: 1 if state == "opened" else 0
         
         project = mock_gitlab_client.get_project(123)
         result = await discovery_agent._detect_project_components(mock_gitlab_client, project)
@@ -167,13 +159,7 @@ class TestDiscoveryAgent:
     async def test_detect_wiki_component(self, discovery_agent, mock_gitlab_client):
         """Test wiki component detection"""
         # Setup mocks
-        mock_gitlab_client.has_wiki.return_value = True
-        mock_gitlab_client.get_wiki_pages.return_value = [
-            {"title": "Home"},
-            {"title": "Guide"}
-        ]
-        mock_gitlab_client.list_branches.return_value = []
-        mock_gitlab_client.list_tags.return_value = []
+        mock_gitlab_client.count_wiki_pages.return_value = 2
         
         project = mock_gitlab_client.get_project(123)
         result = await discovery_agent._detect_project_components(mock_gitlab_client, project)
@@ -188,8 +174,6 @@ class TestDiscoveryAgent:
         """Test LFS component detection"""
         # Setup mocks
         mock_gitlab_client.has_lfs.return_value = True
-        mock_gitlab_client.list_branches.return_value = []
-        mock_gitlab_client.list_tags.return_value = []
         
         project = mock_gitlab_client.get_project(123)
         result = await discovery_agent._detect_project_components(mock_gitlab_client, project)
@@ -203,26 +187,8 @@ class TestDiscoveryAgent:
     async def test_detect_all_components(self, discovery_agent, mock_gitlab_client):
         """Test detection of all 14 component types"""
         # Setup mocks for all components
-        mock_gitlab_client.list_branches.return_value = [{"name": "main"}]
-        mock_gitlab_client.list_tags.return_value = []
-        mock_gitlab_client.get_commits.return_value = []
+        mock_gitlab_client.count_branches.return_value = 1
         mock_gitlab_client.has_ci_config.return_value = True
-        mock_gitlab_client.list_pipelines.return_value = []
-        mock_gitlab_client.list_issues.return_value = []
-        mock_gitlab_client.list_merge_requests.return_value = []
-        mock_gitlab_client.has_wiki.return_value = False
-        mock_gitlab_client.get_wiki_pages.return_value = []
-        mock_gitlab_client.list_releases.return_value = []
-        mock_gitlab_client.has_packages.return_value = False
-        mock_gitlab_client.list_packages.return_value = []
-        mock_gitlab_client.list_hooks.return_value = []
-        mock_gitlab_client.list_pipeline_schedules.return_value = []
-        mock_gitlab_client.has_lfs.return_value = False
-        mock_gitlab_client.list_environments.return_value = []
-        mock_gitlab_client.list_protected_branches.return_value = []
-        mock_gitlab_client.list_protected_tags.return_value = []
-        mock_gitlab_client.list_deploy_keys.return_value = []
-        mock_gitlab_client.list_variables.return_value = []
         
         project = mock_gitlab_client.get_project(123)
         result = await discovery_agent._detect_project_components(mock_gitlab_client, project)
@@ -1,11 +1,21 @@
 """Tests for ExportAgent"""
 
+import asyncio
 import pytest
 import json
 import subprocess
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch, call
-from app.agents.export_agent import ExportAgent
+from app.agents.export_agent import ExportAgent, ISSUE_DETAIL_FIELDS
+from app.agents.export_checkpoint import ExportCheckpoint
+
+
+def async_iter(items):
+    """Mock for an iter_* client method yielding the given items"""
+    async def _iter(*args, **kwargs):
+        for item in items:
+            yield item
+    return MagicMock(side_effect=_iter)
 
 
 @pytest.fixture
@@ -21,7 +31,9 @@ def export_inputs(tmp_path):
         "gitlab_url": "https://gitlab.com",
         "gitlab_token": "test-token-12345678",
         "project_id": "123",
-        "output_dir": str(tmp_path / "export")
+        "output_dir": str(tmp_path / "export"),
+        "issue_export_engine": "rest",
+        "mirror_cache_dir": str(tmp_path / "mirrors")
     }
 
 
@@ -78,8 +90,8 @@ build:
     ]
     
     # Mock issues
-    async def mock_list_issues(project_id):
-        """Async generator for mocking list_issues"""
+    async def mock_iter_issues(project_id):
+        """Async generator for mocking iter_issues"""
         issues = [
             {"iid": 1, "title": "Issue 1", "state": "opened"},
             {"iid": 2, "title": "Issue 2", "state": "closed"}
@@ -87,7 +99,7 @@ build:
         for issue in issues:
             yield issue
     
-    client.list_issues = mock_list_issues  # Direct assignment
+    client.iter_issues = mock_iter_issues  # Direct assignment
     client.get_issue.return_value = {
         "iid": 1,
         "title": "Issue 1",
@@ -99,8 +111,8 @@ build:
     ]
     
     # Mock merge requests
-    async def mock_list_mrs(project_id):
-        """Async generator for mocking list_merge_requests"""
+    async def mock_iter_mrs(project_id):
+        """Async generator for mocking iter_merge_requests"""
         mrs = [
             {"iid": 1, "title": "MR 1", "state": "merged"},
             {"iid": 2, "title": "MR 2", "state": "opened"}
@@ -108,7 +120,7 @@ build:
         for mr in mrs:
             yield mr
     
-    client.list_merge_requests = mock_list_mrs  # Direct assignment
+    client.iter_merge_requests = mock_iter_mrs  # Direct assignment
     client.get_merge_request.return_value = {
         "iid": 1,
         "title": "MR 1",
@@ -124,7 +136,7 @@ build:
     }
     
     # Mock releases
-    client.list_releases.return_value = [
+    client.iter_releases = async_iter([
         {
             "tag_name": "v1.0.0", 
             "name": "Release 1.0.0",
@@ -141,13 +153,13 @@ build:
                 ]
             }
         }
-    ]
+    ])
     
     # Mock file download
     client.download_file = AsyncMock(return_value=True)
     
     # Mock packages
-    client.list_packages.return_value = [
+    client.iter_packages = async_iter([
         {
             "id": 1,
             "name": "package1",
@@ -162,7 +174,7 @@ build:
             "package_type": "maven",
             "created_at": "2024-01-02T00:00:00Z"
         }
-    ]
+    ])
     
     # Mock package details with files
     async def mock_get_package_details(project_id, package_id):
@@ -192,7 +204,7 @@ build:
     client.get_package_details = mock_get_package_details
     
     # Mock package file download
-    async def mock_download_package_file(project_id, package_id, file_id, output_path):
+    async def mock_download_package_file(project_id, package_id, file_id, output_path, **expected):
         # Create a dummy file
         output_path.parent.mkdir(parents=True, exist_ok=True)
         output_path.write_text(f"mock package file {file_id}")
@@ -406,7 +418,7 @@ async def test_export_releases_with_failed_downloads(export_agent, tmp_path):
     """Test releases export with failed asset downloads"""
     # Create a mock client with mixed success/failure
     mock_client = AsyncMock()
-    mock_client.list_releases.return_value = [
+    mock_client.iter_releases = async_iter([
         {
             "tag_name": "v1.0.0",
             "name": "Release 1.0.0",
@@ -423,7 +435,7 @@ async def test_export_releases_with_failed_downloads(export_agent, tmp_path):
                 ]
             }
         }
-    ]
+    ])
     
     # Mock download_file to succeed once and fail once
     mock_client.download_file = AsyncMock(side_effect=[True, False])
@@ -545,7 +557,7 @@ async def test_execute_full_export(export_agent, export_inputs, mock_gitlab_clie
     export_inputs["output_dir"] = str(tmp_path / "export")
     
     with patch('app.agents.export_agent.GitLabClient', return_value=mock_gitlab_client):
-        with patch('subprocess.run') as mock_subprocess:
+        with patch('app.utils.git_runner.git_runner.run', new_callable=AsyncMock) as mock_subprocess:
             # Mock git commands
             mock_subprocess.return_value = MagicMock(
                 returncode=0,
@@ -575,10 +587,10 @@ async def test_execute_full_export(export_agent, export_inputs, mock_gitlab_clie
 async def test_execute_with_error_handling(export_agent, export_inputs, mock_gitlab_client):
     """Test export with error handling"""
     # Make one component fail
-    mock_gitlab_client.list_issues.side_effect = Exception("API error")
+    mock_gitlab_client.iter_issues = MagicMock(side_effect=Exception("API error"))
     
     with patch('app.agents.export_agent.GitLabClient', return_value=mock_gitlab_client):
-        with patch('subprocess.run') as mock_subprocess:
+        with patch('app.utils.git_runner.git_runner.run', new_callable=AsyncMock) as mock_subprocess:
             mock_subprocess.return_value = MagicMock(returncode=0)
             
             result = await export_agent.execute(export_inputs)
@@ -588,6 +600,44 @@ async def test_execute_with_error_handling(export_agent, export_inputs, mock_git
             assert len(result["errors"]) >= 0  # May have errors
 
 
+@pytest.mark.asyncio
+async def test_execute_runs_components_concurrently(export_agent, export_inputs, mock_gitlab_client):
+    """Components overlap, and results and checkpoints keep component order"""
+    components = [
+        "repository", "ci", "issues", "merge_requests", "wiki",
+        "releases", "packages", "container_registry", "settings"
+    ]
+    running = 0
+    peak = 0
+
+    def component(name, delay):
+        async def export(project_id, project, output_dir):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(delay)
+            running -= 1
+            if name == "wiki":
+                return {"success": False, "error": "wiki unavailable"}
+            return {"success": True, "artifacts": [name]}
+        return export
+
+    # Later components finish first
+    for index, name in enumerate(components):
+        export_func = "_export_ci_cd" if name == "ci" else f"_export_{name}"
+        setattr(export_agent, export_func, component(name, 0.05 * (len(components) - index) / len(components)))
+
+    with patch('app.agents.export_agent.GitLabClient', return_value=mock_gitlab_client):
+        result = await export_agent.execute({**export_inputs, "component_concurrency": 4})
+
+    assert peak == 4
+    assert result["status"] == "success"
+    assert result["artifacts"][:-1] == [name for name in components if name != "wiki"]
+    assert result["errors"] == [{"component": "wiki", "message": "wiki unavailable"}]
+    assert export_agent.export_stats["wiki"]["status"] == "partial"
+    assert export_agent.checkpoint.get_progress_summary()["completed"] == 8
+
+
 @pytest.mark.asyncio
 async def test_generate_artifacts(export_agent):
     """Test artifact generation"""
@@ -615,6 +665,147 @@ async def test_export_repository_no_url(export_agent, mock_gitlab_client, tmp_pa
     assert "error" in result
 
 
+@pytest.mark.asyncio
+async def test_export_repository_reuses_mirror(export_agent, mock_gitlab_client, tmp_path):
+    """Test repeat repository exports update the cached mirror instead of recloning"""
+    from app.utils.mirror_cache import MirrorCache
+    
+    def git(*args, cwd):
+        return subprocess.run(
+            ["git", "-c", "user.name=T", "-c", "user.email=t@example.com", *args],
+            cwd=cwd, check=True, capture_output=True, text=True
+        ).stdout
+    
+    upstream = tmp_path / "upstream"
+    upstream.mkdir()
+    git("init", "-q", "-b", "main", cwd=upstream)
+    (upstream / "a.txt").write_text("a")
+    git("add", ".", cwd=upstream)
+    git("commit", "-q", "-m", "first", cwd=upstream)
+    
+    mock_gitlab_client.token = "test-token"
+    export_agent.gitlab_client = mock_gitlab_client
+    export_agent.mirror_cache = MirrorCache(tmp_path / "mirrors")
+    project = {"id": 123, "http_url_to_repo": upstream.as_uri()}
+    
+    for run in (1, 2):
+        output_dir = tmp_path / f"export{run}"
+        output_dir.mkdir()
+        export_agent._create_directory_structure(output_dir)
+        with patch.object(export_agent.git, 'run', wraps=export_agent.git.run) as spy:
+            result = await export_agent._export_repository(123, project, output_dir)
+        
+        assert result["success"] is True
+        bundle = output_dir / "repository" / "bundle.git"
+        heads = git("bundle", "list-heads", str(bundle), cwd=tmp_path)
+        assert "refs/heads/main" in heads
+        clones = [c for c in spy.call_args_list if "clone" in c.args[0]]
+        assert len(clones) == (1 if run == 1 else 0)
+        
+        (upstream / "b.txt").write_text(str(run))
+        git("add", ".", cwd=upstream)
+        git("commit", "-q", "-m", f"after export {run}", cwd=upstream)
+    
+    assert not (tmp_path / "export2" / "repository" / "temp_clone").exists()
+
+
+@pytest.mark.asyncio
+async def test_export_repository_delta_bundle(export_agent, mock_gitlab_client, tmp_path):
+    """A delta export bundles only new commits on top of the baseline refs"""
+    from app.utils.mirror_cache import MirrorCache
+    
+    def git(*args, cwd):
+        return subprocess.run(
+            ["git", "-c", "user.name=T", "-c", "user.email=t@example.com", *args],
+            cwd=cwd, check=True, capture_output=True, text=True
+        ).stdout.strip()
+    
+    def commit(message):
+        (upstream / "file.txt").write_text(message)
+        git("add", ".", cwd=upstream)
+        git("commit", "-q", "-m", message, cwd=upstream)
+    
+    upstream = tmp_path / "upstream"
+    upstream.mkdir()
+    git("init", "-q", "-b", "main", cwd=upstream)
+    commit("first")
+    git("branch", "feature", cwd=upstream)
+    
+    mock_gitlab_client.token = "test-token"
+    export_agent.gitlab_client = mock_gitlab_client
+    export_agent.mirror_cache = MirrorCache(tmp_path / "mirrors")
+    project = {"id": 123, "http_url_to_repo": upstream.as_uri()}
+    
+    baseline = tmp_path / "baseline"
+    export_agent._create_directory_structure(baseline)
+    assert (await export_agent._export_repository(123, project, baseline))["success"] is True
+    (baseline / "export_manifest.json").write_text(json.dumps({"started_at": "2024-05-01T12:00:00"}))
+    old_main = git("rev-parse", "main", cwd=upstream)
+    
+    commit("second")
+    git("tag", "v2", cwd=upstream)
+    git("branch", "-D", "feature", cwd=upstream)
+    
+    export_agent.delta = export_agent._load_baseline(baseline, 300)
+    assert export_agent.delta["since"] == "2024-05-01T11:55:00Z"
+    delta = tmp_path / "delta"
+    export_agent._create_directory_structure(delta)
+    result = await export_agent._export_repository(123, project, delta)
+    
+    assert result["success"] is True
+    assert not (delta / "repository" / "bundle.git").exists()
+    bundle = delta / "repository" / "delta.bundle"
+    assert git("bundle", "list-heads", str(bundle), cwd=tmp_path).count("\n") == 1  # main and v2
+    
+    # Applies on top of a clone of the baseline bundle
+    clone = tmp_path / "clone"
+    git("clone", "-q", "--mirror", str(baseline / "repository" / "bundle.git"), str(clone), cwd=tmp_path)
+    git("fetch", "-q", str(bundle), "refs/heads/main:refs/heads/main", cwd=clone)
+    assert git("rev-parse", "main", cwd=clone) == git("rev-parse", "main", cwd=upstream)
+    
+    with open(export_agent._write_delta_manifest(delta)) as f:
+        changes = json.load(f)["repository"]
+    assert changes["bundle"] == "repository/delta.bundle"
+    assert changes["prerequisites"] == [old_main]
+    assert changes["updated_refs"]["refs/heads/main"]["from"] == old_main
+    assert list(changes["created_refs"]) == ["refs/tags/v2"]
+    assert list(changes["deleted_refs"]) == ["refs/heads/feature"]
+
+
+@pytest.mark.asyncio
+async def test_delta_export_fetches_only_changes(export_agent, mock_gitlab_client, tmp_path):
+    """Issues are listed with updated_after and unchanged releases are skipped"""
+    release = {"tag_name": "v1", "name": "One", "assets": {"links": []}}
+    baseline = tmp_path / "baseline"
+    (baseline / "releases").mkdir(parents=True)
+    (baseline / "export_manifest.json").write_text(json.dumps({"started_at": "2024-05-01T12:00:00"}))
+    (baseline / "releases" / "releases.json").write_text(json.dumps([release]))
+    
+    listed = []
+    
+    async def iter_issues(project_id, **filters):
+        listed.append(filters)
+        yield {"iid": 7, "title": "Changed", "state": "opened"}
+    
+    mock_gitlab_client.iter_issues = iter_issues
+    mock_gitlab_client.get_issue.return_value = {"iid": 7, "title": "Changed", "state": "opened"}
+    mock_gitlab_client.iter_releases = async_iter([release, {"tag_name": "v2", "name": "Two"}])
+    export_agent.gitlab_client = mock_gitlab_client
+    export_agent.delta = export_agent._load_baseline(baseline, 0)
+    output_dir = tmp_path / "delta"
+    export_agent._create_directory_structure(output_dir)
+    
+    assert (await export_agent._export_issues(123, {"id": 123}, output_dir))["count"] == 1
+    assert (await export_agent._export_releases(123, {"id": 123}, output_dir))["count"] == 1
+    
+    assert listed == [{"updated_after": "2024-05-01T12:00:00Z"}]
+    with open(export_agent._write_delta_manifest(output_dir)) as f:
+        changes = json.load(f)
+    assert changes["issues"] == [7]
+    assert changes["releases"] == ["v2"]
+    assert changes["repository"] is None
+
+
 @pytest.mark.asyncio
 async def test_export_wiki_disabled(export_agent, mock_gitlab_client, tmp_path):
     """Test wiki export when wiki is disabled"""
@@ -655,7 +846,7 @@ async def test_get_lfs_object_list_success(export_agent, tmp_path):
 789ghi012jkl - path/to/file2.zip (512 KB)
 345mno678pqr - docs/large.pdf (2.3 GB)"""
     
-    with patch('subprocess.run') as mock_run:
+    with patch('app.utils.git_runner.git_runner.run', new_callable=AsyncMock) as mock_run:
         mock_run.return_value = MagicMock(
             returncode=0,
             stdout=mock_output
@@ -677,7 +868,7 @@ async def test_get_lfs_object_list_empty(export_agent, tmp_path):
     repo_dir = tmp_path / "repo"
     repo_dir.mkdir()
     
-    with patch('subprocess.run') as mock_run:
+    with patch('app.utils.git_runner.git_runner.run', new_callable=AsyncMock) as mock_run:
         mock_run.return_value = MagicMock(
             returncode=0,
             stdout=""
@@ -703,7 +894,7 @@ async def test_export_lfs_objects_success(export_agent, mock_gitlab_client, tmp_
     (lfs_storage / "test_object.bin").write_text("mock lfs content")
     
     # Mock subprocess for git lfs commands
-    with patch('subprocess.run') as mock_run, \
+    with patch('app.utils.git_runner.git_runner.run', new_callable=AsyncMock) as mock_run, \
          patch.object(export_agent, '_get_lfs_object_list') as mock_get_list:
         
         mock_get_list.return_value = [
@@ -730,6 +921,34 @@ async def test_export_lfs_objects_success(export_agent, mock_gitlab_client, tmp_
             assert len(manifest["objects"]) == 2
 
 
+@pytest.mark.asyncio
+async def test_export_lfs_objects_batch_api(export_agent, mock_gitlab_client, tmp_path):
+    """Test LFS objects are downloaded through the batch API without git lfs"""
+    export_agent.gitlab_client = mock_gitlab_client
+    repo_dir = tmp_path / "repository"
+    repo_dir.mkdir(parents=True)
+    objects = [{"oid": "a" * 64, "size": 1024, "path": "file1.bin"}]
+    
+    with patch('app.agents.export_agent.scan_lfs_pointers', AsyncMock(return_value=objects)), \
+         patch('app.agents.export_agent.LFSBatchClient') as client_cls, \
+         patch('app.utils.git_runner.git_runner.run', new_callable=AsyncMock) as mock_run:
+        client = client_cls.return_value
+        client.download = AsyncMock(return_value={"downloaded": 1, "skipped": 0})
+        client.close = AsyncMock()
+        
+        result = await export_agent._export_lfs_objects(
+            123, repo_dir, tmp_path / "mirror", lfs_url="https://gitlab.com/test/project.git/info/lfs"
+        )
+    
+    assert result["success"] is True
+    assert result["count"] == 1
+    assert result["downloaded"] == 1
+    client.download.assert_awaited_once_with(objects, repo_dir / "lfs" / "objects")
+    mock_run.assert_not_called()
+    with open(repo_dir / "lfs" / "manifest.json") as f:
+        assert json.load(f)["objects"] == objects
+
+
 @pytest.mark.asyncio
 async def test_export_lfs_objects_no_objects(export_agent, mock_gitlab_client, tmp_path):
     """Test LFS export when no objects exist"""
@@ -760,7 +979,7 @@ async def test_export_lfs_objects_fetch_failure(export_agent, mock_gitlab_client
     temp_clone_dir = tmp_path / "temp_clone"
     temp_clone_dir.mkdir()
     
-    with patch('subprocess.run') as mock_run, \
+    with patch('app.utils.git_runner.git_runner.run', new_callable=AsyncMock) as mock_run, \
          patch.object(export_agent, '_get_lfs_object_list') as mock_get_list:
         
         mock_get_list.return_value = [
@@ -895,14 +1114,14 @@ async def test_export_issues_with_attachments(export_agent, mock_gitlab_client,
     export_agent._create_directory_structure(output_dir)
     
     # Mock issues with attachments
-    async def mock_list_issues(project_id):
+    async def mock_iter_issues(project_id):
         issues = [
             {"iid": 1, "title": "Issue with screenshot", "state": "opened"}
         ]
         for issue in issues:
             yield issue
     
-    mock_gitlab_client.list_issues = mock_list_issues
+    mock_gitlab_client.iter_issues = mock_iter_issues
     mock_gitlab_client.get_issue.return_value = {
         "iid": 1,
         "title": "Issue with screenshot",
@@ -939,3 +1158,353 @@ async def test_export_issues_with_attachments(export_agent, mock_gitlab_client,
     
     # Verify download_file was called
     assert mock_gitlab_client.download_file.call_count >= 2
+
+
+@pytest.mark.asyncio
+async def test_export_issues_graphql_falls_back_to_rest(export_agent, mock_gitlab_client, tmp_path):
+    """Issues come from REST when the GraphQL engine fails up front"""
+    export_agent.gitlab_client = mock_gitlab_client
+    export_agent.graphql = MagicMock()
+    export_agent.graphql.iter_issues = MagicMock(side_effect=Exception("GraphQL disabled"))
+    output_dir = tmp_path / "export"
+    output_dir.mkdir(parents=True)
+    export_agent._create_directory_structure(output_dir)
+
+    project = {"id": 123, "path_with_namespace": "test/project"}
+    result = await export_agent._export_issues(123, project, output_dir)
+
+    assert result["success"] is True
+    assert result["count"] == 2
+    assert mock_gitlab_client.get_issue.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_export_merge_requests_graphql(export_agent, mock_gitlab_client, tmp_path):
+    """The GraphQL engine replaces the per-MR REST calls"""
+    async def graphql_mrs(full_path, project_id):
+        yield {"iid": 1, "title": "MR 1", "description": "", "discussions": [], "approvals": {"approved": True}}
+
+    export_agent.gitlab_client = mock_gitlab_client
+    export_agent.graphql = MagicMock()
+    export_agent.graphql.iter_merge_requests = graphql_mrs
+    output_dir = tmp_path / "export"
+    output_dir.mkdir(parents=True)
+    export_agent._create_directory_structure(output_dir)
+
+    project = {"id": 123, "path_with_namespace": "test/project"}
+    result = await export_agent._export_merge_requests(123, project, output_dir)
+
+    assert result["success"] is True
+    assert result["count"] == 1
+    mock_gitlab_client.get_merge_request.assert_not_called()
+    with open(output_dir / "merge_requests" / "merge_requests.json") as f:
+        assert json.load(f)[0]["approvals"] == {"approved": True}
+
+
+@pytest.mark.asyncio
+async def test_export_issues_skips_detail_fetch_for_complete_items(export_agent, mock_gitlab_client, tmp_path):
+    """List items carrying every detail field are not fetched again"""
+    async def complete_issues(project_id):
+        for iid in (3, 2, 1):
+            yield {field: None for field in ISSUE_DETAIL_FIELDS} | {"iid": iid, "labels": [], "assignees": []}
+
+    mock_gitlab_client.iter_issues = complete_issues
+    export_agent.gitlab_client = mock_gitlab_client
+    export_agent.detail_workers = 2
+    output_dir = tmp_path / "export"
+    output_dir.mkdir(parents=True)
+    export_agent._create_directory_structure(output_dir)
+
+    result = await export_agent._export_issues(123, {"id": 123}, output_dir)
+
+    assert result["count"] == 3
+    mock_gitlab_client.get_issue.assert_not_called()
+    assert mock_gitlab_client.list_issue_notes.call_count == 3
+    with open(output_dir / "issues" / "issues.json") as f:
+        assert [issue["iid"] for issue in json.load(f)] == [3, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_export_issues_resumes_from_ndjson_tail(export_agent, mock_gitlab_client, tmp_path):
+    """A crashed export continues after the last issue written to disk"""
+    output_dir = tmp_path / "export"
+    output_dir.mkdir(parents=True)
+    export_agent._create_directory_structure(output_dir)
+    (output_dir / "issues" / "issues.ndjson").write_text(
+        '{"iid": 1, "title": "Issue 1", "notes": []}\n{"iid": 2, "ti'
+    )
+    export_agent.checkpoint = ExportCheckpoint(output_dir / ".export_checkpoint.json")
+    export_agent.checkpoint.mark_component_started("issues")
+    export_agent.gitlab_client = mock_gitlab_client
+
+    result = await export_agent._export_issues(123, {"id": 123}, output_dir)
+
+    assert result["count"] == 2
+    mock_gitlab_client.get_issue.assert_awaited_once_with(123, 2)
+    assert not (output_dir / "issues" / "issues.ndjson").exists()
+    with open(output_dir / "issues" / "issues.json") as f:
+        assert len(json.load(f)) == 2
+
+
+@pytest.mark.asyncio
+async def test_export_issues_resume_skips_exported_iids_in_any_order(export_agent, mock_gitlab_client, tmp_path):
+    """A resumed run skips what is on disk even if the listing order changed"""
+    output_dir = tmp_path / "export"
+    output_dir.mkdir(parents=True)
+    export_agent._create_directory_structure(output_dir)
+    (output_dir / "issues" / "issues.ndjson").write_text('{"iid": 3, "notes": []}\n{"iid": 2, "notes": []}\n')
+    export_agent.checkpoint = ExportCheckpoint(output_dir / ".export_checkpoint.json")
+    export_agent.checkpoint.mark_component_started("issues")
+    export_agent.gitlab_client = mock_gitlab_client
+
+    async def oldest_first(project_id):
+        for iid in (1, 2, 3, 4):
+            yield {"iid": iid}
+
+    mock_gitlab_client.iter_issues = oldest_first
+
+    result = await export_agent._export_issues(123, {"id": 123}, output_dir)
+
+    assert result["count"] == 4
+    assert [call.args[1] for call in mock_gitlab_client.get_issue.await_args_list] == [1, 4]
+
+
+@pytest.mark.asyncio
+async def test_export_merge_requests_resume_keeps_recovered_attachments(export_agent, mock_gitlab_client, tmp_path):
+    """Attachments of MRs recovered from disk stay in the downloads and metadata"""
+    output_dir = tmp_path / "export"
+    output_dir.mkdir(parents=True)
+    export_agent._create_directory_structure(output_dir)
+    recovered = {"iid": 1, "description": "![before](/uploads/abc123/before.png)", "discussions": [
+        {"notes": [{"body": "[log](/uploads/def456/crash.log)"}]}
+    ]}
+    (output_dir / "merge_requests" / "merge_requests.ndjson").write_text(json.dumps(recovered) + "\n")
+    export_agent.checkpoint = ExportCheckpoint(output_dir / ".export_checkpoint.json")
+    export_agent.checkpoint.mark_component_started("merge_requests")
+    export_agent.gitlab_client = mock_gitlab_client
+    mock_gitlab_client.base_url = "https://gitlab.com"
+    export_agent._download_attachment = AsyncMock(
+        side_effect=lambda project_path, attachment_path, attachments_dir: attachments_dir / attachment_path.split("/")[-1]
+    )
+
+    async def merge_requests(project_id):
+        yield {"iid": 1}
+        yield {"iid": 2}
+
+    mock_gitlab_client.iter_merge_requests = merge_requests
+    mock_gitlab_client.get_merge_request.return_value = {"iid": 2, "description": "![after](/uploads/0a1b2c/after.png)"}
+
+    result = await export_agent._export_merge_requests(123, {"id": 123, "path_with_namespace": "g/p"}, output_dir)
+
+    assert result["count"] == 2
+    with open(output_dir / "merge_requests" / "attachment_metadata.json") as f:
+        assert sorted(json.load(f)) == [
+            "/uploads/0a1b2c/after.png", "/uploads/abc123/before.png", "/uploads/def456/crash.log"
+        ]
+
+
+@pytest.mark.asyncio
+async def test_export_from_project_archive(export_agent, tmp_path):
+    """The project export archive is converted into the API export layout"""
+    import io
+    import tarfile
+    import httpx
+    from app.clients.gitlab_client import GitLabClient
+    
+    def git(*args, cwd):
+        return subprocess.run(
+            ["git", "-c", "user.name=T", "-c", "user.email=t@example.com", *args],
+            cwd=cwd, check=True, capture_output=True, text=True
+        ).stdout.strip()
+    
+    upstream = tmp_path / "upstream"
+    upstream.mkdir()
+    git("init", "-q", "-b", "main", cwd=upstream)
+    (upstream / "file.txt").write_text("content")
+    git("add", ".", cwd=upstream)
+    git("commit", "-q", "-m", "first", cwd=upstream)
+    git("bundle", "create", "-q", str(tmp_path / "project.bundle"), "--all", cwd=upstream)
+    
+    oid = "a" * 64
+    relations = {
+        "project_members": [{"user_id": 5, "user": {"id": 5, "username": "alice", "name": "Alice"}}],
+        "issues": [{
+            "id": 100, "iid": 1, "title": "Bug", "state": "opened", "author_id": 5,
+            "description": "See ![log](/uploads/abc123/log.txt)",
+            "label_links": [{"label": {"title": "bug"}}],
+            "issue_assignees": [{"user_id": 5}],
+            "notes": [
+                {"id": 1, "note": "first", "author_id": 5, "created_at": "2024-01-01T00:00:00Z"},
+                {"id": 2, "note": "second", "author_id": 9, "author": {"name": "Bob"},
+                 "created_at": "2024-01-02T00:00:00Z"}
+            ]
+        }],
+        "merge_requests": [{
+            "id": 200, "iid": 3, "title": "Draft: Feature", "state": "opened", "author_id": 5,
+            "source_branch": "feature", "target_branch": "main",
+            "approvals": [{"user_id": 5}],
+            "notes": [
+                {"id": 10, "note": "thread", "type": "DiscussionNote", "discussion_id": "d1",
+                 "author_id": 5, "created_at": "2024-01-01T00:00:00Z"},
+                {"id": 11, "note": "reply", "type": "DiscussionNote", "discussion_id": "d1",
+                 "author_id": 5, "created_at": "2024-01-02T00:00:00Z"}
+            ]
+        }]
+    }
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        def add(name, data):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+        add("project.bundle", (tmp_path / "project.bundle").read_bytes())
+        add(f"lfs-objects/{oid}", b"lfs data")
+        add("uploads/abc123/log.txt", b"log")
+        for name, records in relations.items():
+            add(f"tree/project/{name}.ndjson", "".join(json.dumps(r) + "\n" for r in records).encode())
+    archive_bytes = buffer.getvalue()
+    
+    requests = []
+    
+    def handler(request):
+        requests.append((request.method, request.url.path))
+        if request.url.path.endswith("/export/download"):
+            return httpx.Response(200, content=archive_bytes)
+        if request.method == "POST":
+            return httpx.Response(202, json={"message": "202 Accepted"})
+        status = "finished" if any(method == "POST" for method, _ in requests) else "none"
+        return httpx.Response(200, json={"id": 123, "export_status": status})
+    
+    client = GitLabClient("https://gitlab.example.com", "glpat-test-token")
+    await client.client.aclose()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    export_agent.gitlab_client = client
+    export_agent.archive_poll_interval = 0
+    
+    output_dir = tmp_path / "export"
+    export_agent._create_directory_structure(output_dir)
+    project = {"id": 123, "path_with_namespace": "test/project", "wiki_enabled": True,
+               "web_url": "https://gitlab.example.com/test/project"}
+    
+    results = await asyncio.gather(
+        export_agent._export_repository_from_archive(123, project, output_dir),
+        export_agent._export_wiki_from_archive(123, project, output_dir),
+        export_agent._export_issues_from_archive(123, project, output_dir),
+        export_agent._export_merge_requests_from_archive(123, project, output_dir)
+    )
+    await client.close()
+    
+    assert all(result["success"] for result in results)
+    # Scheduled and downloaded once for all components
+    assert requests.count(("POST", "/api/v4/projects/123/export")) == 1
+    assert requests.count(("GET", "/api/v4/projects/123/export/download")) == 1
+    
+    repo_dir = output_dir / "repository"
+    assert git("bundle", "list-heads", str(repo_dir / "bundle.git"), cwd=tmp_path)
+    refs = json.loads((repo_dir / "refs.json").read_text())
+    assert refs["refs/heads/main"] == git("rev-parse", "main", cwd=upstream)
+    assert (repo_dir / "lfs" / "objects" / "aa" / "aa" / oid).read_bytes() == b"lfs data"
+    assert results[0]["lfs_objects_count"] == 1
+    assert (output_dir / "wiki" / "wiki_empty.txt").exists()
+    
+    with open(output_dir / "issues" / "issues.json") as f:
+        issue = json.load(f)[0]
+    assert issue["labels"] == ["bug"]
+    assert issue["author"]["username"] == "alice"
+    assert [note["body"] for note in issue["notes"]] == ["second", "first"]
+    assert issue["notes"][0]["author"] == {"id": 9, "username": None, "name": "Bob"}
+    with open(output_dir / "issues" / "attachment_metadata.json") as f:
+        local_path = json.load(f)["/uploads/abc123/log.txt"]
+    assert (output_dir / local_path).read_bytes() == b"log"
+    
+    with open(output_dir / "merge_requests" / "merge_requests.json") as f:
+        mr = json.load(f)[0]
+    assert mr["draft"] is True
+    assert [note["body"] for note in mr["discussions"][0]["notes"]] == ["thread", "reply"]
+    assert mr["discussions"][0]["individual_note"] is False
+    assert mr["approvals"]["approved_by"][0]["user"]["username"] == "alice"
+
+
+@pytest.mark.asyncio
+async def test_choose_backend(export_agent, mock_gitlab_client):
+    """Large projects use the archive backend in auto mode; delta exports never do"""
+    export_agent.gitlab_client = mock_gitlab_client
+    mock_gitlab_client.count_issues.return_value = 8000
+    mock_gitlab_client.count_merge_requests.return_value = 3000
+    
+    assert await export_agent._choose_backend(123, {}) == "api"
+    assert await export_agent._choose_backend(123, {"export_backend": "auto"}) == "archive"
+    assert await export_agent._choose_backend(123, {"export_backend": "auto", "archive_threshold": 20000}) == "api"
+    
+    mock_gitlab_client.count_issues.side_effect = Exception("boom")
+    assert await export_agent._choose_backend(123, {"export_backend": "auto"}) == "api"
+    
+    export_agent.delta = {"since": "2024-05-01T11:55:00Z"}
+    assert await export_agent._choose_backend(123, {"export_backend": "archive"}) == "api"
+
+
+@pytest.mark.asyncio
+async def test_export_packages_deduplicates_files(export_agent, mock_gitlab_client, tmp_path):
+    """Files shared across versions are downloaded once and verified"""
+    import hashlib
+    import httpx
+    from app.clients.gitlab_client import GitLabClient
+    
+    shared = b"shared license file"
+    shared_sha = hashlib.sha256(shared).hexdigest()
+    versions = ["1.0.0", "1.1.0", "2.0.0"]
+    
+    async def iter_packages(project_id):
+        for package_id, version in enumerate(versions, 1):
+            yield {"id": package_id, "name": "lib", "version": version, "package_type": "generic"}
+    
+    downloads = []
+    
+    def handler(request):
+        package_id, file_id = int(request.url.path.split("/")[-3]), int(request.url.path.split("/")[-1])
+        downloads.append((package_id, file_id))
+        if file_id == 1:
+            return httpx.Response(200, content=shared)
+        return httpx.Response(200, content=f"archive {package_id}".encode())
+    
+    def details(package_id):
+        files = [
+            {"id": 1, "file_name": "LICENSE", "size": len(shared), "file_sha256": shared_sha},
+            {"id": 2, "file_name": "lib.tar.gz", "file_sha256": hashlib.sha256(f"archive {package_id}".encode()).hexdigest()}
+        ]
+        if package_id == 3:
+            # Corrupted in transfer: GitLab reports a different checksum
+            files[1]["file_sha256"] = "0" * 64
+        return {"package_files": files}
+    
+    client = GitLabClient("https://gitlab.example.com", "glpat-test-token")
+    await client.client.aclose()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client.iter_packages = iter_packages
+    client.get_package_details = AsyncMock(side_effect=lambda project_id, package_id: details(package_id))
+    export_agent.gitlab_client = client
+    export_agent.package_concurrency = 3
+    output_dir = tmp_path / "export"
+    export_agent._create_directory_structure(output_dir)
+    
+    result = await export_agent._export_packages(123, {"id": 123}, output_dir)
+    await client.close()
+    
+    assert result["count"] == 3
+    assert result["downloaded_files"] == 5
+    assert result["unique_blobs"] == 3
+    assert sum(1 for _, file_id in downloads if file_id == 1) == 1
+    
+    packages_dir = output_dir / "packages"
+    with open(packages_dir / "packages.json") as f:
+        packages = json.load(f)
+    assert [package["version"] for package in packages] == versions
+    assert [f["file_name"] for f in packages[2]["files"]] == ["LICENSE"]
+    for package in packages:
+        assert (output_dir / package["files"][0]["local_path"]).read_bytes() == shared
+    
+    with open(packages_dir / "blob_manifest.json") as f:
+        blobs = json.load(f)["blobs"]
+    assert (output_dir / blobs[shared_sha]["path"]).read_bytes() == shared
+    assert [ref["version"] for ref in blobs[shared_sha]["references"]] == versions
+    assert "0" * 64 not in blobs
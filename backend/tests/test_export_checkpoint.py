@@ -0,0 +1,74 @@
+"""Tests for the journaled export checkpoint"""
+
+import json
+from app.agents.export_checkpoint import ExportCheckpoint
+
+
+def test_progress_is_journaled_and_replayed(tmp_path):
+    checkpoint_file = tmp_path / ".export_checkpoint.json"
+    checkpoint = ExportCheckpoint(checkpoint_file)
+    checkpoint.mark_component_started("issues")
+    snapshot = checkpoint_file.read_text()
+
+    for count in range(1, 51):
+        checkpoint.update_component_progress("issues", processed_items=count, last_item=count)
+
+    # The checkpoint file isn't rewritten for progress updates
+    assert checkpoint_file.read_text() == snapshot
+    assert len(checkpoint.journal_file.read_text().splitlines()) == 50
+
+    reloaded = ExportCheckpoint(checkpoint_file)
+    assert reloaded.get_last_processed_item("issues") == 50
+    assert reloaded.get_component_status("issues")["processed_items"] == 50
+    assert reloaded.should_resume_component("issues")
+
+
+def test_journal_is_compacted(tmp_path):
+    checkpoint_file = tmp_path / ".export_checkpoint.json"
+    checkpoint = ExportCheckpoint(checkpoint_file, compact_every=10)
+    checkpoint.mark_component_started("merge_requests")
+
+    for count in range(1, 26):
+        checkpoint.update_component_progress("merge_requests", processed_items=count, total_items=25)
+
+    # Compacted at 10 and 20 records
+    assert len(checkpoint.journal_file.read_text().splitlines()) == 5
+    with open(checkpoint_file) as f:
+        assert json.load(f)["components"]["merge_requests"]["processed_items"] == 20
+
+    # Completion compacts the rest
+    checkpoint.mark_component_completed("merge_requests")
+    assert not checkpoint.journal_file.exists()
+    with open(checkpoint_file) as f:
+        component = json.load(f)["components"]["merge_requests"]
+    assert component["processed_items"] == 25
+    assert component["status"] == "completed"
+
+
+def test_torn_record_is_skipped(tmp_path):
+    checkpoint_file = tmp_path / ".export_checkpoint.json"
+    checkpoint = ExportCheckpoint(checkpoint_file)
+    checkpoint.mark_component_started("issues")
+    checkpoint.update_component_progress("issues", processed_items=10, last_item=10)
+
+    # Interrupted while appending
+    with open(checkpoint.journal_file, 'a') as f:
+        f.write('{"component":"issues","processed_')
+
+    resumed = ExportCheckpoint(checkpoint_file)
+    assert resumed.get_last_processed_item("issues") == 10
+
+    resumed.update_component_progress("issues", processed_items=20, last_item=20)
+    assert ExportCheckpoint(checkpoint_file).get_last_processed_item("issues") == 20
+
+
+def test_clear_removes_journal(tmp_path):
+    checkpoint = ExportCheckpoint(tmp_path / ".export_checkpoint.json")
+    checkpoint.mark_component_started("issues")
+    checkpoint.update_component_progress("issues", processed_items=1)
+
+    checkpoint.clear()
+
+    assert not checkpoint.checkpoint_file.exists()
+    assert not checkpoint.journal_file.exists()
+    assert ExportCheckpoint(checkpoint.checkpoint_file).get_component_status("issues") is None
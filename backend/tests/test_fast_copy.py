@@ -0,0 +1,74 @@
+"""Tests for reflink/hardlink file copies"""
+
+import errno
+from unittest.mock import patch
+import pytest
+from app.utils import fast_copy
+from app.utils.fast_copy import fast_copy_file, fast_copy_tree
+
+
+@pytest.fixture(autouse=True)
+def reset_unsupported():
+    fast_copy._unsupported.clear()
+    yield
+    fast_copy._unsupported.clear()
+
+
+def test_copy_file_shares_storage_on_same_filesystem(tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"x" * 4096)
+    dst = tmp_path / "out" / "dst.bin"
+
+    method = fast_copy_file(src, dst)
+
+    assert method in ("reflink", "hardlink")
+    assert dst.read_bytes() == src.read_bytes()
+    # Copying again over the result is a no-op
+    assert fast_copy_file(src, dst) in ("reflink", "hardlink")
+
+
+def test_copy_file_without_hardlinks_is_independent(tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"original")
+    dst = tmp_path / "dst.bin"
+
+    method = fast_copy_file(src, dst, hardlink=False)
+    dst.write_bytes(b"changed")
+
+    assert method in ("reflink", "copy")
+    assert src.read_bytes() == b"original"
+
+
+def test_falls_back_to_streaming_copy_across_filesystems(tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"data")
+    cross_device = OSError(errno.EXDEV, "Invalid cross-device link")
+
+    with patch.object(fast_copy, "_reflink", side_effect=cross_device) as reflink, \
+         patch("os.link", side_effect=cross_device) as link:
+        assert fast_copy_file(src, tmp_path / "a.bin") == "copy"
+        assert fast_copy_file(src, tmp_path / "b.bin") == "copy"
+
+    # Unsupported methods are remembered per filesystem pair
+    assert reflink.call_count == 1
+    assert link.call_count == 1
+    assert (tmp_path / "b.bin").read_bytes() == b"data"
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+
+
+def test_copy_tree_merges_into_destination(tmp_path):
+    src = tmp_path / "objects"
+    (src / "ab" / "cd").mkdir(parents=True)
+    (src / "ab" / "cd" / "abcd1").write_bytes(b"one")
+    (src / "ef").mkdir()
+    (src / "ef" / "ef01").write_bytes(b"two")
+    dst = tmp_path / "export"
+    (dst / "ab").mkdir(parents=True)
+    (dst / "ab" / "existing").write_bytes(b"keep")
+
+    counts = fast_copy_tree(src, dst)
+
+    assert sum(counts.values()) == 2
+    assert (dst / "ab" / "cd" / "abcd1").read_bytes() == b"one"
+    assert (dst / "ef" / "ef01").read_bytes() == b"two"
+    assert (dst / "ab" / "existing").read_bytes() == b"keep"
@@ -0,0 +1,85 @@
+"""Tests for the async git runner"""
+
+import asyncio
+import subprocess
+import sys
+import time
+import pytest
+from app.utils.git_runner import GitRunner, parse_progress
+
+
+def python_cmd(code: str):
+    return [sys.executable, "-c", code]
+
+
+def test_parse_progress():
+    assert parse_progress("Receiving objects:  45% (450/1000), 1.20 MiB | 2.00 MiB/s") == {
+        "phase": "Receiving objects", "percent": 45, "current": 450, "total": 1000
+    }
+    assert parse_progress("remote: Counting objects: 100% (12/12), done.")["phase"] == "Counting objects"
+    assert parse_progress("Cloning into bare repository 'x'...") is None
+
+
+@pytest.mark.asyncio
+async def test_run_captures_output():
+    runner = GitRunner()
+    result = await runner.run(python_cmd("import sys; print('out'); print('err', file=sys.stderr)"))
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == "out"
+    assert result.stderr.strip() == "err"
+
+
+@pytest.mark.asyncio
+async def test_run_raises_called_process_error():
+    runner = GitRunner()
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        await runner.run(python_cmd("import sys; print('fatal: nope', file=sys.stderr); sys.exit(128)"))
+
+    assert exc_info.value.returncode == 128
+    assert "fatal: nope" in exc_info.value.stderr
+
+    result = await runner.run(python_cmd("import sys; sys.exit(1)"), check=False)
+    assert result.returncode == 1
+
+
+@pytest.mark.asyncio
+async def test_run_timeout_kills_process():
+    runner = GitRunner()
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        await runner.run(python_cmd("import time; time.sleep(30)"), timeout=0.5)
+    assert time.monotonic() - start < 10
+
+
+@pytest.mark.asyncio
+async def test_run_reports_progress():
+    script = (
+        "import sys\n"
+        "for i in range(0, 101, 5):\n"
+        "    sys.stderr.write(f'\\rReceiving objects: {i:3d}% ({i}/100)')\n"
+        "sys.stderr.write(', done.\\n')\n"
+        "sys.stderr.write('Resolving deltas: 100% (7/7), done.\\n')\n"
+    )
+    events = []
+    runner = GitRunner()
+    await runner.run(python_cmd(script), progress=events.append, progress_step=25)
+
+    assert [(e["phase"], e["percent"]) for e in events] == [
+        ("Receiving objects", 0),
+        ("Receiving objects", 25),
+        ("Receiving objects", 50),
+        ("Receiving objects", 75),
+        ("Receiving objects", 100),
+        ("Resolving deltas", 100),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit():
+    runner = GitRunner(max_concurrency=2)
+    start = time.monotonic()
+    await asyncio.gather(*(runner.run(python_cmd("import time; time.sleep(0.3)")) for _ in range(4)))
+
+    # Four 0.3s commands two at a time take at least two rounds
+    assert time.monotonic() - start >= 0.6
@@ -0,0 +1,768 @@
+"""Unit tests for GitLab Client"""
+
+import asyncio
+import hashlib
+import os
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+import httpx
+from app.clients.gitlab_client import GitLabClient, RateLimiter
+from app.clients.http_cache import HttpCache
+from app.clients.request_memo import RequestMemo
+
+
+def make_response(items, headers=None, status_code=200):
+    """Create a mock httpx response carrying a JSON page"""
+    response = MagicMock(spec=httpx.Response)
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = items
+    return response
+
+
+@pytest.fixture
+def gitlab_client():
+    """Create a GitLabClient instance"""
+    return GitLabClient("https://gitlab.example.com", "glpat-test-token")
+
+
+class TestPagination:
+    """Test paginated_request"""
+
+    @pytest.mark.asyncio
+    async def test_parallel_pages_yield_in_order(self, gitlab_client):
+        """Pages fetched concurrently are still yielded in page order"""
+        async def fake_request(method, endpoint, params=None, **kwargs):
+            page = params["page"]
+            # Later pages answer first to prove ordering is preserved
+            await asyncio.sleep(0.01 * (5 - page))
+            return make_response([{"id": page}], {"x-total-pages": "4"})
+
+        with patch.object(gitlab_client, '_request', new=AsyncMock(side_effect=fake_request)):
+            items = [i async for i in gitlab_client.paginated_request("projects", concurrency=3)]
+
+        assert [i["id"] for i in items] == [1, 2, 3, 4]
+        await gitlab_client.close()
+
+    @pytest.mark.asyncio
+    async def test_max_pages_limits_fan_out(self, gitlab_client):
+        """max_pages caps the pages requested even when more exist"""
+        request = AsyncMock(side_effect=lambda method, endpoint, params=None, **kw: make_response(
+            [{"id": params["page"]}], {"x-total-pages": "10"}
+        ))
+
+        with patch.object(gitlab_client, '_request', new=request):
+            items = [i async for i in gitlab_client.paginated_request("projects", max_pages=2)]
+
+        assert [i["id"] for i in items] == [1, 2]
+        assert request.call_count == 2
+        await gitlab_client.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_page_is_retried(self, gitlab_client):
+        """A transient failure on one page retries that page instead of stopping"""
+        attempts = {}
+
+        async def flaky_request(method, url, params=None, **kwargs):
+            page = params["page"]
+            attempts[page] = attempts.get(page, 0) + 1
+            if page == 2 and attempts[page] == 1:
+                raise httpx.ConnectError("connection reset")
+            return make_response([{"id": page}], {"x-total-pages": "3"})
+
+        with patch.object(gitlab_client.client, 'request', new=AsyncMock(side_effect=flaky_request)), \
+             patch('app.clients.gitlab_client.asyncio.sleep', new=AsyncMock()):
+            items = [i async for i in gitlab_client.paginated_request("projects")]
+
+        assert [i["id"] for i in items] == [1, 2, 3]
+        assert attempts[2] == 2
+        await gitlab_client.close()
+
+    @pytest.mark.asyncio
+    async def test_page_retries_are_not_compounded(self, gitlab_client):
+        """A failing page is retried by _request alone, not again per page"""
+        request = AsyncMock(side_effect=httpx.ConnectError("connection reset"))
+
+        with patch.object(gitlab_client.client, 'request', new=request), \
+             patch('app.clients.gitlab_client.asyncio.sleep', new=AsyncMock()):
+            with pytest.raises(httpx.ConnectError):
+                [i async for i in gitlab_client.paginated_request("projects")]
+
+        # The initial attempt plus _request's three retries
+        assert request.call_count == 4
+        await gitlab_client.close()
+
+    @pytest.mark.asyncio
+    async def test_persistent_page_failure_raises(self, gitlab_client):
+        """A page that keeps failing surfaces the error"""
+        async def failing_request(method, endpoint, params=None, **kwargs):
+            if params["page"] == 2:
+                raise httpx.ConnectError("connection reset")
+            return make_response([{"id": params["page"]}], {"x-total-pages": "2"})
+
+        with patch.object(gitlab_client, '_request', new=AsyncMock(side_effect=failing_request)), \
+             patch('app.clients.gitlab_client.asyncio.sleep', new=AsyncMock()):
+            with pytest.raises(httpx.ConnectError):
+                [i async for i in gitlab_client.paginated_request("projects")]
+
+        await gitlab_client.close()
+
+    @pytest.mark.asyncio
+    async def test_next_page_header_fallback(self, gitlab_client):
+        """Without x-total-pages, pages are followed through x-next-page"""
+        async def fake_request(method, endpoint, params=None, **kwargs):
+            page = params["page"]
+            headers = {"x-next-page": str(page + 1)} if page < 3 else {}
+            return make_response([{"id": page}], headers)
+
+        with patch.object(gitlab_client, '_request', new=AsyncMock(side_effect=fake_request)):
+            items = [i async for i in gitlab_client.paginated_request("projects")]
+
+        assert [i["id"] for i in items] == [1, 2, 3]
+        await gitlab_client.close()
+
+
+class TestKeysetPagination:
+    """Test keyset pagination and automatic switching"""
+
+    @pytest.mark.asyncio
+    async def test_keyset_follows_link_cursor(self, gitlab_client):
+        """keyset_request follows rel=next links until exhausted"""
+        next_url = "https://gitlab.example.com/api/v4/projects?id_after=2&pagination=keyset"
+        first = make_response([{"id": 1}, {"id": 2}])
+        first.links = {"next": {"url": next_url, "rel": "next"}}
+        second = make_response([{"id": 3}])
+        second.links = {}
+        request = AsyncMock(side_effect=[first, second])
+
+        with patch.object(gitlab_client, '_request', new=request):
+            items = [i async for i in gitlab_client.keyset_request("projects")]
+
+        assert [i["id"] for i in items] == [1, 2, 3]
+        first_params = request.call_args_list[0].kwargs["params"]
+        assert first_params["pagination"] == "keyset"
+        assert first_params["order_by"] == "id"
+        assert request.call_args_list[1].args[1] == next_url
+        await gitlab_client.close()
+
+    @pytest.mark.asyncio
+    async def test_keyset_rejected_falls_back_to_offset(self, gitlab_client):
+        """An endpoint rejecting keyset pagination is read with offsets instead"""
+        rejected = make_response({}, status_code=405)
+        error = httpx.HTTPStatusError("not allowed", request=MagicMock(), response=rejected)
+
+        async def fake_request(method, endpoint, params=None, **kwargs):
+            if params.get("pagination") == "keyset":
+                raise error
+            return make_response([{"id": params["page"]}], {"x-total-pages": "2"})
+
+        with patch.object(gitlab_client, '_request', new=AsyncMock(side_effect=fake_request)):
+            items = [i async for i in gitlab_client.keyset_request("projects/1/issues")]
+
+        assert [i["id"] for i in items] == [1, 2]
+        await gitlab_client.close()
+
+    @pytest.mark.asyncio
+    async def test_list_projects_switches_above_threshold(self, gitlab_client):
+        """list_projects uses keyset pagination when x-total is missing"""
+        probe = make_response([{"id": 1}], {})
+
+        async def fake_keyset(*args, **kwargs):
+            yield {"id": 42}
+
+        with patch.object(gitlab_client, '_request', new=AsyncMock(return_value=probe)), \
+             patch.object(gitlab_client, 'keyset_request', new=fake_keyset):
+            projects = await gitlab_client.list_projects()
+
+        assert projects == [{"id": 42}]
+        await gitlab_client.close()
+
+    @pytest.mark.asyncio
+    async def test_small_listing_keeps_offset_pagination(self, gitlab_client):
+        """Collections under the threshold keep offset pagination"""
+        async def fake_request(method, endpoint, params=None, **kwargs):
+            return make_response([{"id": params["page"]}], {"x-total": "1", "x-total-pages": "1"})
+
+        with patch.object(gitlab_client, '_request', new=AsyncMock(side_effect=fake_request)):
+            issues = await gitlab_client.list_issues(1)
+
+        assert issues == [{"id": 1}]
+        await gitlab_client.close()
+
+    @pytest.mark.asyncio
+    async def test_issue_order_is_the_same_on_both_paths(self, gitlab_client):
+        """Offset and keyset issue listings are both newest first by created_at"""
+        sizes = iter([{"x-total": "1", "x-total-pages": "1"}, {}])
+        orders = []
+
+        async def fake_request(method, endpoint, params=None, **kwargs):
+            if params.get("per_page") == 1:
+                return make_response([{"id": 1}], next(sizes))
+            orders.append((params["order_by"], params["sort"]))
+            response = make_response([{"id": 1}], {"x-total-pages": "1"})
+            response.links = {}
+            return response
+
+        with patch.object(gitlab_client, '_request', new=AsyncMock(side_effect=fake_request)):
+            await gitlab_client.list_issues(1)
+            await gitlab_client.list_issues(1)
+
+        assert orders == [("created_at", "desc"), ("created_at", "desc")]
+        await gitlab_client.close()
+
+
+class TestRateLimiter:
+    """Test the token bucket RateLimiter"""
+
+    def test_initialization(self):
+        """Test RateLimiter initialization"""
+        limiter = RateLimiter(max_requests_per_minute=60, burst=5)
+        assert limiter.max_requests_per_minute == 60
+        assert limiter.refill_rate == 1.0
+        assert limiter.capacity == 5
+        assert limiter.retry_after == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_the_bucket(self):
+        """Concurrent waiters take tokens one by one instead of bursting together"""
+        limiter = RateLimiter(max_requests_per_minute=6000, burst=2)  # 100 tokens/s
+
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.wait_if_needed() for _ in range(6)))
+        elapsed = time.monotonic() - start
+
+        # Two burst tokens, then four more at 100/s
+        assert elapsed >= 0.035
+        assert limiter.tokens < 1
+
+    def test_update_from_headers_uses_server_budget(self):
+        """Refill rate follows RateLimit-Remaining over the time left to reset"""
+        limiter = RateLimiter(max_requests_per_minute=60)
+        reset = int(time.time()) + 10
+
+        limiter.update_from_headers({"RateLimit-Remaining": "500", "RateLimit-Reset": str(reset)})
+
+        assert 45 <= limiter.refill_rate <= 60
+
+    def test_exhausted_budget_waits_for_reset(self):
+        """A zero remaining budget blocks until the reset timestamp"""
+        limiter = RateLimiter()
+        reset = int(time.time()) + 30
+
+        limiter.update_from_headers({"RateLimit-Remaining": "0", "RateLimit-Reset": str(reset)})
+
+        assert limiter.retry_after == reset
+        assert limiter.tokens == 0
+
+    def test_missing_headers_are_ignored(self):
+        """Responses without rate limit headers keep the configured rate"""
+        limiter = RateLimiter(max_requests_per_minute=120)
+        limiter.update_from_headers({})
+        assert limiter.refill_rate == 2.0
+
+    def test_malformed_headers_are_ignored(self):
+        """Non-numeric rate limit headers keep the configured rate"""
+        limiter = RateLimiter(max_requests_per_minute=120)
+        limiter.update_from_headers({"RateLimit-Remaining": "n/a", "RateLimit-Reset": "soon"})
+        assert limiter.refill_rate == 2.0
+        assert limiter.retry_after == 0
+
+    @pytest.mark.asyncio
+    async def test_waiters_sleep_outside_the_lock(self):
+        """Callers held by an exhausted budget wait out the reset together"""
+        limiter = RateLimiter(max_requests_per_minute=60000)  # 1000 tokens/s
+        limiter.update_from_headers({"RateLimit-Remaining": "0", "RateLimit-Reset": str(time.time() + 0.1)})
+
+        start = time.monotonic()
+        waiters = asyncio.gather(*(limiter.wait_if_needed() for _ in range(5)))
+        await asyncio.sleep(0.01)
+        assert not limiter._lock.locked()
+        await waiters
+        elapsed = time.monotonic() - start
+
+        # One shared pause, not one pause per waiter
+        assert 0.08 <= elapsed < 0.3
+
+
+class TestHttpCache:
+    """Test the persistent conditional-request cache"""
+
+    @pytest.mark.asyncio
+    async def test_not_modified_serves_cached_body(self, tmp_path):
+        """A 304 answer returns the body stored from the first response"""
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(dict(request.headers))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"id": 7, "name": "proj"}, headers={"ETag": '"v1"'})
+
+        client = GitLabClient("https://gitlab.example.com", "glpat-test-token", cache_dir=tmp_path, memo_ttl=0)
+        await client.client.aclose()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        first = await client.get_project(7)
+        second = await client.get_project(7)
+
+        assert first == second == {"id": 7, "name": "proj"}
+        assert "if-none-match" not in seen_headers[0]
+        assert seen_headers[1]["if-none-match"] == '"v1"'
+
+        # A new client on the same connection reuses the on-disk entry
+        other = GitLabClient("https://gitlab.example.com", "glpat-test-token", cache_dir=tmp_path, memo_ttl=0)
+        await other.client.aclose()
+        other.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        assert await other.get_project(7) == {"id": 7, "name": "proj"}
+        assert seen_headers[2]["if-none-match"] == '"v1"'
+
+        await client.close()
+        await other.close()
+
+    def test_cache_is_isolated_per_token(self, tmp_path):
+        """Different tokens get different cache directories"""
+        first = HttpCache(tmp_path, "https://gitlab.example.com", "token-a")
+        second = HttpCache(tmp_path, "https://gitlab.example.com", "token-b")
+        assert first.cache_dir != second.cache_dir
+
+    def test_lru_eviction(self, tmp_path):
+        """Least recently used entries are evicted down to the low-water mark"""
+        cache = HttpCache(tmp_path, "https://gitlab.example.com", "token", max_bytes=1000, low_water=0.5)
+        request = httpx.Request("GET", "https://gitlab.example.com/api/v4/projects/1")
+
+        def response(i):
+            return httpx.Response(200, content=b"x" * 100, headers={"ETag": f'"{i}"'}, request=request)
+
+        for i in range(4):
+            cache.store(f"key{i}", response(i))
+        entry_size = cache.total_bytes // 4
+        cache.get("key0")  # refresh key0 so key1 is now the oldest
+        for i in range(4, 1000 // entry_size + 1):
+            cache.store(f"key{i}", response(i))
+
+        assert cache.total_bytes <= 500
+        assert cache.get("key1") is None
+        assert cache.get("key0") is not None
+        assert not list(tmp_path.glob("*/*.tmp"))
+
+    def test_recency_is_seeded_from_mtimes(self, tmp_path):
+        """A new cache instance evicts the files touched least recently first"""
+        cache = HttpCache(tmp_path, "https://gitlab.example.com", "token")
+        request = httpx.Request("GET", "https://gitlab.example.com/api/v4/projects/1")
+        for i in range(3):
+            cache.store(f"key{i}", httpx.Response(200, content=b"x" * 100, headers={"ETag": f'"{i}"'}, request=request))
+            os.utime(cache._path(f"key{i}"), (10 - i, 10 - i))
+
+        reopened = HttpCache(tmp_path, "https://gitlab.example.com", "token", max_bytes=cache.total_bytes, low_water=0.5)
+        reopened.store("key3", httpx.Response(200, content=b"y" * 100, headers={"ETag": '"3"'}, request=request))
+
+        assert reopened.get("key2") is None
+        assert reopened.get("key1") is None
+        assert reopened.get("key3") is not None
+
+
+class TestCountRequests:
+    """Test header-only count probes"""
+
+    @pytest.mark.asyncio
+    async def test_count_reads_x_total(self, gitlab_client):
+        """Counts come from x-total of a single per_page=1 request"""
+        request = AsyncMock(return_value=make_response([{"id": 1}], {"x-total": "1234"}))
+
+        with patch.object(gitlab_client, '_request', new=request):
+            count = await gitlab_client.count_issues(1, state="closed")
+
+        assert count == 1234
+        assert request.call_count == 1
+        params = request.call_args.kwargs["params"]
+        assert params["per_page"] == 1
+        assert params["state"] == "closed"
+        await gitlab_client.close()
+
+    @pytest.mark.asyncio
+    async def test_commits_are_counted_from_project_statistics(self, gitlab_client):
+        """Commit counts use the full-history statistics, not a capped listing"""
+        request = AsyncMock(return_value=make_response({"id": 1, "statistics": {"commit_count": 4321}}))
+
+        with patch.object(gitlab_client, '_request', new=request):
+            assert await gitlab_client.count_commits(1) == 4321
+
+        assert request.call_args.kwargs["params"] == {"statistics": "true"}
+        await gitlab_client.close()
+
+    @pytest.mark.asyncio
+    async def test_unpaginated_endpoint_counts_list(self, gitlab_client):
+        """Endpoints without pagination headers are counted from the body"""
+        response = make_response([{"slug": "home"}, {"slug": "guide"}], {})
+        response.links = {}
+
+        with patch.object(gitlab_client, '_request', new=AsyncMock(return_value=response)):
+            assert await gitlab_client.count_wiki_pages(1) == 2
+
+        await gitlab_client.close()
+
+    @pytest.mark.asyncio
+    async def test_inaccessible_endpoint_counts_zero(self, gitlab_client):
+        """A 403 on a feature the token can't see counts as empty"""
+        forbidden = make_response({}, status_code=403)
+        error = httpx.HTTPStatusError("forbidden", request=MagicMock(), response=forbidden)
+
+        with patch.object(gitlab_client, '_request', new=AsyncMock(side_effect=error)):
+            assert await gitlab_client.count_variables(1) == 0
+
+        await gitlab_client.close()
+
+
+class TestRequestMemo:
+    """Test request coalescing and memoization"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_fetch(self):
+        """Identical in-flight metadata GETs are sent once and repeated ones are memoized"""
+        calls = []
+
+        async def handler(request):
+            calls.append(str(request.url))
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"id": 1})
+
+        client = GitLabClient("https://gitlab.example.com", "glpat-test-token")
+        await client.client.aclose()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        results = await asyncio.gather(*(client.get_project(1) for _ in range(5)))
+        again = await client.get_project(1)
+
+        assert all(r == {"id": 1} for r in results)
+        assert again == {"id": 1}
+        assert len(calls) == 1
+        assert client.memo.stats["coalesced"] == 4
+        assert client.memo.stats["hits"] == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_settings_listings_are_memoized(self):
+        """Settings listings and their counts are coalesced and served from the memo"""
+        calls = []
+
+        async def handler(request):
+            calls.append((request.url.path, request.url.params.get("per_page")))
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=[{"id": 1}], headers={"x-total": "1"})
+
+        client = GitLabClient("https://gitlab.example.com", "glpat-test-token")
+        await client.client.aclose()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        results = await asyncio.gather(*(client.list_deploy_keys(1) for _ in range(3)))
+        again = await client.list_deploy_keys(1)
+        counts = [await client.count_deploy_keys(1) for _ in range(2)]
+
+        assert all(r == [{"id": 1}] for r in results) and again == [{"id": 1}]
+        assert counts == [1, 1]
+        # One listing page and one count probe went to the network
+        assert calls == [("/api/v4/projects/1/deploy_keys", "100"), ("/api/v4/projects/1/deploy_keys", "1")]
+        assert client.memo.stats == {"hits": 2, "coalesced": 2, "misses": 2}
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_requests_in_flight_are_bounded(self):
+        """Callers share the client's request concurrency budget"""
+        active = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200, json=[])
+
+        client = GitLabClient("https://gitlab.example.com", "glpat-test-token", max_concurrent_requests=2)
+        await client.client.aclose()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        await asyncio.gather(*(client.list_deploy_keys(project_id) for project_id in range(6)))
+
+        assert peak == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_memo_shared_across_clients_and_expires(self):
+        """A run-scoped memo serves other clients of the same connection until its TTL"""
+        memo = RequestMemo(ttl=60)
+        fetch = AsyncMock(return_value="response")
+
+        first = await memo.get_or_fetch(("conn", "GET", "url", ()), fetch)
+        second = await memo.get_or_fetch(("conn", "GET", "url", ()), fetch)
+        other_connection = await memo.get_or_fetch(("other", "GET", "url", ()), fetch)
+
+        assert first == second == other_connection == "response"
+        assert fetch.call_count == 2
+
+        memo.ttl = 0
+        memo.clear()
+        await memo.get_or_fetch(("conn", "GET", "url", ()), fetch)
+        assert fetch.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_memoized(self):
+        """A failed fetch is raised to its waiters and retried by later callers"""
+        memo = RequestMemo(ttl=60)
+        fetch = AsyncMock(side_effect=[httpx.ConnectError("reset"), "ok"])
+
+        with pytest.raises(httpx.ConnectError):
+            await memo.get_or_fetch("key", fetch)
+        assert await memo.get_or_fetch("key", fetch) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_writes_bypass_memo(self, gitlab_client):
+        """Requests with a body are never coalesced"""
+        send = AsyncMock(return_value=make_response({}))
+
+        with patch.object(gitlab_client, '_send_request', new=send):
+            await gitlab_client._request('POST', 'projects/1/export', data={"a": 1})
+            await gitlab_client._request('POST', 'projects/1/export', data={"a": 1})
+
+        assert send.call_count == 2
+        await gitlab_client.close()
+
+
+class TestIterators:
+    """Test streaming iter_* listings"""
+
+    @pytest.mark.asyncio
+    async def test_iter_issues_streams_without_memo(self, gitlab_client):
+        """Issues are yielded page by page and never memoized"""
+        request = AsyncMock(side_effect=lambda method, endpoint, params=None, **kw: make_response(
+            [{"iid": params.get("page", 1)}], {"x-total": "3", "x-total-pages": "3"}
+        ))
+
+        with patch.object(gitlab_client, '_request', new=request):
+            iids = [issue["iid"] async for issue in gitlab_client.iter_issues(1)]
+
+        assert iids == [1, 2, 3]
+        page_calls = [c for c in request.call_args_list if c.kwargs["params"]["per_page"] > 1]
+        assert len(page_calls) == 3
+        assert not any(call.kwargs.get("memoize") for call in request.call_args_list)
+        await gitlab_client.close()
+
+    @pytest.mark.asyncio
+    async def test_list_wraps_iterator(self, gitlab_client):
+        """list_* methods collect their iter_* counterpart"""
+        request = AsyncMock(return_value=make_response([{"name": "main"}, {"name": "dev"}]))
+
+        with patch.object(gitlab_client, '_request', new=request):
+            branches = await gitlab_client.list_branches(1)
+
+        assert [b["name"] for b in branches] == ["main", "dev"]
+        await gitlab_client.close()
+
+
+def range_server(body, fail_after=None, accept_ranges=True):
+    """Mock transport handler serving ``body`` with Range support"""
+    state = {"requests": [], "failed": False}
+
+    def handler(request):
+        range_header = request.headers.get("Range")
+        state["requests"].append(range_header)
+        headers = {"Accept-Ranges": "bytes"} if accept_ranges else {}
+        if range_header and accept_ranges:
+            start, _, end = range_header[len("bytes="):].partition("-")
+            start, end = int(start), int(end) if end else len(body) - 1
+            if start >= len(body):
+                return httpx.Response(416, headers=headers)
+            content = body[start:end + 1]
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+            status = 206
+        else:
+            content = body
+            status = 200
+        if fail_after is not None and not state["failed"]:
+            # Cut the first transfer short: the declared length is never reached
+            state["failed"] = True
+            headers["Content-Length"] = str(len(content))
+            return httpx.Response(status, headers=headers, stream=TruncatedStream(content[:fail_after]))
+        return httpx.Response(status, headers=headers, content=content)
+
+    return handler, state
+
+
+class TruncatedStream(httpx.AsyncByteStream):
+    """Byte stream that breaks off with a transport error"""
+
+    def __init__(self, content):
+        self.content = content
+
+    async def __aiter__(self):
+        yield self.content
+        raise httpx.ReadError("connection reset")
+
+
+async def make_download_client(handler, **kwargs):
+    """Create a GitLabClient whose HTTP traffic goes to ``handler``"""
+    client = GitLabClient("https://gitlab.example.com", "glpat-test-token", **kwargs)
+    await client.client.aclose()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestDownloads:
+    """Test resumable, verified downloads"""
+
+    BODY = bytes(range(256)) * 64
+
+    @pytest.mark.asyncio
+    async def test_interrupted_download_resumes_with_range(self, tmp_path):
+        """A dropped connection resumes from the .part file"""
+        handler, state = range_server(self.BODY, fail_after=1000)
+        client = await make_download_client(handler, download_segments=1, download_chunk_size=500)
+        output = tmp_path / "asset.bin"
+
+        with patch("asyncio.sleep", new=AsyncMock()):
+            assert await client.download_file("https://files/asset.bin", output)
+
+        assert output.read_bytes() == self.BODY
+        assert state["requests"] == [None, "bytes=1000-"]
+        assert not (tmp_path / "asset.bin.part").exists()
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_existing_part_file_is_continued(self, tmp_path):
+        """A .part left by an earlier call is continued, not restarted"""
+        handler, state = range_server(self.BODY)
+        client = await make_download_client(handler)
+        output = tmp_path / "asset.bin"
+        (tmp_path / "asset.bin.part").write_bytes(self.BODY[:4000])
+
+        assert await client.download_file("https://files/asset.bin", output)
+
+        assert output.read_bytes() == self.BODY
+        assert state["requests"] == ["bytes=4000-"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_large_file_is_downloaded_in_segments(self, tmp_path):
+        """Files above the threshold are fetched as parallel ranges"""
+        handler, state = range_server(self.BODY)
+        client = await make_download_client(handler, download_segments=4, segment_threshold=1024)
+        output = tmp_path / "asset.bin"
+
+        assert await client.download_file("https://files/asset.bin", output)
+
+        assert output.read_bytes() == self.BODY
+        assert sorted(r for r in state["requests"] if r) == sorted(
+            f"bytes={i * 4096}-{i * 4096 + 4095}" for i in range(4)
+        )
+        assert list(tmp_path.iterdir()) == [output]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_downloads_do_not_take_request_slots(self, tmp_path):
+        """Open transfers have their own budget and leave API requests free"""
+        release = asyncio.Event()
+
+        async def handler(request):
+            if request.url.path.startswith("/files"):
+                await release.wait()
+                return httpx.Response(200, content=b"data")
+            return httpx.Response(200, json=[])
+
+        client = await make_download_client(
+            handler, max_concurrent_requests=1, max_concurrent_downloads=1
+        )
+        downloads = [
+            asyncio.create_task(client.download_file(f"https://gitlab.example.com/files/{i}", tmp_path / str(i)))
+            for i in range(2)
+        ]
+        await asyncio.sleep(0.01)
+
+        # The API request goes through while a transfer holds the only download slot
+        assert await asyncio.wait_for(client.list_deploy_keys(1), timeout=1) == []
+        assert client.download_slots.locked()
+        release.set()
+        assert await asyncio.gather(*downloads) == [True, True]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_package_file_checksum_is_verified(self, tmp_path):
+        """A package file with the wrong digest is rejected and not kept"""
+        handler, state = range_server(self.BODY)
+        client = await make_download_client(handler)
+        output = tmp_path / "pkg.tgz"
+        sha256 = hashlib.sha256(self.BODY).hexdigest()
+
+        assert await client.download_package_file(1, 2, 3, output, expected_sha256=sha256)
+        output.unlink()
+        assert not await client.download_package_file(1, 2, 3, output, expected_md5="0" * 32)
+
+        assert not output.exists()
+        assert not (tmp_path / "pkg.tgz.part").exists()
+        await client.close()
+
+
+class TestGroupHierarchy:
+    """Test get_group_hierarchy traversal"""
+
+    TREE = {
+        1: [{"id": 2, "name": "a", "full_path": "top/a"}, {"id": 3, "name": "b", "full_path": "top/b"}],
+        2: [{"id": 4, "name": "c", "full_path": "top/a/c"}],
+        3: [],
+        4: [],
+    }
+
+    def make_client(self, token):
+        client = GitLabClient("https://gitlab.example.com", token)
+        state = {"active": 0, "peak": 0}
+
+        async def tracked(result):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            return result
+
+        async def get_group(gid):
+            return await tracked({"id": gid, "name": "top", "full_path": "top"})
+
+        async def list_subgroups(gid, max_pages=None):
+            return await tracked(self.TREE[gid])
+
+        async def list_group_projects(gid, **kwargs):
+            return await tracked([{"id": 100 + gid, "name": f"p{gid}", "path_with_namespace": f"p/{gid}"}])
+
+        client.get_group = AsyncMock(side_effect=get_group)
+        client.list_subgroups = AsyncMock(side_effect=list_subgroups)
+        client.list_group_projects = AsyncMock(side_effect=list_group_projects)
+        return client, state
+
+    @pytest.mark.asyncio
+    async def test_tree_is_built_concurrently(self):
+        """Siblings and listings run in parallel; the shape is unchanged"""
+        client, state = self.make_client("glpat-hierarchy-1")
+
+        tree = await client.get_group_hierarchy(1, concurrency=3)
+
+        assert [c["id"] for c in tree["children"]] == [2, 3, 101]
+        assert [c["id"] for c in tree["children"][0]["children"]] == [4, 102]
+        leaf = tree["children"][0]["children"][0]["children"]
+        assert [(c["type"], c["full_path"]) for c in leaf] == [("project", "p/4")]
+        assert client.get_group.call_count == 1
+        assert 1 < state["peak"] <= 3
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_max_depth_and_cache(self):
+        """Depth is honoured and repeated expansions are served from cache"""
+        client, _ = self.make_client("glpat-hierarchy-2")
+
+        tree = await client.get_group_hierarchy(1, include_projects=False, max_depth=1)
+        again = await client.get_group_hierarchy(1, include_projects=False, max_depth=1)
+
+        assert [c["id"] for c in tree["children"]] == [2, 3]
+        assert tree["children"][0]["children"] == []
+        assert again == tree
+        assert client.list_subgroups.call_count == 3
+        await client.close()
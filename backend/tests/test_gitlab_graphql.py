@@ -0,0 +1,296 @@
+"""Unit tests for the GitLab GraphQL helpers"""
+
+import json
+import re
+from unittest.mock import AsyncMock
+import pytest
+import httpx
+from app.clients.gitlab_client import GitLabClient
+from app.clients.gitlab_graphql import (
+    EXPORT_ISSUES_QUERY,
+    EXPORT_MERGE_REQUESTS_QUERY,
+    GitLabGraphQL,
+    GitLabGraphQLError,
+)
+
+
+def project_node(path, opened_issues=3):
+    """Build a ProjectCounts node as GitLab would return it"""
+    return {
+        "fullPath": path,
+        "issuesEnabled": True,
+        "mergeRequestsEnabled": True,
+        "wikiEnabled": True,
+        "lfsEnabled": False,
+        "statistics": {
+            "commitCount": 120.0,
+            "repositorySize": 2048.0,
+            "lfsObjectsSize": 0.0,
+            "wikiSize": 0.0,
+            "packagesSize": 0.0,
+        },
+        "openedIssues": {"count": opened_issues},
+        "closedIssues": {"count": 10},
+        "openedMergeRequests": {"count": 1},
+        "mergedMergeRequests": {"count": 7},
+        "closedMergeRequests": {"count": 2},
+        "labels": {"count": 4},
+        "milestones": {"count": 0},
+        "releases": {"count": 5},
+        "packages": {"count": 0},
+    }
+
+
+async def make_graphql(handler, batch_size=25):
+    """Create a GitLabGraphQL helper backed by a mock transport"""
+    client = GitLabClient("https://gitlab.example.com", "glpat-test-token")
+    await client.client.aclose()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return GitLabGraphQL(client, batch_size=batch_size)
+
+
+class TestProjectCounts:
+    """Test batched project count queries"""
+
+    @pytest.mark.asyncio
+    async def test_batches_projects_with_aliases(self):
+        """Projects are resolved in aliased batches of batch_size"""
+        queries = []
+
+        def handler(request):
+            body = json.loads(request.content)
+            queries.append(body)
+            data = {
+                alias: project_node(path)
+                for alias, path in body["variables"].items()
+            }
+            return httpx.Response(200, json={"data": data})
+
+        graphql = await make_graphql(handler, batch_size=2)
+        paths = ["group/a", "group/b", "group/c"]
+        counts = await graphql.get_project_counts(paths)
+
+        assert len(queries) == 2
+        assert "p0: project(fullPath: $p0)" in queries[0]["query"]
+        # Same label scope as the REST projects/:id/labels default
+        assert "labels(includeAncestorGroups: true) { count }" in queries[0]["query"]
+        assert queries[0]["variables"] == {"p0": "group/a", "p1": "group/b"}
+        assert set(counts) == set(paths)
+        assert counts["group/a"]["opened_issues"] == 3
+        assert counts["group/a"]["commit_count"] == 120
+        assert counts["group/a"]["merged_merge_requests"] == 7
+        await graphql.client.close()
+
+    @pytest.mark.asyncio
+    async def test_complexity_error_splits_batch(self):
+        """A batch over the complexity limit is retried in halves"""
+        def handler(request):
+            variables = json.loads(request.content)["variables"]
+            if len(variables) > 2:
+                return httpx.Response(200, json={
+                    "errors": [{"message": "Query has complexity of 400, which exceeds max complexity of 250"}]
+                })
+            return httpx.Response(200, json={
+                "data": {alias: project_node(path) for alias, path in variables.items()}
+            })
+
+        graphql = await make_graphql(handler, batch_size=4)
+        counts = await graphql.get_project_counts(["g/a", "g/b", "g/c", "g/d"])
+
+        assert set(counts) == {"g/a", "g/b", "g/c", "g/d"}
+        await graphql.client.close()
+
+    @pytest.mark.asyncio
+    async def test_unresolved_projects_are_omitted(self):
+        """Null projects and missing statistics leave gaps for REST fallback"""
+        def handler(request):
+            node = project_node("g/a")
+            node["statistics"] = None
+            return httpx.Response(200, json={
+                "data": {"p0": node, "p1": None},
+                "errors": [{"message": "You don't have access to g/b"}]
+            })
+
+        graphql = await make_graphql(handler)
+        counts = await graphql.get_project_counts(["g/a", "g/b"])
+
+        assert list(counts) == ["g/a"]
+        assert counts["g/a"]["commit_count"] is None
+        assert counts["g/a"]["releases"] == 5
+        await graphql.client.close()
+
+    @pytest.mark.asyncio
+    async def test_rejected_query_returns_nothing(self):
+        """A query rejected outright yields no counts instead of raising"""
+        def handler(request):
+            return httpx.Response(200, json={"errors": [{"message": "Field 'count' doesn't exist"}]})
+
+        graphql = await make_graphql(handler)
+        assert await graphql.get_project_counts(["g/a"]) == {}
+        await graphql.client.close()
+
+
+def user_node(user_id, username):
+    return {"id": f"gid://gitlab/User/{user_id}", "username": username, "name": username.title(),
+            "state": "active", "avatarUrl": None, "webUrl": f"https://gitlab.example.com/{username}"}
+
+
+def note_node(note_id, body, position=None):
+    return {"id": f"gid://gitlab/Note/{note_id}", "body": body, "system": False,
+            "resolvable": position is not None, "resolved": False,
+            "createdAt": f"2024-01-0{note_id % 9 + 1}T00:00:00Z", "updatedAt": None,
+            "author": user_node(7, "alice"), "position": position}
+
+
+def issue_node(iid, notes, has_more_notes=False):
+    return {
+        "id": f"gid://gitlab/Issue/{1000 + iid}", "iid": str(iid), "title": f"Issue {iid}",
+        "description": "body", "state": "opened", "confidential": False,
+        "discussionLocked": False, "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-01-02T00:00:00Z", "closedAt": None, "dueDate": None,
+        "webUrl": f"https://gitlab.example.com/g/p/-/issues/{iid}", "upvotes": 0,
+        "downvotes": 0, "userNotesCount": len(notes), "author": user_node(7, "alice"),
+        "assignees": {"nodes": [user_node(8, "bob")]},
+        "labels": {"nodes": [{"title": "bug"}]},
+        "milestone": {"id": "gid://gitlab/Milestone/5", "iid": "1", "title": "v1",
+                      "description": "", "state": "active", "dueDate": None,
+                      "startDate": None, "webPath": "/g/p/-/milestones/1"},
+        "notes": {"pageInfo": {"hasNextPage": has_more_notes}, "nodes": notes},
+    }
+
+
+class TestExportFetcher:
+    """Test bulk issue and merge request export queries"""
+
+    @pytest.mark.asyncio
+    async def test_issues_are_paged_in_rest_shape(self):
+        """Issues page by cursor and come out shaped like REST get_issue"""
+        requests = []
+        pages = {
+            None: ([issue_node(2, [note_node(1, "first"), note_node(2, "second")])], "c1"),
+            "c1": ([issue_node(1, [])], None),
+        }
+
+        def handler(request):
+            variables = json.loads(request.content)["variables"]
+            requests.append(variables)
+            nodes, cursor = pages[variables["after"]]
+            return httpx.Response(200, json={"data": {"project": {"issues": {
+                "pageInfo": {"hasNextPage": cursor is not None, "endCursor": cursor},
+                "nodes": nodes,
+            }}}})
+
+        graphql = await make_graphql(handler)
+        issues = [issue async for issue in graphql.iter_issues("g/p", 42)]
+
+        assert [issue["iid"] for issue in issues] == [2, 1]
+        issue = issues[0]
+        assert issue["id"] == 1002
+        assert issue["project_id"] == 42
+        assert issue["labels"] == ["bug"]
+        assert issue["assignee"]["username"] == "bob"
+        assert issue["milestone"]["title"] == "v1"
+        assert issue["milestone"]["web_url"] == "https://gitlab.example.com/g/p/-/milestones/1"
+        # REST lists notes newest first
+        assert [note["body"] for note in issue["notes"]] == ["second", "first"]
+        assert issue["notes"][0]["noteable_iid"] == 2
+        assert len(requests) == 2
+        await graphql.client.close()
+
+    @pytest.mark.asyncio
+    async def test_long_threads_use_rest_and_complexity_shrinks_pages(self):
+        """Truncated note lists come from REST; complex pages are halved"""
+        sizes = []
+
+        def handler(request):
+            variables = json.loads(request.content)["variables"]
+            sizes.append(variables["first"])
+            if variables["first"] > 10:
+                return httpx.Response(200, json={"errors": [{"message": "Query has complexity of 900"}]})
+            return httpx.Response(200, json={"data": {"project": {"issues": {
+                "pageInfo": {"hasNextPage": False, "endCursor": None},
+                "nodes": [issue_node(3, [note_node(1, "inline")], has_more_notes=True)],
+            }}}})
+
+        graphql = await make_graphql(handler, batch_size=25)
+        graphql.client.list_issue_notes = AsyncMock(return_value=[{"id": 1, "body": "from rest"}])
+        issues = [issue async for issue in graphql.iter_issues("g/p", 42, page_size=40)]
+
+        assert sizes == [40, 20, 10]
+        assert issues[0]["notes"] == [{"id": 1, "body": "from rest"}]
+        graphql.client.list_issue_notes.assert_awaited_once_with(42, 3)
+        await graphql.client.close()
+
+    @pytest.mark.asyncio
+    async def test_merge_requests_carry_discussions_and_approvals(self):
+        """Discussions, diff positions and approvers are nested in the MR"""
+        position = {"diffRefs": {"baseSha": "a", "startSha": "b", "headSha": "c"},
+                    "filePath": "app.py", "oldPath": "app.py", "newPath": "app.py",
+                    "oldLine": None, "newLine": 12, "positionType": "TEXT"}
+        node = issue_node(5, [])
+        del node["notes"]
+        node.update({
+            "sourceBranch": "feature", "targetBranch": "main", "draft": False,
+            "mergeUser": None, "reviewers": {"nodes": [user_node(9, "carol")]},
+            "approved": True, "approvedBy": {"nodes": [user_node(9, "carol")]},
+            "discussions": {"pageInfo": {"hasNextPage": False}, "nodes": [
+                {"id": "gid://gitlab/Discussion/abc", "resolvable": False,
+                 "notes": {"pageInfo": {"hasNextPage": False}, "nodes": [note_node(3, "lgtm")]}},
+                {"id": "gid://gitlab/Discussion/def", "resolvable": True,
+                 "notes": {"pageInfo": {"hasNextPage": False}, "nodes": [note_node(4, "nit", position)]}},
+            ]},
+        })
+
+        def handler(request):
+            return httpx.Response(200, json={"data": {"project": {"mergeRequests": {
+                "pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [node],
+            }}}})
+
+        graphql = await make_graphql(handler)
+        mrs = [mr async for mr in graphql.iter_merge_requests("g/p", 42)]
+
+        mr = mrs[0]
+        assert mr["source_branch"] == "feature"
+        assert mr["reviewers"][0]["username"] == "carol"
+        assert mr["approvals"]["approved_by"] == [{"user": mr["reviewers"][0]}]
+        assert mr["discussions"][0]["id"] == "abc"
+        assert mr["discussions"][0]["individual_note"] is True
+        diff_note = mr["discussions"][1]["notes"][0]
+        assert diff_note["type"] == "DiffNote"
+        assert diff_note["position"]["new_line"] == 12
+        assert diff_note["position"]["position_type"] == "text"
+        await graphql.client.close()
+
+    @pytest.mark.asyncio
+    async def test_unknown_project_raises(self):
+        """A project that can't be resolved is an error, not an empty export"""
+        def handler(request):
+            return httpx.Response(200, json={"data": {"project": None}})
+
+        graphql = await make_graphql(handler)
+        with pytest.raises(GitLabGraphQLError):
+            [issue async for issue in graphql.iter_issues("g/missing", 1)]
+        await graphql.client.close()
+
+
+class TestExportQueries:
+    """Static checks of the export query documents"""
+
+    @pytest.mark.parametrize("query", [EXPORT_ISSUES_QUERY, EXPORT_MERGE_REQUESTS_QUERY])
+    def test_fragments_are_defined_on_shared_types(self, query):
+        """Every spread resolves to a fragment on a type its fields implement"""
+        fragments = dict(re.findall(r"fragment (\w+) on (\w+)", query))
+        spreads = set(re.findall(r"\.\.\.(\w+)", query))
+
+        # Assignees, reviewers and approvers are MR-specific node types that
+        # only share the User interface with UserCore
+        assert fragments == {"ExportUser": "User", "ExportNote": "Note", "ExportMilestone": "Milestone"}
+        assert spreads <= set(fragments)
+        assert query.count("{") == query.count("}")
+
+    def test_merge_request_user_connections_spread_user_fragment(self):
+        """MR user connections select their nodes through ExportUser"""
+        for field in ("assignees", "reviewers", "approvedBy"):
+            assert re.search(
+                field + r" \{ nodes \{ \.\.\.ExportUser \} \}", EXPORT_MERGE_REQUESTS_QUERY
+            )
@@ -0,0 +1,93 @@
+"""Unit tests for incremental JSON writers"""
+
+import json
+import os
+import threading
+import pytest
+from app.utils.json_stream import JsonArrayWriter, NdjsonWriter, iter_ndjson, ndjson_to_json_array
+
+
+@pytest.mark.parametrize("items", [
+    [],
+    [{"id": 1}],
+    [{"id": 1, "labels": ["a", "b"], "author": {"name": "x"}}, {"id": 2, "notes": []}, "text", 3],
+])
+def test_output_matches_json_dump(tmp_path, items):
+    """Streamed output is byte-identical to json.dump with the same indent"""
+    path = tmp_path / "items.json"
+    with JsonArrayWriter(path) as writer:
+        for item in items:
+            writer.write(item)
+
+    assert writer.count == len(items)
+    assert path.read_text() == json.dumps(items, indent=2)
+
+
+def test_failure_leaves_no_file(tmp_path):
+    """An exception inside the block discards the partial array"""
+    path = tmp_path / "items.json"
+    with pytest.raises(RuntimeError):
+        with JsonArrayWriter(path) as writer:
+            writer.write({"id": 1})
+            raise RuntimeError("listing failed")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_ndjson_resume_drops_torn_tail(tmp_path):
+    """Resuming cuts a half-written line and continues after the last item"""
+    path = tmp_path / "items.ndjson"
+    with NdjsonWriter(path, fsync_every=2) as writer:
+        writer.write({"iid": 3})
+        writer.write({"iid": 2})
+    with open(path, "ab") as f:
+        f.write(b'{"iid": 1, "tit')
+
+    with NdjsonWriter(path, resume=True) as writer:
+        assert writer.count == 2
+        assert writer.last_item == {"iid": 2}
+        writer.write({"iid": 1})
+
+    assert [item["iid"] for item in iter_ndjson(path)] == [3, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_async_writer_syncs_off_the_loop(tmp_path, monkeypatch):
+    """Recovery and batched fsyncs run in a worker thread under async with"""
+    path = tmp_path / "items.ndjson"
+    path.write_text('{"iid": 3}\n{"iid": 2')
+    threads = []
+    fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (threads.append(threading.current_thread()), fsync(fd)))
+
+    async with NdjsonWriter(path, fsync_every=2, resume=True) as writer:
+        assert writer.last_item == {"iid": 3}
+        await writer.awrite({"iid": 2})
+        await writer.awrite({"iid": 1})
+
+    assert [item["iid"] for item in iter_ndjson(path)] == [3, 2, 1]
+    assert threads and threading.main_thread() not in threads
+
+
+def test_ndjson_without_resume_starts_over(tmp_path):
+    """A fresh writer truncates leftovers from an earlier run"""
+    path = tmp_path / "items.ndjson"
+    path.write_text('{"iid": 9}\n')
+
+    with NdjsonWriter(path) as writer:
+        assert writer.last_item is None
+        writer.write({"iid": 1})
+
+    assert list(iter_ndjson(path)) == [{"iid": 1}]
+
+
+def test_ndjson_to_json_array(tmp_path):
+    """Conversion matches json.dump of the same items"""
+    items = [{"iid": 2, "notes": [{"body": "x"}]}, {"iid": 1, "notes": []}]
+    source = tmp_path / "items.ndjson"
+    with NdjsonWriter(source) as writer:
+        for item in items:
+            writer.write(item)
+
+    assert ndjson_to_json_array(source, tmp_path / "items.json") == 2
+    assert (tmp_path / "items.json").read_text() == json.dumps(items, indent=2)
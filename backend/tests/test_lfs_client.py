@@ -0,0 +1,162 @@
+"""Tests for the Git LFS batch API client"""
+
+import hashlib
+import json
+import subprocess
+import httpx
+import pytest
+from app.clients.lfs_client import LFSBatchClient, LFSError, lfs_endpoint, object_path, scan_lfs_pointers
+
+CONTENT = b"large binary content" * 100
+OID = hashlib.sha256(CONTENT).hexdigest()
+OTHER = b"already uploaded"
+OTHER_OID = hashlib.sha256(OTHER).hexdigest()
+
+
+async def make_client(handler) -> LFSBatchClient:
+    client = LFSBatchClient(lfs_endpoint("https://gitlab.example.com/group/project.git"), "oauth2", "secret")
+    await client.client.aclose()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_lfs_endpoint():
+    assert lfs_endpoint("https://github.com/org/repo.git") == "https://github.com/org/repo.git/info/lfs"
+    assert lfs_endpoint("https://github.com/org/repo") == "https://github.com/org/repo.git/info/lfs"
+
+
+@pytest.mark.asyncio
+async def test_scan_lfs_pointers(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=T", "-c", "user.email=t@example.com", *args],
+                       cwd=repo, check=True, capture_output=True)
+
+    git("init", "-q")
+    (repo / "model.bin").write_text(
+        f"version https://git-lfs.github.com/spec/v1\noid sha256:{OID}\nsize {len(CONTENT)}\n"
+    )
+    (repo / "README.md").write_text("not a pointer\n")
+    (repo / "notes.txt").write_bytes("héllo wörld\n".encode())
+    git("add", ".")
+    git("commit", "-q", "-m", "add files")
+
+    objects = await scan_lfs_pointers(repo)
+
+    assert objects == [{"oid": OID, "size": len(CONTENT), "path": "model.bin"}]
+
+
+@pytest.mark.asyncio
+async def test_download_verifies_and_skips_stored(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.url.path.endswith("/objects/batch"):
+            body = json.loads(request.content)
+            assert body["operation"] == "download"
+            assert request.headers["authorization"].startswith("Basic ")
+            return httpx.Response(200, json={"objects": [
+                {"oid": obj["oid"], "size": obj["size"], "actions": {"download": {
+                    "href": f"https://storage.example.com/{obj['oid']}",
+                    "header": {"X-Signed": "1"}
+                }}} for obj in body["objects"]
+            ]})
+        # Presigned storage on another host doesn't get our credentials
+        assert "authorization" not in request.headers
+        return httpx.Response(200, content=CONTENT)
+
+    client = await make_client(handler)
+    store = tmp_path / "objects"
+    objects = [{"oid": OID, "size": len(CONTENT)}]
+
+    stats = await client.download(objects, store)
+    assert stats == {"downloaded": 1, "skipped": 0}
+    assert object_path(store, OID).read_bytes() == CONTENT
+
+    requests.clear()
+    stats = await client.download(objects, store)
+    assert stats == {"downloaded": 0, "skipped": 1}
+    assert requests == []
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_download_rejects_corrupt_object(tmp_path):
+    def handler(request):
+        if request.url.path.endswith("/objects/batch"):
+            return httpx.Response(200, json={"objects": [
+                {"oid": OID, "size": len(CONTENT), "actions": {"download": {"href": "https://gitlab.example.com/o"}}}
+            ]})
+        return httpx.Response(200, content=b"tampered")
+
+    client = await make_client(handler)
+    store = tmp_path / "objects"
+
+    with pytest.raises(LFSError, match="verification"):
+        await client.download([{"oid": OID, "size": len(CONTENT)}], store)
+
+    assert not any(p.is_file() for p in store.rglob("*"))
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_upload_skips_existing_and_verifies(tmp_path):
+    store = tmp_path / "objects"
+    for data, oid in ((CONTENT, OID), (OTHER, OTHER_OID)):
+        path = object_path(store, oid)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    uploaded = {}
+    verified = []
+
+    def handler(request):
+        if request.url.path.endswith("/objects/batch"):
+            assert json.loads(request.content)["operation"] == "upload"
+            return httpx.Response(200, json={"objects": [
+                {"oid": OID, "size": len(CONTENT), "actions": {
+                    "upload": {"href": "https://uploads.example.com/put", "header": {"Authorization": "RemoteAuth x"}},
+                    "verify": {"href": "https://gitlab.example.com/verify"}
+                }},
+                {"oid": OTHER_OID, "size": len(OTHER)}  # Server already has it
+            ]})
+        if request.method == "PUT":
+            uploaded[request.url.path] = request.read()
+            assert request.headers["authorization"] == "RemoteAuth x"
+            return httpx.Response(200)
+        verified.append(json.loads(request.content))
+        return httpx.Response(200)
+
+    client = await make_client(handler)
+    stats = await client.upload(
+        [{"oid": OID, "size": len(CONTENT)}, {"oid": OTHER_OID, "size": len(OTHER)}], store
+    )
+
+    assert stats == {"uploaded": 1, "skipped": 1}
+    assert uploaded == {"/put": CONTENT}
+    assert verified == [{"oid": OID, "size": len(CONTENT)}]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_upload_refuses_missing_or_corrupt_objects(tmp_path):
+    store = tmp_path / "objects"
+
+    def handler(request):
+        return httpx.Response(200, json={"objects": [
+            {"oid": OID, "size": len(CONTENT), "actions": {"upload": {"href": "https://gitlab.example.com/put"}}}
+        ]})
+
+    client = await make_client(handler)
+    with pytest.raises(LFSError, match="missing"):
+        await client.upload([{"oid": OID, "size": len(CONTENT)}], store)
+
+    path = object_path(store, OID)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"corrupted")
+    with pytest.raises(LFSError, match="corrupt"):
+        await client.upload([{"oid": OID, "size": len(CONTENT)}], store)
+    await client.close()
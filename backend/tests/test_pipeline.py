@@ -0,0 +1,56 @@
+"""Unit tests for async pipelines"""
+
+import asyncio
+import pytest
+from app.utils.pipeline import ordered_map
+
+
+async def numbers(count, fail_at=None):
+    for i in range(count):
+        if i == fail_at:
+            raise ValueError("source failed")
+        yield i
+
+
+@pytest.mark.asyncio
+async def test_results_keep_source_order_with_bounded_workers():
+    """Slow early items don't reorder results; workers cap concurrency"""
+    state = {"active": 0, "peak": 0}
+
+    async def slow_double(i):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01 * (5 - i % 5))
+        state["active"] -= 1
+        return i * 2
+
+    results = [r async for r in ordered_map(numbers(12), slow_double, workers=3)]
+
+    assert results == [i * 2 for i in range(12)]
+    assert state["peak"] == 3
+
+
+@pytest.mark.asyncio
+async def test_worker_error_surfaces_at_its_position():
+    """Items before a failure are yielded, then the error is raised"""
+    async def check(i):
+        if i == 3:
+            raise RuntimeError("boom")
+        return i
+
+    seen = []
+    with pytest.raises(RuntimeError):
+        async for r in ordered_map(numbers(10), check, workers=4):
+            seen.append(r)
+
+    assert seen == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_source_error_is_raised():
+    """A failing source ends the pipeline with its exception"""
+    async def identity(i):
+        return i
+
+    with pytest.raises(ValueError):
+        [r async for r in ordered_map(numbers(5, fail_at=2), identity)]